@@ -1,95 +1,49 @@
 # --- Lospec Palette to OBS Theme Generation ---
-import requests
-from colorsys import rgb_to_hls
-
-def hex_to_rgb(hex_color):
-    hex_color = hex_color.lstrip('#')
-    lv = len(hex_color)
-    return tuple(int(hex_color[i:i + lv // 3], 16) for i in range(0, lv, lv // 3))
+import json
+import os
+import sys
+from pathlib import Path
 
-def get_lightness(hex_color):
-    r, g, b = hex_to_rgb(hex_color)
-    h, l, s = rgb_to_hls(r/255, g/255, b/255)
-    return l
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'server'))
+from flavors import load_flavors
+from themefile import write_text_atomic
 
-def get_hue(hex_color):
-    r, g, b = hex_to_rgb(hex_color)
-    h, l, s = rgb_to_hls(r/255, g/255, b/255)
-    return h
+FLAVORS_FILE = Path(__file__).resolve().parent / 'palettes' / 'catppuccin_flavors.json'
+# Target color of every semantic role when matching a foreign palette
+# (Latte's for light themes).
+_flavors = load_flavors(FLAVORS_FILE)
+reference_palette = dict(_flavors['mocha'].palette)
+light_reference_palette = dict(_flavors['latte'].palette)
 
 def fetch_lospec_palette(slug):
-    url = f"https://lospec.com/palette-list/{slug}.json"
-    resp = requests.get(url)
-    if resp.status_code != 200:
-        raise Exception(f"Failed to fetch palette: {slug}")
-    data = resp.json()
-    # Palette is a list of hex strings
-    return data['colors'], data.get('title', slug)
-
-def assign_palette_to_semantics(palette):
+    """
+    (colors, title) of a Lospec palette, via the shared provider: on-disk
+    cache first, then lospec.com, then the offline mirror (see
+    server/lospec.py and the LOSPEC_* settings).
+    """
+    from lospec import default_provider
+
+    palette = default_provider().get(slug)
+    return list(palette.colors), palette.title
+
+def assign_palette_to_semantics(palette, dark_theme=True):
     """
     Assigns palette colors to Catppuccin/OBS semantic roles by analyzing lightness and hue.
     Returns a dict mapping semantic keys to hex colors.
+
+    Neutrals go to the darkest/lightest colors (the other way round for light
+    themes); accents are matched to the Catppuccin Mocha (Latte) reference
+    colors by optimal assignment in OKLCh (see server/palette_match.py).
     """
-    # Catppuccin semantic keys (subset for best fit)
-    semantic_keys = [
-        'base', 'mantle', 'surface0', 'surface1', 'surface2',
-        'text', 'subtext1', 'subtext0', 'overlay0', 'overlay1', 'overlay2',
-        'red', 'maroon', 'peach', 'yellow', 'green', 'teal', 'blue', 'lavender', 'mauve', 'pink', 'flamingo', 'rosewater', 'sky', 'sapphire'
-    ]
-    # Sort palette by lightness
-    sorted_by_lightness = sorted(palette, key=get_lightness)
-    mapping = {}
-    # Assign base/mantle/surface to darkest
-    if len(sorted_by_lightness) >= 5:
-        mapping['base'] = sorted_by_lightness[0]
-        mapping['mantle'] = sorted_by_lightness[1]
-        mapping['surface0'] = sorted_by_lightness[2]
-        mapping['surface1'] = sorted_by_lightness[3]
-        mapping['surface2'] = sorted_by_lightness[4]
-    # Assign text/subtext/overlay to lightest
-    if len(sorted_by_lightness) >= 8:
-        mapping['text'] = sorted_by_lightness[-1]
-        mapping['subtext1'] = sorted_by_lightness[-2]
-        mapping['subtext0'] = sorted_by_lightness[-3]
-        mapping['overlay0'] = sorted_by_lightness[-4]
-        mapping['overlay1'] = sorted_by_lightness[-5]
-        mapping['overlay2'] = sorted_by_lightness[-6]
-    # Assign accents by hue proximity
-    hue_targets = {
-        'red': 0.0, 'maroon': 0.97, 'peach': 0.08, 'yellow': 0.15, 'green': 0.33, 'teal': 0.5, 'blue': 0.6, 'lavender': 0.7, 'mauve': 0.75, 'pink': 0.9, 'flamingo': 0.95, 'rosewater': 0.02, 'sky': 0.55, 'sapphire': 0.58
-    }
-    used = set(mapping.values())
-    for key, target_hue in hue_targets.items():
-        best = None
-        best_dist = 2.0
-        for color in palette:
-            if color in used:
-                continue
-            hue = get_hue(color)
-            dist = min(abs(hue - target_hue), 1 - abs(hue - target_hue))
-            if dist < best_dist:
-                best = color
-                best_dist = dist
-        if best:
-            mapping[key] = best
-            used.add(best)
-    # Fill any missing keys with first unused colors
-    for key in semantic_keys:
-        if key not in mapping:
-            for color in palette:
-                if color not in used:
-                    mapping[key] = color
-                    used.add(color)
-                    break
-    return mapping
+    from palette_match import assign_palette  # needs NumPy
 
-def generate_obs_theme_from_lospec(slug, output_path=None, dark_theme=True):
-    palette, title = fetch_lospec_palette(slug)
-    mapping = assign_palette_to_semantics(palette)
+    reference = reference_palette if dark_theme else light_reference_palette
+    return assign_palette(palette, reference, dark=dark_theme)
+
+def render_lospec_theme(palette, title, slug, dark_theme=True):
+    """Return .ovt text for a list of hex colors (no network or file I/O)."""
+    mapping = assign_palette_to_semantics(palette, dark_theme)
     theme_name = f"Lospec {title}"
-    if not output_path:
-        output_path = f"lospec_{slug}.ovt"
     # Compose OBS theme variables
     color_vars = [f"    --{k}: {v};" for k, v in mapping.items()]
     # Map semantic variables using Catppuccin mapping
@@ -113,36 +67,51 @@ def generate_obs_theme_from_lospec(slug, output_path=None, dark_theme=True):
 {chr(10).join(semantic_vars)}
 }}
 """
-    with open(output_path, 'w') as f:
-        f.write(theme_content)
+    return theme_content
+
+def generate_obs_theme_from_lospec(slug, output_path=None, dark_theme=True):
+    palette, title = fetch_lospec_palette(slug)
+    if not output_path:
+        output_path = f"lospec_{slug}.ovt"
+    theme_content = render_lospec_theme(palette, title, slug, dark_theme)
+    write_text_atomic(output_path, theme_content)
     print(f"Generated OBS theme from Lospec palette: {output_path}")
 
+def generate_obs_themes_from_lospec(slugs, output_dir='.', dark_theme=True):
+    """
+    Fetch several palettes concurrently and write ``lospec_<slug>.ovt`` for
+    each. Returns {slug: output path or the exception that stopped it}.
+    """
+    from lospec import default_provider
+
+    results = {}
+    for slug, palette in default_provider().get_many(slugs).items():
+        if isinstance(palette, Exception):
+            results[slug] = palette
+            continue
+        output_path = os.path.join(output_dir, f"lospec_{slug}.ovt")
+        write_text_atomic(output_path, render_lospec_theme(list(palette.colors), palette.title, slug, dark_theme))
+        results[slug] = output_path
+    return results
+
 # Example usage:
 # generate_obs_theme_from_lospec('1bit-monitor')
+# generate_obs_themes_from_lospec(['1bit-monitor', 'pico-8'], 'themes')
 
 # --- New logic: TextMate-to-OBS theme conversion using Catppuccin mapping as template ---
-import json
-import os
 
-def extract_palette_from_textmate(textmate_json):
+def extract_palette_from_textmate(textmate_json, size=26):
     """
-    Extract a palette from a TextMate theme JSON dict.
-    Returns a dict of color name to hex value if possible.
+    Extract a compact palette from a TextMate theme JSON dict.
+    Returns up to ``size`` hex colors, most used first.
+
+    Colors from 'colors', 'tokenColors' and 'semanticTokenColors' are
+    normalized to #rrggbb, weighted by usage and clustered in OKLab (see
+    server/palette_extract.py); each cluster keeps one of the theme's colors.
     """
-    # Try to extract a palette from 'colors' or 'semanticHighlighting' or similar
-    palette = {}
-    if 'colors' in textmate_json:
-        for k, v in textmate_json['colors'].items():
-            # Try to normalize keys to Catppuccin names if possible
-            palette[k.lower().replace(' ', '_')] = v
-    # Fallback: try to extract from tokenColors
-    if not palette and 'tokenColors' in textmate_json:
-        for entry in textmate_json['tokenColors']:
-            if 'settings' in entry and 'foreground' in entry['settings']:
-                name = entry.get('name', '').lower().replace(' ', '_')
-                if name and name not in palette:
-                    palette[name] = entry['settings']['foreground']
-    return palette
+    from palette_extract import extract_palette  # needs NumPy
+
+    return extract_palette(textmate_json, size)
 
 # The official Catppuccin mapping from palette to semantic OBS variables
 catppuccin_semantic_mapping = {
@@ -174,26 +143,19 @@ catppuccin_semantic_mapping = {
     'border_pressed': 'overlay2',
 }
 
-def closest_palette_color(palette, fallback='#888888'):
-    # Just pick the first color in the palette, or fallback
-    if palette:
-        return list(palette.values())[0]
-    return fallback
-
-def generate_obs_theme_from_textmate(textmate_path, output_path, theme_name, dark_theme=True):
-    with open(textmate_path, 'r') as f:
-        textmate_json = json.load(f)
+def render_textmate_theme(textmate_json, theme_name, dark_theme=True):
+    """Return .ovt text for a parsed TextMate/VS Code theme dict (no file I/O)."""
     palette = extract_palette_from_textmate(textmate_json)
+    mapping = assign_palette_to_semantics(palette, dark_theme)
 
-    # Compose OBS theme variables
-    color_vars = []
-    for color_name, hex_value in palette.items():
-        color_vars.append(f"    --{color_name}: {hex_value};")
+    # Compose OBS theme variables, one per Catppuccin role
+    color_vars = [f"    --{k}: {v};" for k, v in mapping.items()]
 
-    # Map semantic variables using Catppuccin mapping, fallback to closest color
+    # Map semantic variables using Catppuccin mapping (assign_palette fills
+    # every role from a non-empty palette)
     semantic_vars = []
     for obs_var, palette_key in catppuccin_semantic_mapping.items():
-        hex_value = palette.get(palette_key, closest_palette_color(palette))
+        hex_value = mapping.get(palette_key, '#888888')
         semantic_vars.append(f"    --{obs_var}: var(--{palette_key}, {hex_value});")
 
     theme_content = f"""@OBSThemeMeta {{
@@ -212,9 +174,13 @@ def generate_obs_theme_from_textmate(textmate_path, output_path, theme_name, dar
 {chr(10).join(semantic_vars)}
 }}
 """
+    return theme_content
 
-    with open(output_path, 'w') as f:
-        f.write(theme_content)
+def generate_obs_theme_from_textmate(textmate_path, output_path, theme_name, dark_theme=True):
+    with open(textmate_path, 'r') as f:
+        textmate_json = json.load(f)
+    theme_content = render_textmate_theme(textmate_json, theme_name, dark_theme)
+    write_text_atomic(output_path, theme_content)
 
     print(f"Generated OBS theme: {output_path}")
 
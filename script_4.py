@@ -1,5 +1,11 @@
 # Create a new OBS theme based on the Dracula color palette.
 # This will be a complete .ovt theme file compatible with OBS Studio 30.2+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'server'))
+from themefile import write_text_atomic
+from themetemplate import load_template
 
 dracula_colors = {
     "background": "#282a36",
@@ -15,12 +21,22 @@ dracula_colors = {
     "yellow": "#f1fa8c"
 }
 
-with open('dracula_theme.template.ovt', 'r') as f:
-    template_content = f.read()
+TEMPLATE_FILE = Path(__file__).resolve().parent / 'dracula_theme.template.ovt'
+OUTPUT_FILE = 'dracula_theme.ovt'
+
+
+def render_theme(colors=dracula_colors, template_path=TEMPLATE_FILE):
+    """Return the Dracula .ovt text with ``colors`` filled into the template."""
+    return load_template(template_path).render(colors)
+
+
+def main():
+    theme_content = render_theme()
+
+    write_text_atomic(OUTPUT_FILE, theme_content)
 
-theme_content = template_content.format(**dracula_colors)
+    print("✅ Theme saved as 'dracula_theme.ovt'")
 
-with open('dracula_theme.ovt', 'w') as f:
-    f.write(theme_content)
 
-print("✅ Theme saved as 'dracula_theme.ovt'")
+if __name__ == '__main__':
+    main()
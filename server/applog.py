@@ -0,0 +1,135 @@
+"""
+Logging setup: handlers run on a background thread behind a queue.
+
+``configure`` applies a ``logging.config`` dict as usual and then moves each
+configured logger's handlers behind a ``QueueHandler``/``QueueListener``
+pair, so a log call on a request thread only merges the message and enqueues
+the record; formatting and the stream/file writes happen on the listener
+thread.  Listeners are restarted in forked children (prefork workers) and
+flushed at exit.
+
+Also provides the JSON formatter used by the access log and a per-request
+record of cache hits (``note_cache``) that the access log reports.
+"""
+from __future__ import annotations
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+ACCESS_LOGGER = "obs_styla.access"
+
+_listeners: List[logging.handlers.QueueListener] = []
+_queue_handlers: List[logging.handlers.QueueHandler] = []
+
+# Standard LogRecord attributes; anything else was passed via ``extra``.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener's handlers.
+
+    The stock ``prepare`` formats the whole record (including tracebacks) on
+    the calling thread; only the message is merged here so the record no
+    longer references the caller's arguments.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure(config: dict, queued: bool = True) -> None:
+    """Apply ``config`` via dictConfig, then put its handlers behind queues."""
+    stop()
+    logging.config.dictConfig(config)
+    if not queued:
+        return
+    names = [""] + list(config.get("loggers", {}))
+    for name in dict.fromkeys(names):
+        log = logging.getLogger(name or None)
+        handlers = list(log.handlers)
+        if not handlers or any(isinstance(h, logging.handlers.QueueHandler) for h in handlers):
+            continue
+        q = queue.SimpleQueue()
+        queue_handler = _DeferredQueueHandler(q)
+        listener = logging.handlers.QueueListener(q, *handlers, respect_handler_level=True)
+        for h in handlers:
+            log.removeHandler(h)
+        log.addHandler(queue_handler)
+        _queue_handlers.append(queue_handler)
+        _listeners.append(listener)
+        listener.start()
+
+
+def stop() -> None:
+    """Flush and stop every listener started by ``configure``."""
+    while _listeners:
+        listener = _listeners.pop()
+        if listener._thread is not None:
+            listener.stop()
+    _queue_handlers.clear()
+
+
+def _restart_in_child() -> None:
+    # The listener threads did not survive fork(); give each pair a fresh
+    # queue (the old one's lock may have been held mid-put) and restart.
+    for queue_handler, listener in zip(_queue_handlers, _listeners):
+        q = queue.SimpleQueue()
+        queue_handler.queue = listener.queue = q
+        listener._thread = None
+        listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_in_child)
+atexit.register(stop)
+
+
+# --- per-request cache flags ---------------------------------------------
+
+_cache_flags: contextvars.ContextVar[Optional[Dict[str, bool]]] = contextvars.ContextVar("cache_flags", default=None)
+
+
+def begin_request() -> None:
+    """Start collecting cache flags for the request running in this context."""
+    _cache_flags.set({})
+
+
+def note_cache(name: str, hit: bool) -> None:
+    """Record a cache lookup; a flag stays true only if every lookup hit."""
+    flags = _cache_flags.get()
+    if flags is not None:
+        flags[name] = flags.get(name, True) and hit
+
+
+def end_request() -> Optional[Dict[str, bool]]:
+    flags = _cache_flags.get()
+    _cache_flags.set(None)
+    return flags
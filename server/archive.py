@@ -0,0 +1,230 @@
+"""
+Streaming ZIP writer for multi-theme downloads.
+
+The archive is produced entry by entry as a generator of byte chunks, so the
+server never holds more than one read chunk (plus the small central directory
+records) in memory and never touches a temporary file.  Deflated entries are
+remembered in a bounded LRU keyed on (path, size, mtime) so repeated archive
+requests for the same themes reuse the already-compressed bytes instead of
+deflating them again.
+"""
+from __future__ import annotations
+
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+CHUNK_SIZE = 64 * 1024
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+COMPRESSION_METHODS = {"stored": ZIP_STORED, "deflate": ZIP_DEFLATED}
+
+# General purpose flags: bit 3 = sizes/CRC follow in a data descriptor,
+# bit 11 = file name is UTF-8.
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_DATA_DESCRIPTOR = struct.Struct("<IIII")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_OF_CENTRAL_DIR = struct.Struct("<IHHHHIIH")
+
+# Without zip64 records the classic format caps both values.
+MAX_ENTRIES = 0xFFFF
+MAX_OFFSET = 0xFFFFFFFF
+
+
+@dataclass(frozen=True)
+class DeflatedBlob:
+    crc: int
+    size: int
+    data: bytes
+
+
+class DeflateCache:
+    """Thread-safe LRU of raw-deflate blobs bounded by total compressed bytes."""
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024, max_entry_bytes: int = 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, DeflatedBlob]" = OrderedDict()
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key_for(path: Path, stat_result) -> tuple:
+        return (str(path), stat_result.st_size, stat_result.st_mtime_ns)
+
+    def get(self, key: tuple) -> Optional[DeflatedBlob]:
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return blob
+
+    def put(self, key: tuple, blob: DeflatedBlob) -> None:
+        if len(blob.data) > self.max_entry_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total -= len(old.data)
+            self._entries[key] = blob
+            self._total += len(blob.data)
+            while self._total > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._total -= len(evicted.data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+
+def _dos_datetime(mtime: float) -> Tuple[int, int]:
+    """Convert a POSIX timestamp into the (time, date) words used by ZIP."""
+    t = time.localtime(mtime)
+    year = max(t.tm_year, 1980)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+def _read_chunks(path: Path) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_zip(
+    entries: Iterable[Tuple[str, Path]],
+    compression: str = "deflate",
+    cache: Optional[DeflateCache] = None,
+) -> Iterator[bytes]:
+    """Yield a ZIP archive containing ``entries`` as (arcname, path) pairs.
+
+    Stored entries are streamed as read and followed by a data descriptor.
+    Deflated entries are either copied from ``cache`` or compressed on the
+    fly and followed by a data descriptor.  Every file is read once.
+    """
+    if compression not in COMPRESSION_METHODS:
+        raise ValueError(f"Unsupported compression: {compression}")
+    method = COMPRESSION_METHODS[compression]
+
+    central = []
+    offset = 0
+
+    for arcname, path in entries:
+        if len(central) >= MAX_ENTRIES:
+            raise ValueError("Too many archive entries")
+        stat_result = path.stat()
+        name = arcname.encode("utf-8")
+        dos_time, dos_date = _dos_datetime(stat_result.st_mtime)
+        flags = _FLAG_UTF8
+        header_offset = offset
+
+        if method == ZIP_STORED:
+            # CRC and size are taken while streaming and written after the
+            # data, so the file is read once and the entry always matches
+            # the bytes sent even if the file is replaced meanwhile.
+            flags |= _FLAG_DATA_DESCRIPTOR
+            header = _LOCAL_HEADER.pack(
+                0x04034B50, 20, flags, ZIP_STORED, dos_time, dos_date,
+                0, 0, 0, len(name), 0,
+            )
+            yield header + name
+            offset += len(header) + len(name)
+            crc = 0
+            size = 0
+            for chunk in _read_chunks(path):
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                yield chunk
+            compressed_size = size
+            offset += size
+
+            descriptor = _DATA_DESCRIPTOR.pack(0x08074B50, crc, compressed_size, size)
+            yield descriptor
+            offset += len(descriptor)
+        else:
+            key = DeflateCache.key_for(path, stat_result)
+            blob = cache.get(key) if cache is not None else None
+            if blob is not None:
+                crc, size, compressed_size = blob.crc, blob.size, len(blob.data)
+                header = _LOCAL_HEADER.pack(
+                    0x04034B50, 20, flags, ZIP_DEFLATED, dos_time, dos_date,
+                    crc, size, compressed_size, len(name), 0,
+                )
+                yield header + name
+                yield blob.data
+                offset += len(header) + len(name) + compressed_size
+            else:
+                flags |= _FLAG_DATA_DESCRIPTOR
+                header = _LOCAL_HEADER.pack(
+                    0x04034B50, 20, flags, ZIP_DEFLATED, dos_time, dos_date,
+                    0, 0, 0, len(name), 0,
+                )
+                yield header + name
+                offset += len(header) + len(name)
+
+                compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+                crc = 0
+                size = 0
+                compressed_size = 0
+                # Keep a copy of small outputs so they can be cached afterwards.
+                keep = [] if cache is not None and stat_result.st_size <= cache.max_entry_bytes else None
+                for chunk in _read_chunks(path):
+                    crc = zlib.crc32(chunk, crc)
+                    size += len(chunk)
+                    out = compressor.compress(chunk)
+                    if out:
+                        compressed_size += len(out)
+                        if keep is not None:
+                            keep.append(out)
+                        yield out
+                out = compressor.flush()
+                compressed_size += len(out)
+                if keep is not None:
+                    keep.append(out)
+                yield out
+                offset += compressed_size
+
+                descriptor = _DATA_DESCRIPTOR.pack(0x08074B50, crc, compressed_size, size)
+                yield descriptor
+                offset += len(descriptor)
+
+                if keep is not None:
+                    cache.put(key, DeflatedBlob(crc=crc, size=size, data=b"".join(keep)))
+
+        if offset > MAX_OFFSET:
+            raise ValueError("Archive too large")
+        central.append((name, flags, method, dos_time, dos_date, crc, compressed_size, size, header_offset))
+
+    cd_offset = offset
+    cd_size = 0
+    for name, flags, entry_method, dos_time, dos_date, crc, csize, usize, header_offset in central:
+        record = _CENTRAL_HEADER.pack(
+            0x02014B50, 20, 20, flags, entry_method, dos_time, dos_date,
+            crc, csize, usize, len(name), 0, 0, 0, 0, 0, header_offset,
+        )
+        yield record + name
+        cd_size += len(record) + len(name)
+
+    yield _END_OF_CENTRAL_DIR.pack(
+        0x06054B50, 0, 0, len(central), len(central), cd_size, cd_offset, 0,
+    )
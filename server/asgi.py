@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+ASGI mode of the theme API.
+
+The I/O-bound endpoints are served natively as coroutines on one long-lived
+event loop, reusing the route logic from ``server.py``:
+
+  GET  /api/themes             -> catalog scan on io_executor
+  GET  /api/themes/<name>      -> file streamed in chunks read off-loop
+                                  (?minified=1: compacted off-loop, cached)
+  GET  /api/validate           -> one cached parse per theme, concurrently
+  GET  /api/validate/events    -> the same, streamed one Server-Sent Event per theme
+  POST /api/generate           -> generation job submitted to the background queue
+  GET  /api/jobs/<id>/events   -> job progress as Server-Sent Events, woken by the
+                                  job's threads rather than waited for on one
+  POST /api/search             -> Gemini call off-loop
+
+Every other route falls through to the Flask app via ``asgiref``'s WSGI
+adapter, so behaviour stays identical to ``server.py``.
+
+Run:
+  pip install -r requirements.txt
+  python asgi.py            # or: uvicorn asgi:app --app-dir server
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import logging
+import mimetypes
+import os
+from time import perf_counter
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote
+
+from asgiref.wsgi import WsgiToAsgi
+from limits import parse_many
+
+import applog
+import server
+from server import (
+    HTTP_REQUEST_SECONDS, HTTP_REQUESTS, JOB_ID_RE, JobEvents, MINIFIABLE_EXTENSIONS, PayloadTooLarge,
+    RATELIMIT_REJECTIONS, SECURITY_HEADERS, ThemeSyntaxError, access_logger, config, error_response,
+    find_theme_files_async, generate_job_key, generation_jobs, generation_plan, generation_wait_timeout,
+    io_executor, iter_validation_events, job_accepted, limiter, log_access, minified_headers, minify_cache,
+    resolve_theme_path, run_in_io, run_search, search_store_name, summarize_validations,
+    validate_catalog_entry, validate_filename,
+)
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+DEFAULT_LIMITS = parse_many("200 per day; 50 per hour")
+GENERATE_LIMITS = parse_many("5 per minute")
+VALIDATE_EVENTS_LIMITS = parse_many("10 per minute")
+JOB_EVENTS_LIMITS = parse_many("30 per minute")
+
+
+class Request:
+    def __init__(self, scope: dict, receive: Callable):
+        self.scope = scope
+        self._receive = receive
+        self.method: str = scope["method"]
+        self.path: str = scope["path"]
+        self.query: Dict[str, List[str]] = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        self.headers: Dict[str, str] = {
+            k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])
+        }
+        client = scope.get("client")
+        self.remote_addr: str = client[0] if client else "127.0.0.1"
+
+    async def body(self) -> bytes:
+        chunks = []
+        size = 0
+        while True:
+            message = await self._receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > config.MAX_CONTENT_LENGTH:
+                raise PayloadTooLarge(f"Request body over {config.MAX_CONTENT_LENGTH} bytes")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                return b"".join(chunks)
+
+    async def disconnected(self) -> None:
+        """Return once the client has gone away."""
+        while (await self._receive())["type"] != "http.disconnect":
+            pass
+
+    async def json(self) -> Optional[dict]:
+        if not self.headers.get("content-type", "").startswith("application/json"):
+            return None
+        try:
+            data = json.loads(await self.body() or b"null")
+        except json.JSONDecodeError:
+            return None
+        return data if isinstance(data, dict) else None
+
+
+def _headers(content_type: str, extra: Tuple[Tuple[str, str], ...] = ()) -> List[Tuple[bytes, bytes]]:
+    headers = [(b"content-type", content_type.encode("latin-1"))]
+    # Match flask-cors' default of allowing every origin.
+    headers.append((b"access-control-allow-origin", b"*"))
+    for k, v in SECURITY_HEADERS.items():
+        headers.append((k.lower().encode("latin-1"), v.encode("latin-1")))
+    for k, v in extra:
+        headers.append((k.lower().encode("latin-1"), v.encode("latin-1")))
+    return headers
+
+
+async def send_json(send: Callable, payload, status: int = 200) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send({"type": "http.response.start", "status": status,
+                "headers": _headers("application/json", (("content-length", str(len(body))),))})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_events(send: Callable, frames, executor=None) -> None:
+    """Stream SSE ``frames`` from a blocking generator, one executor call per frame."""
+    await send({"type": "http.response.start", "status": 200, "headers": _headers(
+        "text/event-stream", (("cache-control", "no-cache"), ("x-accel-buffering", "no")))})
+    loop = asyncio.get_running_loop()
+    # The generator runs in the request's context, as run_in_io's calls do.
+    context = contextvars.copy_context()
+    try:
+        while True:
+            frame = await loop.run_in_executor(executor, context.run, next, frames, None)
+            if frame is None:
+                break
+            await send({"type": "http.response.body", "body": frame.encode("utf-8"), "more_body": True})
+    finally:
+        frames.close()
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def send_async_events(send: Callable, frames, request: Request) -> None:
+    """Stream SSE ``frames`` from an async generator until it ends or the client leaves."""
+    await send({"type": "http.response.start", "status": 200, "headers": _headers(
+        "text/event-stream", (("cache-control", "no-cache"), ("x-accel-buffering", "no")))})
+    disconnected = asyncio.ensure_future(request.disconnected())
+    try:
+        while True:
+            frame = asyncio.ensure_future(frames.__anext__())
+            await asyncio.wait((frame, disconnected), return_when=asyncio.FIRST_COMPLETED)
+            if not frame.done():
+                # Cancelling unwinds the generator (unsubscribing it) at once.
+                frame.cancel()
+                await asyncio.gather(frame, return_exceptions=True)
+                return
+            try:
+                body = frame.result()
+            except StopAsyncIteration:
+                break
+            await send({"type": "http.response.body", "body": body.encode("utf-8"), "more_body": True})
+    finally:
+        disconnected.cancel()
+        await frames.aclose()
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def job_snapshots(job_id: str, heartbeat: float = 15.0, poll: float = 0.25):
+    """Async ``JobQueue.watch``: a snapshot per change, None after ``heartbeat`` idle seconds.
+
+    A job run by this process wakes the stream from its threads through
+    ``JobQueue.subscribe``; one run by another worker is polled.
+    """
+    loop = asyncio.get_running_loop()
+    changed = asyncio.Event()
+
+    def notify() -> None:
+        try:
+            loop.call_soon_threadsafe(changed.set)
+        except RuntimeError:  # the loop has closed
+            pass
+
+    unsubscribe = generation_jobs.subscribe(job_id, notify)
+    wait = heartbeat if unsubscribe is not None else poll
+    last = None
+    idle = 0.0
+    try:
+        while True:
+            changed.clear()
+            snapshot = await run_in_io(generation_jobs.get, job_id)
+            if snapshot is None:
+                return
+            if snapshot != last:
+                last, idle = snapshot, 0.0
+                yield snapshot
+                if snapshot["state"] == "done":
+                    return
+            try:
+                await asyncio.wait_for(changed.wait(), wait)
+            except asyncio.TimeoutError:
+                idle += wait
+                if idle >= heartbeat:
+                    idle = 0.0
+                    yield None
+    finally:
+        if unsubscribe is not None:
+            unsubscribe()
+
+
+async def wait_for_job(job: dict, timeout: float) -> dict:
+    """The job's snapshot once it is done, or its latest one after ``timeout`` seconds."""
+    async def until_done():
+        nonlocal job
+        async for snapshot in job_snapshots(job["id"]):
+            if snapshot is not None:
+                job = snapshot
+
+    try:
+        await asyncio.wait_for(until_done(), timeout)
+    except asyncio.TimeoutError:
+        pass
+    return job
+
+
+async def iter_job_events_async(job_id: str):
+    events = JobEvents()
+    async for job in job_snapshots(job_id):
+        for frame in events.frames(job):
+            yield frame
+
+
+def _over_limit(endpoint: str, request: Request, extra=()) -> bool:
+    """Apply the same limits as the Flask routes, in the limiter's storage."""
+    if not limiter.enabled:
+        return False
+    for item in (*extra, *DEFAULT_LIMITS):
+        if not limiter.limiter.hit(item, "asgi", endpoint, request.remote_addr):
+            return True
+    return False
+
+
+
+
+async def api_themes(request: Request, send: Callable) -> None:
+    await send_json(send, {"themes": await find_theme_files_async()})
+
+
+async def api_theme_download(request: Request, send: Callable, filename: str) -> None:
+    if not validate_filename(filename):
+        return await send_json(send, {"error": "Invalid filename"}, 400)
+    secure_path = resolve_theme_path(filename)
+    if request.query.get("minified", [""])[0].lower() in ("1", "true"):
+        return await _send_minified(send, secure_path)
+    try:
+        f = await run_in_io(open, secure_path, "rb")
+    except (FileNotFoundError, IsADirectoryError):
+        return await send_json(send, {"error": "File not found"}, 404)
+    try:
+        content_type = mimetypes.guess_type(secure_path.name)[0] or "application/octet-stream"
+        basename = secure_path.name.replace('"', "")
+        await send({"type": "http.response.start", "status": 200, "headers": _headers(content_type, (
+            ("content-disposition", f'attachment; filename="{basename}"'),
+        ))})
+        while True:
+            chunk = await run_in_io(f.read, CHUNK_SIZE)
+            more = len(chunk) == CHUNK_SIZE
+            await send({"type": "http.response.body", "body": chunk, "more_body": more})
+            if not more:
+                break
+    finally:
+        await run_in_io(f.close)
+
+
+async def _send_minified(send: Callable, secure_path) -> None:
+    if secure_path.suffix.lower() not in MINIFIABLE_EXTENSIONS:
+        return await send_json(send, {"error": "Only .ovt and .obt themes can be minified"}, 400)
+    try:
+        result = await run_in_io(minify_cache.get, secure_path)
+    except (FileNotFoundError, IsADirectoryError):
+        return await send_json(send, {"error": "File not found"}, 404)
+    except ThemeSyntaxError as e:
+        return await send_json(send, {"error": f"Theme can't be minified: {e}"}, 422)
+    body = result.text.encode("utf-8")
+    basename = secure_path.name.replace('"', "")
+    await send({"type": "http.response.start", "status": 200, "headers": _headers("text/plain; charset=utf-8", (
+        ("content-disposition", f'attachment; filename="{basename}"'),
+        ("content-length", str(len(body))),
+        *minified_headers(result.report).items(),
+    ))})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def api_validate(request: Request, send: Callable) -> None:
+    themes = await find_theme_files_async()
+    reports = await asyncio.gather(*(run_in_io(validate_catalog_entry, t) for t in themes))
+    await send_json(send, summarize_validations(list(reports)))
+
+
+async def api_validate_events(request: Request, send: Callable) -> None:
+    themes = await find_theme_files_async()
+    full = request.query.get("summary", [""])[0].lower() not in ("1", "true")
+    await send_events(send, iter_validation_events(themes, full=full), io_executor)
+
+
+async def api_job_events(request: Request, send: Callable, job_id: str) -> None:
+    if not JOB_ID_RE.match(job_id):
+        return await send_json(send, {"error": "Invalid job id"}, 400)
+    if await run_in_io(generation_jobs.get, job_id) is None:
+        return await send_json(send, {"error": "Job not found"}, 404)
+    await send_async_events(send, iter_job_events_async(job_id), request)
+
+
+async def api_generate(request: Request, send: Callable) -> None:
+    if _over_limit("api_generate", request, GENERATE_LIMITS):
+        return await send_json(send, {"error": "Too many requests"}, 429)
+    force = request.query.get("force", [""])[0].lower() in ("1", "true")
+    wait = request.query.get("wait", [""])[0].lower() in ("1", "true")
+    scripts = await run_in_io(generation_plan, force)
+    if not scripts:
+        if wait:
+            return await send_json(send, {
+                "status": "up to date", "job": None, "results": [], "themes": await find_theme_files_async(),
+            })
+        return await send_json(send, {"status": "up to date", "job": None})
+    job, coalesced = await run_in_io(generation_jobs.submit, generate_job_key(scripts), scripts)
+    if wait:
+        job = await wait_for_job(job, generation_wait_timeout(scripts))
+        if job["state"] == "done":
+            return await send_json(send, {
+                "job": job["id"], "results": job["scripts"], "themes": await find_theme_files_async(),
+            })
+    await send_json(send, job_accepted(job, coalesced), 202)
+
+
+async def api_search(request: Request, send: Callable) -> None:
+    if not os.environ.get("GEMINI_API_KEY"):
+        logger.warning("GEMINI_API_KEY not set. Search functionality is disabled.")
+        return await send_json(send, {"error": "Search is not configured"}, 501)
+    data = await request.json()
+    if data is None:
+        return await send_json(send, {"error": "Content-Type must be application/json"}, 400)
+    query = data.get("query")
+    if not query:
+        return await send_json(send, {"error": "Missing query"}, 400)
+    store_name = await run_in_io(search_store_name)
+    if store_name is None:
+        return await send_json(send, {"error": "File search store not found"}, 500)
+    try:
+        text = await run_in_io(run_search, query, store_name)
+    except Exception as e:
+        logger.error(f"Error during file search: {e}")
+        return await send_json(send, {"error": "Failed to perform search"}, 500)
+    await send_json(send, {"response": text})
+
+
+Handler = Callable[..., Awaitable[None]]
+
+ROUTES: Dict[Tuple[str, str], Handler] = {
+    ("GET", "/api/themes"): api_themes,
+    ("GET", "/api/validate"): api_validate,
+    ("GET", "/api/validate/events"): api_validate_events,
+    ("POST", "/api/generate"): api_generate,
+    ("POST", "/api/search"): api_search,
+}
+
+# Route labels for metrics, matching the Flask rules they stand in for.
+ROUTE_LABELS: Dict[Handler, str] = {handler: path for (_, path), handler in ROUTES.items()}
+ROUTE_LABELS[api_theme_download] = "/api/themes/<path:filename>"
+ROUTE_LABELS[api_job_events] = "/api/jobs/<job_id>/events"
+
+# Per-route limits on top of DEFAULT_LIMITS (api_generate checks its own).
+ROUTE_LIMITS: Dict[Handler, list] = {
+    api_validate_events: VALIDATE_EVENTS_LIMITS,
+    api_job_events: JOB_EVENTS_LIMITS,
+}
+
+# Paths under /api/themes/ that are not plain downloads; left to Flask.
+_THEMES_PREFIX = "/api/themes/"
+_THEMES_SUFFIXES = ("/meta", "/duplicate")
+_JOBS_PREFIX = "/api/jobs/"
+_EVENTS_SUFFIX = "/events"
+
+
+def _match(method: str, path: str) -> Optional[Tuple[Handler, tuple]]:
+    handler = ROUTES.get((method, path))
+    if handler is not None:
+        return handler, ()
+    if (method == "GET" and path.startswith(_THEMES_PREFIX)
+            and path != _THEMES_PREFIX + "archive" and not path.endswith(_THEMES_SUFFIXES)):
+        return api_theme_download, (unquote(path[len(_THEMES_PREFIX):]),)
+    if method == "GET" and path.startswith(_JOBS_PREFIX) and path.endswith(_EVENTS_SUFFIX):
+        return api_job_events, (path[len(_JOBS_PREFIX):-len(_EVENTS_SUFFIX)],)
+    return None
+
+
+class ThemeAPI:
+    """ASGI application: native async routes, Flask for the rest."""
+
+    def __init__(self, flask_app):
+        self.fallback = WsgiToAsgi(flask_app)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+        match = _match(scope["method"], scope["path"])
+        if match is None or (server.profiler is not None and self._wants_profile(scope)):
+            # Profiled requests go through the Flask app, where the profiler sits.
+            return await self.fallback(scope, receive, send)
+        handler, args = match
+        route = ROUTE_LABELS[handler]
+        start = perf_counter()
+        status = 500
+        seconds = None
+        size = 0
+
+        async def send_and_record(message):
+            nonlocal status, seconds, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                seconds = perf_counter() - start
+                HTTP_REQUEST_SECONDS.observe(seconds, route, scope["method"])
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        request = Request(scope, receive)
+        applog.begin_request()
+        try:
+            await self._dispatch(handler, args, request, send_and_record)
+        finally:
+            HTTP_REQUESTS.inc(route, scope["method"], str(status))
+            if status == 429:
+                RATELIMIT_REJECTIONS.inc(route)
+            cache = applog.end_request()
+            if access_logger.isEnabledFor(logging.INFO):
+                log_access(route, request.method, request.path, status, seconds, size,
+                           request.remote_addr, cache)
+
+    @staticmethod
+    def _wants_profile(scope) -> bool:
+        client = scope.get("client")
+        header = next((v for k, v in scope.get("headers", []) if k.lower() == b"x-profile"), None)
+        return server.profiler.wants(
+            client[0] if client else None,
+            header.decode("latin-1") if header is not None else None,
+            scope.get("query_string", b"").decode("latin-1"),
+        )
+
+    async def _dispatch(self, handler, args, request, send):
+        if handler is not api_generate and _over_limit(handler.__name__, request, ROUTE_LIMITS.get(handler, ())):
+            return await send_json(send, {"error": "Too many requests"}, 429)
+        started = finished = False
+
+        async def tracked(message):
+            nonlocal started, finished
+            if message["type"] == "http.response.start":
+                started = True
+            elif message["type"] == "http.response.body" and not message.get("more_body"):
+                finished = True
+            await send(message)
+
+        try:
+            await handler(request, tracked, *args)
+        except Exception as e:
+            if not started:
+                return await self._send_error(handler, send, e)
+            # The status line is gone; all that's left is to end the body.
+            logger.error(f"Error in {handler.__name__} after the response started: {str(e)}", exc_info=True)
+            if not finished:
+                await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def _send_error(handler, send, e: Exception) -> None:
+        body, status = error_response(e, handler.__name__)
+        await send_json(send, body, status)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                io_executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+app = ThemeAPI(server.app)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=config.HOST, port=config.PORT, log_level="info")
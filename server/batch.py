@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Batch theme rendering from a manifest.
+
+A manifest lists (template, palette, output) items; ``run_batch`` renders
+them with ``themetemplate`` across a process pool and writes each output
+only when its bytes differ from the file on disk, so unchanged outputs are
+neither rewritten nor have their mtime touched.  The summary lists every
+item's status, output hash and render/write timings.
+
+Manifest (JSON), paths relative to the manifest's directory:
+
+  {"items": [
+    {"template": "catppuccin_enhanced.template.ovt",
+     "palette": {"base": "#1e1e2e", ...},          # or "palettes/mocha.json"
+     "output": "themes/mocha.ovt"}
+  ]}
+
+Run:
+  python server/batch.py manifest.json --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List, Optional, Sequence
+
+from generators import write_if_changed
+from themetemplate import load_template
+
+WRITTEN = "written"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    template: str
+    palette: Dict[str, str]
+    output: str
+
+
+def load_manifest(path: Path, out_dir: Optional[Path] = None) -> List[BatchItem]:
+    """Items of the manifest at ``path``; outputs resolve under ``out_dir``."""
+    path = Path(path)
+    base = path.resolve().parent
+    out_dir = Path(out_dir).resolve() if out_dir else base
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data["items"] if isinstance(data, dict) else data
+    items = []
+    for i, entry in enumerate(entries):
+        try:
+            palette = entry["palette"]
+            if isinstance(palette, str):
+                with open(base / palette, encoding="utf-8") as f:
+                    palette = json.load(f)
+            items.append(BatchItem(str(base / entry["template"]), dict(palette), str(out_dir / entry["output"])))
+        except (KeyError, TypeError, OSError, ValueError) as e:
+            raise ValueError(f"manifest item {i}: {e!r}") from None
+    return items
+
+
+def render_item(item: BatchItem) -> dict:
+    """Render one item and write it if it changed (runs in pool workers)."""
+    start = perf_counter()
+    result = {"output": item.output}
+    try:
+        data = load_template(Path(item.template)).render(item.palette).encode("utf-8")
+        rendered = perf_counter()
+        os.makedirs(os.path.dirname(item.output) or ".", exist_ok=True)
+        changed = write_if_changed(Path(item.output), data)
+        result.update(
+            status=WRITTEN if changed else UNCHANGED,
+            sha256=hashlib.sha256(data).hexdigest(),
+            render_ms=round((rendered - start) * 1000, 3),
+            write_ms=round((perf_counter() - rendered) * 1000, 3),
+        )
+    except Exception as e:
+        result.update(status=FAILED, error=str(e)[:500])
+    return result
+
+
+def run_batch(items: Sequence[BatchItem], pool: Optional[Executor] = None,
+              chunksize: Optional[int] = None) -> dict:
+    """Render ``items`` (on ``pool`` if given) and summarize the run."""
+    outputs = [item.output for item in items]
+    if len(set(outputs)) != len(outputs):
+        raise ValueError("manifest writes the same output more than once")
+    start = perf_counter()
+    if pool is None:
+        results = [render_item(item) for item in items]
+    else:
+        # A few chunks per worker keeps IPC low without starving the last one.
+        chunksize = chunksize or max(1, math.ceil(len(items) / (4 * (os.cpu_count() or 1))))
+        results = list(pool.map(render_item, items, chunksize=chunksize))
+    counts = {WRITTEN: 0, UNCHANGED: 0, FAILED: 0}
+    for r in results:
+        counts[r["status"]] += 1
+    return {
+        "total": len(results),
+        **counts,
+        "seconds": round(perf_counter() - start, 4),
+        "items": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("manifest", type=Path)
+    parser.add_argument("--out-dir", type=Path, help="resolve outputs here instead of next to the manifest")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="1 renders in this process")
+    args = parser.parse_args()
+
+    items = load_manifest(args.manifest, args.out_dir)
+    if args.workers > 1 and len(items) > 1:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            summary = run_batch(items, pool)
+    else:
+        summary = run_batch(items)
+    print(json.dumps(summary, indent=2))
+    return 1 if summary[FAILED] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Latency of one /api/generate script run per GENERATE_MODE.
+
+Runs every script in ``server.GENERATE_SCRIPTS`` through
+``run_generation_script`` (which includes writing the outputs) a number of
+times in each mode and reports the median per script.  Theme files are
+restored from a copy afterwards.
+
+Run from the server/ directory:
+  python benchmarks/bench_generate.py --runs 10
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+MODES = ("subprocess", "inprocess", "pool")
+
+CHILD = """
+import json, statistics, sys, time
+sys.path.insert(0, {server_dir!r})
+import server
+runs = {runs}
+server.run_generation_script(server.GENERATE_SCRIPTS[0])  # warm up imports / pool
+out = {{}}
+for script in server.GENERATE_SCRIPTS:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = server.run_generation_script(script)
+        samples.append(time.perf_counter() - start)
+        assert result.get("returncode") == 0, result
+    out[script] = statistics.median(samples) * 1000
+print(json.dumps(out))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    import json
+    root = SERVER_DIR.parent
+    outputs = ["catppuccin_enhanced_mocha.ovt", "catppuccin_enhanced_base.obt"]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in outputs:
+            shutil.copy2(root / name, Path(tmp) / name)
+        results = {}
+        try:
+            for mode in MODES:
+                env = dict(os.environ, GENERATE_MODE=mode, ACCESS_LOG="", RATELIMIT_ENABLED="false")
+                code = CHILD.format(server_dir=str(SERVER_DIR), runs=args.runs)
+                proc = subprocess.run([sys.executable, "-c", code], cwd=tmp, env=env,
+                                      capture_output=True, text=True, check=True)
+                results[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+        finally:
+            for name in outputs:
+                shutil.copy2(Path(tmp) / name, root / name)
+
+    scripts = list(results[MODES[0]])
+    print(f"{'script':<14}" + "".join(f"{m:>14}" for m in MODES) + "   (median ms)")
+    for script in scripts:
+        print(f"{script:<14}" + "".join(f"{results[m][script]:14.2f}" for m in MODES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Request latency with logging off, synchronous handlers, and queued handlers.
+
+Each mode runs in its own interpreter (logging is configured at import),
+with stderr and the log files on disk, and drives the Flask app in-process
+from N client threads so handler lock contention shows up:
+
+  off     no access log, root logger at WARNING
+  sync    LOG_QUEUED=false: handlers write on the request thread
+  queued  LOG_QUEUED=true (default): request threads only enqueue
+
+Run from the server/ directory:
+  python benchmarks/bench_logging.py --clients 8 --requests 2000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+ENDPOINTS = ["/api/themes", "/api/themes/catppuccin_enhanced_base.obt", "/health"]
+MODES = ("off", "sync", "queued")
+
+
+def child(mode: str, clients: int, requests: int) -> None:
+    sys.path.insert(0, str(SERVER_DIR))
+    import logging
+
+    import server
+
+    if mode == "off":
+        logging.getLogger().setLevel(logging.WARNING)
+    app = server.app
+    results = {}
+    for path in ENDPOINTS:
+        app.test_client().get(path)  # warm caches
+        latencies = []
+        lock = threading.Lock()
+
+        def worker():
+            client = app.test_client()
+            local = []
+            for _ in range(requests // clients):
+                start = time.perf_counter()
+                client.get(path)
+                local.append(time.perf_counter() - start)
+            with lock:
+                latencies.extend(local)
+
+        threads = [threading.Thread(target=worker) for _ in range(clients)]
+        wall = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - wall
+        latencies.sort()
+        results[path] = {
+            "p50_us": statistics.median(latencies) * 1e6,
+            "p99_us": latencies[int(len(latencies) * 0.99) - 1] * 1e6,
+            "req_s": len(latencies) / wall,
+        }
+    print(json.dumps(results))
+
+
+def run(mode: str, clients: int, requests: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            RATELIMIT_ENABLED="false",
+            LOG_QUEUED="false" if mode == "sync" else "true",
+            ACCESS_LOG="" if mode == "off" else str(Path(tmp) / "access.log"),
+        )
+        with open(Path(tmp) / "stderr.log", "w") as stderr:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, "--clients", str(clients),
+                 "--requests", str(requests)],
+                cwd=tmp, env=env, stdout=subprocess.PIPE, stderr=stderr, check=True, text=True,
+            ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000, help="per endpoint, split across clients")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args.child, args.clients, args.requests)
+
+    results = {mode: run(mode, args.clients, args.requests) for mode in MODES}
+    print(f"{'endpoint':<45} {'mode':<7} {'p50 us':>8} {'p99 us':>8} {'req/s':>8}")
+    for path in ENDPOINTS:
+        for mode in MODES:
+            r = results[mode][path]
+            print(f"{path:<45} {mode:<7} {r['p50_us']:8.0f} {r['p99_us']:8.0f} {r['req_s']:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Nearest-color lookups: distance matrix vs KD-tree, by palette size.
+
+For random palettes, times a batch of 26 queries (one per Catppuccin role,
+as the TextMate converter issues) and a large batch, with the index forced
+into each mode.  The crossover picks ``nearest.BRUTE_FORCE_MAX``.
+
+Run from the server/ directory:
+  python benchmarks/bench_nearest.py --queries 2000
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from colorspace import srgb_to_hex  # noqa: E402
+from nearest import NearestColors  # noqa: E402
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="16,64,256,512,2048,8192")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'colors':>6} {'build ms':>9} {'26q matrix':>11} {'26q tree':>9} "
+          f"{f'{args.queries}q matrix':>12} {f'{args.queries}q tree':>10}")
+    for size in map(int, args.sizes.split(",")):
+        palette = srgb_to_hex(rng.random((size, 3)))
+        queries = srgb_to_hex(rng.random((args.queries, 3)))
+        matrix = NearestColors(palette, brute_force_max=size)
+        build = timed(lambda: NearestColors(palette, brute_force_max=0), args.repeat)
+        tree = NearestColors(palette, brute_force_max=0)
+        assert np.allclose(matrix.query(queries)[0], tree.query(queries)[0])
+        print(f"{size:>6} {build:>9.2f} {timed(lambda: matrix.query(queries[:26]), args.repeat):>11.2f} "
+              f"{timed(lambda: tree.query(queries[:26]), args.repeat):>9.2f} "
+              f"{timed(lambda: matrix.query(queries), args.repeat):>12.1f} "
+              f"{timed(lambda: tree.query(queries), args.repeat):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
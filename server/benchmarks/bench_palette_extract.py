@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+TextMate conversion: copied ``colors`` keys vs the clustered palette.
+
+Builds VS Code-like themes (about 40 base colors reused across 300
+``colors`` keys, many with alpha suffixes, plus 150 token rules), converts
+each with the previous ``render_textmate_theme`` (every ``colors`` key
+copied into a variable) and the current one (a clustered 26-color palette
+mapped to Catppuccin roles), and reports output size, conversion time and
+the time and error count of ``validate_theme_content`` on the result, as a
+stand-in for loading the theme.
+
+Run from the server/ directory:
+  python benchmarks/bench_palette_extract.py --themes 50
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+from config import ROOT  # noqa: E402
+from generators import load_script  # noqa: E402
+from validation import validate_theme_content  # noqa: E402
+
+WIDGETS = ["editor", "sideBar", "activityBar", "statusBar", "tab", "panel", "terminal", "list", "input",
+           "button", "badge", "scrollbarSlider", "titleBar", "menu", "notification", "peekView",
+           "editorGutter", "editorWidget", "gitDecoration", "debugToolBar"]
+PARTS = ["background", "foreground", "border", "hoverBackground", "activeBackground",
+         "inactiveForeground", "focusBorder", "selectionBackground", "highlightForeground",
+         "shadow", "dropBackground", "activeForeground", "inactiveBackground", "hoverForeground", "separator"]
+
+
+def vscode_theme(rng: random.Random) -> dict:
+    base = [f"#{rng.randrange(1 << 24):06x}" for _ in range(40)]
+
+    def color():
+        c = rng.choice(base)
+        return c + rng.choice(["", "", "", "80", "40", "cc", "1a"])
+
+    return {
+        "name": "Synthetic",
+        "type": "dark",
+        "colors": {f"{w}.{p}": color() for w in WIDGETS for p in PARTS},
+        "tokenColors": [{"name": f"Rule {k}", "scope": [f"scope.{k}.{j}" for j in range(rng.randrange(1, 6))],
+                         "settings": {"foreground": rng.choice(base)}} for k in range(150)],
+    }
+
+
+def old_render(textmate_json, theme_name):
+    palette = {k.lower().replace(' ', '_'): v for k, v in textmate_json['colors'].items()}
+    color_vars = [f"    --{k}: {v};" for k, v in palette.items()]
+    semantic_vars = [f"    --{obs}: var(--{key}, {palette.get(key, next(iter(palette.values())))});"
+                     for obs, key in SCRIPT.catppuccin_semantic_mapping.items()]
+    return ("@OBSThemeMeta {\n    name: '%s';\n}\n\n@OBSThemeVars {\n%s\n\n%s\n}\n"
+            % (theme_name, "\n".join(color_vars), "\n".join(semantic_vars)))
+
+
+def measure(render, themes):
+    sizes, convert, load, errors = [], [], [], []
+    for theme in themes:
+        start = time.perf_counter()
+        text = render(theme, "Synthetic")
+        convert.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        report = validate_theme_content(text)
+        load.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(text.encode("utf-8")))
+        errors.append(len(report.errors))
+    return statistics.mean(sizes), statistics.median(convert), statistics.median(load), statistics.mean(errors)
+
+
+SCRIPT = load_script(ROOT, "script_2.py")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--themes", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    themes = [vscode_theme(rng) for _ in range(args.themes)]
+    SCRIPT.render_textmate_theme(themes[0], "warm-up")
+    print(f"{'':>10} {'bytes':>7} {'convert ms':>11} {'validate ms':>12} {'errors':>7}")
+    for label, render in (("copied", old_render), ("clustered", SCRIPT.render_textmate_theme)):
+        size, convert, load, errors = measure(render, themes)
+        print(f"{label:>10} {size:>7.0f} {convert:>11.2f} {load:>12.2f} {errors:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Palette-to-role assignment: the old greedy hue matcher vs palette_match.
+
+For random palettes of several sizes, times both assigners and scores the
+accent roles by their mean OKLab distance to the Catppuccin Mocha reference
+color of each role (lower is better).  The greedy version is the loop
+script_2.py used before: per role, the unused color with the nearest HLS
+hue, computed afresh for every pair.
+
+Run from the server/ directory:
+  python benchmarks/bench_palette_match.py --trials 20
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from colorsys import rgb_to_hls
+from pathlib import Path
+
+import numpy as np
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+from colorspace import hex_to_oklab, parse_hex  # noqa: E402
+from flavors import load_flavors  # noqa: E402
+from palette_match import ACCENT_ROLES, assign_palette  # noqa: E402
+
+REFERENCE = load_flavors(SERVER_DIR.parent / "palettes" / "catppuccin_flavors.json")["mocha"].palette
+HUE_TARGETS = {
+    'red': 0.0, 'maroon': 0.97, 'peach': 0.08, 'yellow': 0.15, 'green': 0.33, 'teal': 0.5, 'blue': 0.6,
+    'lavender': 0.7, 'mauve': 0.75, 'pink': 0.9, 'flamingo': 0.95, 'rosewater': 0.02, 'sky': 0.55, 'sapphire': 0.58,
+}
+
+
+def _hls(color):
+    r, g, b = parse_hex(color)
+    return rgb_to_hls(r / 255, g / 255, b / 255)
+
+
+def greedy_assign(palette):
+    ordered = sorted(palette, key=lambda c: _hls(c)[1])
+    mapping = {}
+    if len(ordered) >= 5:
+        mapping.update(zip(("base", "mantle", "surface0", "surface1", "surface2"), ordered))
+    if len(ordered) >= 8:
+        mapping.update(zip(("text", "subtext1", "subtext0", "overlay0", "overlay1", "overlay2"), ordered[::-1]))
+    used = set(mapping.values())
+    for key, target in HUE_TARGETS.items():
+        best, best_dist = None, 2.0
+        for color in palette:
+            if color in used:
+                continue
+            hue = _hls(color)[0]
+            dist = min(abs(hue - target), 1 - abs(hue - target))
+            if dist < best_dist:
+                best, best_dist = color, dist
+        if best:
+            mapping[key] = best
+            used.add(best)
+    return mapping
+
+
+def accent_error(mapping):
+    roles = [r for r in ACCENT_ROLES if r in mapping]
+    got = hex_to_oklab([mapping[r] for r in roles])
+    want = hex_to_oklab([REFERENCE[r] for r in roles])
+    return float(np.linalg.norm(got - want, axis=1).mean())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--sizes", default="16,64,256,512")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'colors':>6} {'greedy ms':>10} {'matched ms':>11} {'greedy dE':>10} {'matched dE':>11}")
+    for size in map(int, args.sizes.split(",")):
+        stats = {"greedy": ([], []), "matched": ([], [])}
+        for _ in range(args.trials):
+            palette = [f"#{rng.randrange(1 << 24):06x}" for _ in range(size)]
+            for label, assign in (("greedy", greedy_assign),
+                                  ("matched", lambda p: assign_palette(p, REFERENCE))):
+                start = time.perf_counter()
+                mapping = assign(palette)
+                stats[label][0].append((time.perf_counter() - start) * 1000)
+                stats[label][1].append(accent_error(mapping))
+        print(f"{size:>6} {statistics.median(stats['greedy'][0]):>10.2f} {statistics.median(stats['matched'][0]):>11.2f} "
+              f"{statistics.mean(stats['greedy'][1]):>10.4f} {statistics.mean(stats['matched'][1]):>11.4f}")
+
+
+if __name__ == "__main__":
+    main()
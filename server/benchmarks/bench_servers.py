@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Concurrent-client throughput: Flask dev server (server.py) vs ASGI mode (asgi.py).
+
+Starts each server in a subprocess on a free port with rate limiting off,
+then hammers a few read endpoints from N client threads for a fixed time.
+
+Run from the server/ directory:
+  python benchmarks/bench_servers.py --clients 32 --seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+ENDPOINTS = ["/api/themes", "/api/validate", "/api/themes/catppuccin_enhanced_base.obt"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port: int, timeout: float = 20.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def start(mode: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, PORT=str(port), RATELIMIT_ENABLED="false")
+    script = "server.py" if mode == "flask" else "asgi.py"
+    return subprocess.Popen(
+        [sys.executable, script], cwd=str(SERVER_DIR), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+def hammer(port: int, path: str, clients: int, seconds: float) -> dict:
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + seconds
+
+    def client():
+        nonlocal errors
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local = []
+        local_errors = 0
+        while time.perf_counter() < stop_at:
+            t0 = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status != 200:
+                    local_errors += 1
+            except OSError:
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            local.append(time.perf_counter() - t0)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors += local_errors
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    n = len(latencies)
+    return {
+        "rps": n / seconds,
+        "p50_ms": statistics.median(latencies) * 1000 if n else float("nan"),
+        "p95_ms": latencies[int(n * 0.95) - 1] * 1000 if n else float("nan"),
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'endpoint':<45} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>6}")
+    for mode in ("flask", "asgi"):
+        port = free_port()
+        proc = start(mode, port)
+        try:
+            wait_ready(port)
+            for path in ENDPOINTS:
+                hammer(port, path, 4, 0.5)  # warm caches
+                r = hammer(port, path, args.clients, args.seconds)
+                print(f"{mode:<6} {path:<45} {r['rps']:>8.0f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['errors']:>6}")
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
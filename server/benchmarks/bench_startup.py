@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Cold-start import time of the server and CLI entry points, with a budget.
+
+Each entry point is imported in a fresh interpreter under ``-X importtime``
+several times; the median cumulative import time of the module is compared
+against its budget and the slowest direct imports are listed.  Exits 1 when
+any entry point is over budget, so it can run in CI.
+
+Run from the server/ directory:
+  python benchmarks/bench_startup.py --runs 5
+  python benchmarks/bench_startup.py --budget server=400 --budget validate_cli=250
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+# Entry point module -> budget in milliseconds (cumulative import time).
+BUDGETS_MS = {
+    "server": 600,
+    "asgi": 800,
+    "validate_cli": 350,
+}
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(module: str) -> Tuple[int, List[Tuple[int, str]]]:
+    """Return (cumulative us of ``module``, [(cumulative us, name)] of its direct imports)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        # Run from a scratch directory so log files don't land in the tree.
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import sys; sys.path.insert(0, {str(SERVER_DIR)!r}); import {module}"],
+            cwd=tmp, env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True,
+        )
+    # importtime prints children before their parent, so collect direct
+    # imports until the next top-level line and keep them if it is ``module``.
+    total = None
+    children: List[Tuple[int, str]] = []
+    pending: List[Tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        if indent == 1:
+            if name == module:
+                total, children = cumulative, pending
+            pending = []
+        elif indent == 3:
+            pending.append((cumulative, name))
+    if total is None:
+        raise RuntimeError(f"{module} not found in importtime output")
+    return total, children
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="slowest direct imports to list")
+    parser.add_argument("--budget", action="append", default=[], metavar="MODULE=MS")
+    args = parser.parse_args()
+
+    budgets: Dict[str, float] = dict(BUDGETS_MS)
+    for item in args.budget:
+        module, _, ms = item.partition("=")
+        budgets[module] = float(ms)
+
+    failed = False
+    for module, budget in budgets.items():
+        totals = []
+        children: Dict[str, List[int]] = {}
+        for _ in range(args.runs):
+            total, direct = import_times(module)
+            totals.append(total)
+            for cumulative, name in direct:
+                children.setdefault(name, []).append(cumulative)
+        median_ms = statistics.median(totals) / 1000
+        ok = median_ms <= budget
+        failed |= not ok
+        print(f"{module:<14} median {median_ms:7.1f} ms  min {min(totals) / 1000:7.1f} ms  "
+              f"budget {budget:5.0f} ms  {'ok' if ok else 'OVER BUDGET'}")
+        slowest = sorted(((statistics.median(v) / 1000, k) for k, v in children.items()), reverse=True)
+        for ms, name in slowest[:args.top]:
+            print(f"    {ms:7.1f} ms  {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
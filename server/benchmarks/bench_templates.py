@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Palettes rendered per second: compiled templates vs ``str.format``.
+
+Renders the Catppuccin Enhanced template for N randomly varied palettes
+with ``str.format`` on the template text (what script_4 did), and with
+the compiled ``themetemplate.Template`` (what all generator scripts use
+now), and checks both produce the same text.
+
+Run from the server/ directory:
+  python benchmarks/bench_templates.py --palettes 5000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+from generators import load_script  # noqa: E402
+from themetemplate import load_template  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--palettes", type=int, default=5000)
+    args = parser.parse_args()
+
+    script_1 = load_script(SERVER_DIR.parent, "script_1.py")
+    source = Path(script_1.TEMPLATE_FILE).read_text(encoding="utf-8")
+    rng = random.Random(0)
+    palettes = [
+        dict({k: f"#{rng.randrange(1 << 24):06x}" for k in script_1.catppuccin_mocha},
+             name="Bench", theme_id="com.example.bench", dark="true")
+        for _ in range(args.palettes)
+    ]
+
+    start = time.perf_counter()
+    template = load_template(script_1.TEMPLATE_FILE)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    results = {}
+    for label, render in (("str.format", lambda p: source.format(**p)),
+                          ("compiled", template.render)):
+        start = time.perf_counter()
+        out = [render(p) for p in palettes]
+        seconds = time.perf_counter() - start
+        results[label] = out
+        print(f"{label:<12} {args.palettes / seconds:10.0f} palettes/s  "
+              f"{seconds / args.palettes * 1e6:7.1f} us/palette")
+    assert results["str.format"] == results["compiled"]
+    print(f"compile      {compile_ms:10.2f} ms once ({len(template.slots)} slots, {len(source)} chars)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+TextMate batch import throughput.
+
+Writes a few hundred synthetic VS Code themes (a couple of hundred
+``colors`` and ``tokenColors`` entries each, like real ones) as JSONC and
+as strict JSON, then times:
+
+  loop       script_2.generate_obs_theme_from_textmate per strict JSON file
+             (it can't read JSONC, and writes in place without fsync)
+  inprocess  textmate_import on the JSONC files in this process
+  pool-N     the same on a spawn process pool of N workers
+
+Run from the server/ directory:
+  python benchmarks/bench_textmate_import.py --themes 300 --workers 2,4
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+from config import ROOT  # noqa: E402
+from generators import load_script  # noqa: E402
+from textmate_import import collect, import_themes  # noqa: E402
+
+
+def synthetic_theme(rng: random.Random, i: int) -> dict:
+    def color():
+        return f"#{rng.randrange(1 << 24):06x}"
+
+    return {
+        "name": f"Synthetic {i}",
+        "type": rng.choice(["dark", "light"]),
+        "colors": {f"widget{k}.{part}": color() for k in range(50)
+                   for part in ("background", "foreground", "border", "hoverBackground")},
+        "tokenColors": [{"name": f"Token {k}", "scope": [f"scope.{k}"], "settings": {"foreground": color()}}
+                        for k in range(100)],
+    }
+
+
+def to_jsonc(theme: dict) -> str:
+    # Comments and trailing commas in the places real themes put them.
+    text = json.dumps(theme, indent=2).replace('",\n', '", // note\n')
+    return "/* generated */\n" + text.replace('"\n  }', '",\n  }')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--themes", type=int, default=300)
+    parser.add_argument("--workers", default="2,4")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for d in ("json", "jsonc", "out-loop", "out"):
+            (tmp / d).mkdir()
+        for i in range(args.themes):
+            theme = synthetic_theme(rng, i)
+            (tmp / "json" / f"theme-{i}.json").write_text(json.dumps(theme))
+            (tmp / "jsonc" / f"theme-{i}.jsonc").write_text(to_jsonc(theme))
+
+        script = load_script(ROOT, "script_2.py")
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for path in sorted((tmp / "json").iterdir()):
+                script.generate_obs_theme_from_textmate(str(path), str(tmp / "out-loop" / (path.stem + ".ovt")),
+                                                        path.stem)
+        runs = [("loop", time.perf_counter() - start, args.themes, 0)]
+
+        items = collect([tmp / "jsonc"], tmp / "out")
+        summary = import_themes(items)
+        runs.append(("inprocess", summary["seconds"], summary["written"], summary["failed"]))
+        for workers in map(int, args.workers.split(",")):
+            for path in (tmp / "out").iterdir():
+                path.unlink()
+            ctx = multiprocessing.get_context("spawn")
+            start = time.perf_counter()
+            with ProcessPoolExecutor(workers, mp_context=ctx) as pool:
+                summary = import_themes(items, pool)
+            runs.append((f"pool-{workers}", time.perf_counter() - start, summary["written"], summary["failed"]))
+
+    print(f"{'mode':>10} {'seconds':>8} {'themes/s':>9} {'written':>8} {'failed':>7}")
+    for mode, seconds, written, failed in runs:
+        print(f"{mode:>10} {seconds:>8.2f} {written / seconds:>9.0f} {written:>8} {failed:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Theme minification: size and load cost before and after.
+
+For every theme in the repository root that ``themecss`` can parse, reports
+the file size as written and minified (``minify_file``: unused variables
+dropped from variants only), the time ``validate_theme_content`` takes on
+each as a stand-in for OBS loading the theme, and the cost of a minify miss
+and of a ``MinifyCache`` hit.
+
+Run from the server/ directory:
+  python benchmarks/bench_themecompact.py --repeat 200
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+from config import ROOT  # noqa: E402
+from themecompact import MinifyCache, minify_file  # noqa: E402
+from themecss import ThemeSyntaxError  # noqa: E402
+from validation import validate_theme_content  # noqa: E402
+
+
+def per_call_ms(func, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    paths = sorted(p for p in ROOT.iterdir() if p.suffix in (".ovt", ".obt") and ".template." not in p.name)
+    cache = MinifyCache()
+    print(f"{'theme':>34} {'bytes':>7} {'min':>7} {'saved':>6} {'rules':>9} {'vars':>9} "
+          f"{'load ms':>8} {'min ms':>7} {'minify ms':>10} {'hit ms':>7}")
+    for path in paths:
+        try:
+            result = minify_file(path)
+        except ThemeSyntaxError as e:
+            print(f"{path.name:>34} skipped: {e}")
+            continue
+        r = result.report
+        text = path.read_text(encoding="utf-8")
+        load = per_call_ms(lambda: validate_theme_content(text), args.repeat)
+        load_min = per_call_ms(lambda: validate_theme_content(result.text), args.repeat)
+        miss = per_call_ms(lambda: minify_file(path), args.repeat)
+        cache.get(path)
+        hit = per_call_ms(lambda: cache.get(path), args.repeat)
+        print(f"{path.name:>34} {r.original_bytes:>7} {r.minified_bytes:>7} {r.saved_ratio:>6.1%} "
+              f"{r.rules_before:>4}->{r.rules_after:<4} {r.vars_before:>4}->{r.vars_after:<4} "
+              f"{load:>8.2f} {load_min:>7.2f} {miss:>10.2f} {hit:>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Flattening a catalog of variants that extend one base theme.
+
+Writes a base theme shaped like ``catppuccin_enhanced_base.obt`` (26 palette
+colors, a few hundred aliases up to four levels deep, ``--rules`` rules using
+them) and N variants that extend it and override the palette, then loads them
+into one ``Flattener`` and flattens every variant.  Reports, per catalog size,
+load and flatten time per theme and the ``var()`` references left in the
+output, so linear scaling shows as a flat per-theme cost.  The repository's
+own themes are flattened first for reference.
+
+Run from the server/ directory:
+  python benchmarks/bench_themeflatten.py --sizes 10,100,1000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+from config import ROOT  # noqa: E402
+from themeflatten import Flattener, theme_paths  # noqa: E402
+from validation import REQUIRED_VARS  # noqa: E402
+
+PALETTE = sorted(set(REQUIRED_VARS) | {"rosewater", "flamingo", "pink", "mauve", "red", "maroon", "peach",
+                                       "yellow", "green", "teal", "sky", "sapphire", "blue", "lavender"})
+
+
+def base_theme(rng: random.Random, aliases: int, rules: int) -> str:
+    names = list(PALETTE)
+    lines = [f"    --{n}: #{rng.randrange(1 << 24):06x};" for n in PALETTE]
+    for i in range(aliases):
+        # Alias a name from the last ~quarter so chains get a few levels deep.
+        target = rng.choice(names[-max(len(names) // 4, 1):] if rng.random() < 0.5 else names)
+        names.append(f"alias_{i}")
+        lines.append(f"    --alias_{i}: var(--{target});")
+    body = [f"QWidget#w{i} {{\n    color: var(--{rng.choice(names)});\n"
+            f"    border: 1px solid var(--{rng.choice(names)});\n}}\n" for i in range(rules)]
+    return ("@OBSThemeMeta {\n    name: 'Base';\n    id: 'com.bench.base';\n}\n\n"
+            "@OBSThemeVars {\n" + "\n".join(lines) + "\n}\n\n" + "\n".join(body))
+
+
+def variant(rng: random.Random, i: int) -> str:
+    palette = "\n".join(f"    --{n}: #{rng.randrange(1 << 24):06x};" for n in PALETTE)
+    return (f"@OBSThemeMeta {{\n    name: 'Variant {i}';\n    id: 'com.bench.v{i}';\n"
+            f"    extends: 'com.bench.base';\n}}\n\n@OBSThemeVars {{\n{palette}\n}}\n")
+
+
+def run(paths, ids_filter=None):
+    start = time.perf_counter()
+    flattener = Flattener(paths)
+    load = time.perf_counter() - start
+    ids = [t for t in flattener if ids_filter is None or ids_filter(t)]
+    start = time.perf_counter()
+    refs = sum(flattener.flatten(t).text.count("var(") for t in ids)
+    return len(ids), load, time.perf_counter() - start, refs, len(flattener.errors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--aliases", type=int, default=300)
+    parser.add_argument("--rules", type=int, default=180)
+    args = parser.parse_args()
+
+    print(f"{'catalog':>12} {'themes':>7} {'load ms/theme':>14} {'flatten ms/theme':>17} {'var() left':>11} "
+          f"{'skipped':>8}")
+    n, load, flat, refs, skipped = run(theme_paths(ROOT))
+    print(f"{'repository':>12} {n:>7} {load / n * 1000:>14.2f} {flat / n * 1000:>17.2f} {refs:>11} {skipped:>8}")
+
+    rng = random.Random(0)
+    base = base_theme(rng, args.aliases, args.rules)
+    for size in map(int, args.sizes.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            (tmp / "base.obt").write_text(base)
+            for i in range(size):
+                (tmp / f"v{i}.ovt").write_text(variant(rng, i))
+            n, load, flat, refs, skipped = run(sorted(tmp.iterdir()), lambda t: t != "com.bench.base")
+        print(f"{size:>12} {n:>7} {load / n * 1000:>14.2f} {flat / n * 1000:>17.2f} {refs:>11} {skipped:>8}")
+
+
+if __name__ == "__main__":
+    main()
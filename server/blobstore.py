@@ -0,0 +1,181 @@
+"""
+Optional content-addressed store for theme bodies.
+
+Blobs live under ``<store>/<first two hex chars>/<sha256>``.  Theme files in the
+catalog are references to those blobs: hardlinks by default, reflinks when
+requested and supported, plain copies only as a last resort (e.g. when the
+store sits on another filesystem).  Duplicating a theme therefore costs a
+directory entry instead of another copy of the body, and caches keyed on the
+file identity see one entry per unique body.
+
+Linked files share an inode with their blob, so they must only ever be
+replaced (temp file + rename, see ``themefile.atomic_write``), never rewritten
+in place.
+"""
+from __future__ import annotations
+
+import errno
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+CHUNK_SIZE = 64 * 1024
+
+LINK_MODES = ("hardlink", "reflink")
+
+# From linux/fs.h: _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    """Clone ``src`` into a new file ``dst`` sharing extents (btrfs/xfs)."""
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflink is only supported on Linux")
+    import fcntl
+
+    with open(src, "rb") as s:
+        fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        try:
+            fcntl.ioctl(fd, _FICLONE, s.fileno())
+        except OSError:
+            os.close(fd)
+            os.unlink(dst)
+            raise
+        os.close(fd)
+
+
+class BlobStore:
+    def __init__(self, root: Path, link_mode: str = "hardlink"):
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"link_mode must be one of {LINK_MODES}")
+        self.root = Path(root)
+        self.link_mode = link_mode
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._by_inode: Optional[Dict[Tuple[int, int], str]] = None
+
+    def blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _index(self) -> Dict[Tuple[int, int], str]:
+        """(st_dev, st_ino) -> digest for every blob, built once on demand."""
+        with self._lock:
+            if self._by_inode is None:
+                index = {}
+                for shard in os.scandir(self.root):
+                    if not shard.is_dir(follow_symlinks=False):
+                        continue
+                    for blob in os.scandir(shard.path):
+                        st = blob.stat(follow_symlinks=False)
+                        index[(st.st_dev, st.st_ino)] = blob.name
+                self._by_inode = index
+            return self._by_inode
+
+    def digest_for(self, stat_result: os.stat_result) -> Optional[str]:
+        """Digest of the blob a file references, or None if it is not linked."""
+        if stat_result.st_nlink < 2:
+            return None
+        return self._index().get((stat_result.st_dev, stat_result.st_ino))
+
+    def _remember(self, digest: str) -> None:
+        st = os.stat(self.blob_path(digest))
+        with self._lock:
+            if self._by_inode is not None:
+                self._by_inode[(st.st_dev, st.st_ino)] = digest
+
+    def ingest(self, path: Path) -> str:
+        """Make ``path`` a reference to its blob and return the digest.
+
+        The first file with a given body becomes the blob itself (a hardlink,
+        no copy).  Later files with the same body are swapped for a link to
+        the existing blob, releasing their own storage.
+        """
+        path = Path(path)
+        st = os.stat(path)
+        known = self.digest_for(st)
+        if known is not None:
+            return known
+        digest = self.hash_file(path)
+        blob = self.blob_path(digest)
+        blob.parent.mkdir(exist_ok=True)
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            self._replace_with_link(blob, path)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+            # Store on another filesystem: keep one private copy of the body.
+            fd, tmp = tempfile.mkstemp(dir=str(blob.parent))
+            os.close(fd)
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, blob)
+        self._remember(digest)
+        return digest
+
+    def _replace_with_link(self, blob: Path, path: Path) -> None:
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.lnk")
+        try:
+            self._link(blob, tmp)
+            os.replace(tmp, path)
+        except OSError as e:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            if e.errno != errno.EXDEV:
+                raise
+
+    def _link(self, blob: Path, dst: Path) -> None:
+        if self.link_mode == "reflink":
+            try:
+                _reflink(blob, dst)
+                return
+            except OSError:
+                pass
+        try:
+            os.link(blob, dst)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+            # copyfile would silently overwrite; keep the O_EXCL semantics.
+            with open(blob, "rb") as s, open(dst, "xb") as d:
+                shutil.copyfileobj(s, d, CHUNK_SIZE)
+
+    def duplicate(self, src: Path, dst: Path) -> str:
+        """Create ``dst`` as another reference to ``src``'s body.
+
+        Raises ``FileExistsError`` if ``dst`` already exists.
+        """
+        digest = self.ingest(src)
+        self._link(self.blob_path(digest), Path(dst))
+        return digest
+
+    def release(self, stat_result: os.stat_result) -> bool:
+        """Drop the blob behind a just-deleted file if nothing references it."""
+        digest = self._index().get((stat_result.st_dev, stat_result.st_ino))
+        if digest is None:
+            return False
+        blob = self.blob_path(digest)
+        try:
+            if os.stat(blob).st_nlink > 1:
+                return False
+            os.unlink(blob)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._by_inode.pop((stat_result.st_dev, stat_result.st_ino), None)
+        return True
@@ -0,0 +1,147 @@
+"""
+Incremental builds of generator outputs.
+
+Each registry generator's outputs depend on its script source, the input
+files it declares (templates, palette data), ``GENERATOR_VERSION`` and the
+output options the graph was created with (e.g. minification).
+``BuildGraph`` hashes those inputs before a build and records them, with each
+output's hash and stat, in a JSON manifest once the outputs are written.  A
+generator is stale when any input hash differs from the recorded one, or
+when one of its outputs is missing or no longer matches what was written.
+
+File hashes are memoized on (mtime, size), so checking a fresh tree costs a
+few ``stat`` calls and no reads.  The manifest is re-read when another
+process replaces it; concurrent writers can drop each other's entries, which
+only costs a rebuild.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from generators import GENERATOR_VERSION, GENERATORS
+from themefile import atomic_write
+
+MANIFEST_NAME = ".build-manifest.json"
+MANIFEST_VERSION = 2
+
+_digest_lock = threading.Lock()
+_digests: Dict[str, Tuple[int, int, str]] = {}
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of ``path``, recomputed only when its (mtime, size) changes."""
+    key = os.fspath(path)
+    st = os.stat(key)
+    with _digest_lock:
+        cached = _digests.get(key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+    h = hashlib.sha256()
+    with open(key, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    with _digest_lock:
+        _digests[key] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+class BuildGraph:
+    def __init__(self, manifest: Path, root: Path, out_dir: Path, options: Optional[dict] = None):
+        self.manifest = Path(manifest)
+        # Only options that are switched on, so adding one doesn't make
+        # every existing output stale.
+        self.options = {k: v for k, v in (options or {}).items() if v}
+        self.root = Path(root)
+        self.out_dir = Path(out_dir)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._loaded: Optional[Tuple[int, int]] = None
+
+    def inputs(self, name: str) -> Optional[dict]:
+        """Current input hashes of generator ``name``; None if it renders nothing."""
+        gen = GENERATORS.get(name)
+        if gen is None or gen.render is None:
+            return None
+        inputs = {
+            "generator": GENERATOR_VERSION,
+            "script": file_digest(self.root / gen.script),
+            "inputs": {p: file_digest(self.root / p) for p in gen.inputs},
+        }
+        if self.options:
+            inputs["options"] = self.options
+        return inputs
+
+    def stale(self, names: Iterable[str]) -> List[str]:
+        """The generators among ``names`` whose outputs need rebuilding.
+
+        Generators that render nothing have nothing to rebuild; names
+        missing from the registry are always stale.
+        """
+        with self._lock:
+            self._reload()
+            entries = dict(self._entries)
+        stale = []
+        for name in names:
+            gen = GENERATORS.get(name)
+            if gen is None:
+                stale.append(name)
+            elif gen.render is not None:
+                try:
+                    fresh = self._fresh(entries.get(name), self.inputs(name))
+                except OSError:
+                    fresh = False
+                if not fresh:
+                    stale.append(name)
+        return stale
+
+    def record(self, name: str, inputs: Optional[dict], outputs: Iterable[str]) -> None:
+        """Note that ``name`` just built ``outputs`` from ``inputs``."""
+        if inputs is None:
+            return
+        written = {}
+        for output in outputs:
+            path = self.out_dir / output
+            st = os.stat(path)
+            written[output] = {"sha256": file_digest(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        entry = {"inputs": inputs, "outputs": written}
+        with self._lock:
+            self._reload()
+            self._entries[name] = entry
+            data = json.dumps({"version": MANIFEST_VERSION, "generators": self._entries},
+                              indent=2, sort_keys=True).encode("utf-8")
+            st = atomic_write(self.manifest, lambda f: f.write(data))
+            self._loaded = (st.st_mtime_ns, st.st_size)
+
+    def _fresh(self, entry: Optional[dict], inputs: dict) -> bool:
+        if entry is None or entry["inputs"] != inputs or not entry["outputs"]:
+            return False
+        for output, recorded in entry["outputs"].items():
+            path = self.out_dir / output
+            st = os.stat(path)
+            if ((st.st_size, st.st_mtime_ns) != (recorded["size"], recorded["mtime_ns"])
+                    and file_digest(path) != recorded["sha256"]):
+                return False
+        return True
+
+    def _reload(self) -> None:
+        # Caller holds self._lock.
+        try:
+            st = os.stat(self.manifest)
+        except FileNotFoundError:
+            self._entries, self._loaded = {}, None
+            return
+        if self._loaded == (st.st_mtime_ns, st.st_size):
+            return
+        try:
+            with open(self.manifest, encoding="utf-8") as f:
+                data = json.load(f)
+            entries = data["generators"] if data.get("version") == MANIFEST_VERSION else {}
+        except (OSError, ValueError, KeyError, AttributeError):
+            entries = {}
+        self._entries, self._loaded = entries, (st.st_mtime_ns, st.st_size)
@@ -0,0 +1,136 @@
+"""
+Theme catalog scanning for flat, nested or hash-sharded theme directories.
+
+The root is read with ``os.scandir`` and every subdirectory directly under it
+(a "shard") is walked as its own task on the supplied executor, so large
+sharded layouts are listed in parallel.  ``DirEntry`` caches its stat result,
+so each file costs a single ``stat`` call.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import posixpath
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable, List, Optional
+
+THEME_EXTENSIONS = frozenset({'.ovt', '.obt', '.json'})
+
+# Never descend into these, nor into hidden directories (.git, blob store...).
+SKIP_DIRS = frozenset({'node_modules', '__pycache__'})
+
+Annotate = Callable[[dict, os.stat_result], None]
+
+
+def _is_theme(name: str) -> bool:
+    # ``*.template.ovt`` files are generator inputs (see themetemplate.py), not themes.
+    return os.path.splitext(name)[1].lower() in THEME_EXTENSIONS and ".template." not in name
+
+
+def _entry(rel: str, stat_result: os.stat_result, annotate: Optional[Annotate]) -> dict:
+    entry = {
+        "name": rel,
+        "path": rel,
+        "size": stat_result.st_size,
+        "modified": stat_result.st_mtime,
+    }
+    if annotate is not None:
+        annotate(entry, stat_result)
+    return entry
+
+
+def _walk(top: str, rel_top: str, depth: int, max_depth: int, annotate: Optional[Annotate]) -> List[dict]:
+    """Iteratively list theme files below ``top`` down to ``max_depth``."""
+    results = []
+    stack = [(top, rel_top, depth)]
+    while stack:
+        path, rel, level = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+        with it:
+            for de in it:
+                if de.name.startswith('.'):
+                    continue
+                child_rel = posixpath.join(rel, de.name) if rel else de.name
+                try:
+                    if de.is_dir(follow_symlinks=False):
+                        if level < max_depth and de.name not in SKIP_DIRS:
+                            stack.append((de.path, child_rel, level + 1))
+                    elif de.is_file() and _is_theme(de.name):
+                        results.append(_entry(child_rel, de.stat(), annotate))
+                except OSError:
+                    continue
+    return results
+
+
+def scan_themes(
+    root: Path,
+    max_depth: int = 0,
+    executor: Optional[Executor] = None,
+    annotate: Optional[Annotate] = None,
+) -> List[dict]:
+    """Return catalog entries for theme files under ``root``, sorted by path.
+
+    ``max_depth`` 0 keeps the historic flat layout; higher values follow
+    that many levels of subdirectories.  Entry ``name``/``path`` are POSIX
+    paths relative to ``root``.
+    """
+    results = []
+    shards = []
+    try:
+        with os.scandir(root) as it:
+            for de in it:
+                if de.name.startswith('.'):
+                    continue
+                try:
+                    if de.is_dir(follow_symlinks=False):
+                        if max_depth > 0 and de.name not in SKIP_DIRS:
+                            shards.append((de.path, de.name))
+                    elif de.is_file() and _is_theme(de.name):
+                        results.append(_entry(de.name, de.stat(), annotate))
+                except OSError:
+                    continue
+    except OSError:
+        return []
+
+    if executor is not None and len(shards) > 1:
+        futures = [executor.submit(_walk, path, rel, 1, max_depth, annotate) for path, rel in shards]
+        for fut in futures:
+            results.extend(fut.result())
+    else:
+        for path, rel in shards:
+            results.extend(_walk(path, rel, 1, max_depth, annotate))
+
+    results.sort(key=lambda r: r["path"])
+    return results
+
+
+def is_safe_relative_path(filename: str, max_depth: int = 0) -> bool:
+    """Check a client-supplied theme path before it is joined onto the root.
+
+    Accepts ``name.ext`` or, when ``max_depth`` allows, ``dir/.../name.ext``
+    with forward slashes only.  Rejects absolute paths, backslashes, empty,
+    ``.``/``..`` or hidden components, and anything but a theme extension.
+    """
+    if not filename or len(filename) > 1024:
+        return False
+    if '..' in filename or '\\' in filename or '\x00' in filename:
+        return False
+    parts = filename.split('/')
+    if len(parts) > max_depth + 1:
+        return False
+    for part in parts:
+        if not part or part.startswith('.') or len(part) > 255:
+            return False
+    return _is_theme(parts[-1])
+
+
+def shard_path(name: str, levels: int) -> str:
+    """Place ``name`` under ``levels`` two-hex-digit directories of its hash."""
+    if levels <= 0:
+        return name
+    digest = hashlib.sha1(name.encode('utf-8')).hexdigest()
+    return posixpath.join(*(digest[2 * i:2 * i + 2] for i in range(levels)), name)
@@ -0,0 +1,72 @@
+"""
+Color conversions on NumPy arrays.
+
+Colors travel as ``(n, 3)`` float arrays: sRGB in 0..1, OKLab as (L, a, b)
+and OKLCh as (L, C, h) with the hue in radians.  Hex strings may be
+``#rgb``, ``#rrggbb`` or ``#rrggbbaa`` (alpha is ignored).
+"""
+from __future__ import annotations
+
+from typing import List, Sequence
+
+import numpy as np
+
+# Björn Ottosson's OKLab matrices (linear sRGB -> LMS -> OKLab).
+_RGB_TO_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+_LMS_TO_LAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+_LAB_TO_LMS = np.linalg.inv(_LMS_TO_LAB)
+_LMS_TO_RGB = np.linalg.inv(_RGB_TO_LMS)
+
+
+def parse_hex(color: str) -> tuple:
+    """(r, g, b) bytes of a hex color."""
+    h = color.strip().lstrip("#")
+    if len(h) in (3, 4):
+        h = "".join(c * 2 for c in h[:3])
+    elif len(h) in (6, 8):
+        h = h[:6]
+    else:
+        raise ValueError(f"not a hex color: {color!r}")
+    return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16)
+
+
+def hex_to_srgb(colors: Sequence[str]) -> np.ndarray:
+    return np.array([parse_hex(c) for c in colors], dtype=float).reshape(-1, 3) / 255.0
+
+
+def srgb_to_hex(rgb: np.ndarray) -> List[str]:
+    values = np.clip(np.rint(np.asarray(rgb, dtype=float).reshape(-1, 3) * 255), 0, 255).astype(int)
+    return [f"#{r:02x}{g:02x}{b:02x}" for r, g, b in values]
+
+
+def srgb_to_oklab(rgb: np.ndarray) -> np.ndarray:
+    rgb = np.asarray(rgb, dtype=float)
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    return np.cbrt(linear @ _RGB_TO_LMS.T) @ _LMS_TO_LAB.T
+
+
+def oklab_to_srgb(lab: np.ndarray) -> np.ndarray:
+    linear = (np.asarray(lab, dtype=float) @ _LAB_TO_LMS.T) ** 3 @ _LMS_TO_RGB.T
+    linear = np.clip(linear, 0.0, 1.0)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+
+
+def oklab_to_oklch(lab: np.ndarray) -> np.ndarray:
+    lab = np.asarray(lab, dtype=float)
+    return np.stack([lab[:, 0], np.hypot(lab[:, 1], lab[:, 2]), np.arctan2(lab[:, 2], lab[:, 1])], axis=1)
+
+
+def hex_to_oklab(colors: Sequence[str]) -> np.ndarray:
+    return srgb_to_oklab(hex_to_srgb(colors))
+
+
+def hex_to_oklch(colors: Sequence[str]) -> np.ndarray:
+    return oklab_to_oklch(hex_to_oklab(colors))
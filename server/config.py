@@ -0,0 +1,88 @@
+"""
+Server configuration, read from the environment.
+
+Kept free of Flask and other heavy imports so command-line tools such as
+``validate_cli.py`` can share the theme layout settings with the server.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = Path(__file__).resolve().parent
+
+
+@dataclass
+class Config:
+    HOST: str = os.getenv('HOST', '127.0.0.1')
+    PORT: int = int(os.getenv('PORT', '5000'))
+    DEBUG: bool = os.getenv('DEBUG', 'False').lower() == 'true'
+    SECRET_KEY: str = os.getenv('SECRET_KEY') or os.urandom(32).hex()
+    MAX_CONTENT_LENGTH: int = int(os.getenv('MAX_CONTENT_LENGTH', '1048576'))  # 1MB
+    RATELIMIT_ENABLED: bool = os.getenv('RATELIMIT_ENABLED', 'True').lower() == 'true'
+    # e.g. redis://host:6379 so every worker counts against the same limits.
+    RATELIMIT_STORAGE_URI: str = os.getenv('RATELIMIT_STORAGE_URI', 'memory://')
+    # Content-addressed theme bodies; empty disables the store. Relative paths
+    # are resolved against the repository root.
+    BLOB_STORE_DIR: str = os.getenv('BLOB_STORE_DIR', '')
+    BLOB_LINK_MODE: str = os.getenv('BLOB_LINK_MODE', 'hardlink')
+    # Where theme files live (relative to the repository root, default: the
+    # root itself), how many subdirectory levels are scanned, and how many
+    # hash-shard levels new files are placed under.
+    THEMES_DIR: str = os.getenv('THEMES_DIR', '')
+    THEMES_MAX_DEPTH: int = int(os.getenv('THEMES_MAX_DEPTH', '0'))
+    THEMES_SHARD_LEVELS: int = int(os.getenv('THEMES_SHARD_LEVELS', '0'))
+    # SQLite database shared by all worker processes for the catalog and
+    # parse cache; empty keeps both purely in-process.
+    SHARED_CACHE_PATH: str = os.getenv('SHARED_CACHE_PATH', '')
+    # Production launcher (serve.py) settings.
+    WORKERS: int = int(os.getenv('WORKERS', str(min(2 * (os.cpu_count() or 1) + 1, 8))))
+    THREADS: int = int(os.getenv('THREADS', '4'))
+    WORKER_CLASS: str = os.getenv('WORKER_CLASS', 'gthread')  # sync | gthread | asgi
+    TIMEOUT: int = int(os.getenv('TIMEOUT', '120'))
+    GRACEFUL_TIMEOUT: int = int(os.getenv('GRACEFUL_TIMEOUT', '30'))
+    KEEPALIVE: int = int(os.getenv('KEEPALIVE', '5'))
+    # Generation scripts run concurrently on this many background threads.
+    GENERATE_WORKERS: int = int(os.getenv('GENERATE_WORKERS', '3'))
+    # inprocess: call the scripts' render functions on a thread of this
+    # process; pool: same on a warm process pool; subprocess: run each script
+    # in a new interpreter. Every mode gives up on a script after 30 s.
+    GENERATE_MODE: str = os.getenv('GENERATE_MODE', 'inprocess')
+    # Write generated themes compacted (see themecompact.py).
+    GENERATE_MINIFY: bool = os.getenv('GENERATE_MINIFY', 'False').lower() == 'true'
+    # Log files rotate at LOG_MAX_BYTES; ACCESS_LOG (JSON lines) is disabled
+    # when empty. LOG_QUEUED=false writes from the request thread instead.
+    LOG_MAX_BYTES: int = int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT: int = int(os.getenv('LOG_BACKUP_COUNT', '5'))
+    ACCESS_LOG: str = os.getenv('ACCESS_LOG', 'access.log')
+    LOG_QUEUED: bool = os.getenv('LOG_QUEUED', 'True').lower() == 'true'
+    # Lospec palettes: on-disk cache and offline mirror directories (relative
+    # to the repository root; empty disables either), cache TTL in seconds,
+    # and how many palettes are fetched at once.
+    LOSPEC_CACHE_DIR: str = os.getenv('LOSPEC_CACHE_DIR', '.lospec-cache')
+    LOSPEC_MIRROR_DIR: str = os.getenv('LOSPEC_MIRROR_DIR', 'palettes/lospec')
+    LOSPEC_CACHE_TTL: int = int(os.getenv('LOSPEC_CACHE_TTL', str(7 * 24 * 3600)))
+    LOSPEC_OFFLINE: bool = os.getenv('LOSPEC_OFFLINE', 'False').lower() == 'true'
+    LOSPEC_WORKERS: int = int(os.getenv('LOSPEC_WORKERS', '8'))
+    # Opt-in per-request profiling (see profiling.py). PROFILE_DIR is
+    # relative to the repository root.
+    PROFILING_ENABLED: bool = os.getenv('PROFILING_ENABLED', 'False').lower() == 'true'
+    PROFILE_MODE: str = os.getenv('PROFILE_MODE', 'cprofile')  # cprofile | sample
+    PROFILE_DIR: str = os.getenv('PROFILE_DIR', 'server/profiles')
+    PROFILE_KEEP: int = int(os.getenv('PROFILE_KEEP', '20'))
+    PROFILE_ALLOWED_CLIENTS: str = os.getenv('PROFILE_ALLOWED_CLIENTS', '127.0.0.1,::1')
+
+    def __post_init__(self):
+        if self.THEMES_SHARD_LEVELS > self.THEMES_MAX_DEPTH:
+            raise ValueError("THEMES_SHARD_LEVELS cannot exceed THEMES_MAX_DEPTH")
+        if self.THEMES_MAX_DEPTH > 0 and (ROOT / self.THEMES_DIR).resolve() == ROOT:
+            # Below the repository root are palettes/*.json, apps/**/package.json
+            # and server/, none of which are themes.
+            raise ValueError("THEMES_MAX_DEPTH > 0 requires THEMES_DIR to name a theme directory")
+        if self.GENERATE_MODE not in ('inprocess', 'pool', 'subprocess'):
+            raise ValueError("GENERATE_MODE must be inprocess, pool or subprocess")
+        if self.DEBUG and self.SECRET_KEY == 'dev-key-change-in-production':
+            import warnings
+            warnings.warn("Using default secret key in debug mode", UserWarning)
@@ -0,0 +1,76 @@
+"""
+Catppuccin flavor tables.
+
+A flavor table is a JSON object mapping a flavor key (``latte``, ``mocha``,
+...) to ``{"label", "dark", "palette"}``.  A flavor may instead name another
+with ``"inherits"`` and list only the colors that differ.  Keys starting with
+``_`` are comments.  Later tables add flavors or replace earlier ones, so
+user-defined flavors can live in their own file.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping
+
+# The 26 Catppuccin color names every resolved palette must define.
+PALETTE_KEYS = (
+    "rosewater", "flamingo", "pink", "mauve", "red", "maroon", "peach", "yellow",
+    "green", "teal", "sky", "sapphire", "blue", "lavender", "text", "subtext1",
+    "subtext0", "overlay2", "overlay1", "overlay0", "surface2", "surface1",
+    "surface0", "base", "mantle", "crust",
+)
+
+
+@dataclass(frozen=True)
+class Flavor:
+    key: str
+    label: str
+    dark: bool
+    palette: Mapping[str, str]
+
+    @property
+    def theme_id(self) -> str:
+        return f"com.catppuccin.enhanced.{self.key}"
+
+    @property
+    def name(self) -> str:
+        return f"Catppuccin Enhanced {self.label}"
+
+
+def load_flavors(*paths: Path) -> Dict[str, Flavor]:
+    """Flavors from the tables at ``paths``, in order, with inheritance resolved."""
+    rows: Dict[str, dict] = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            table = json.load(f)
+        rows.update((k, v) for k, v in table.items() if not k.startswith("_"))
+
+    flavors: Dict[str, Flavor] = {}
+
+    def resolve(key: str, seen: tuple) -> Flavor:
+        if key in flavors:
+            return flavors[key]
+        if key in seen:
+            raise ValueError(f"flavor {key!r} inherits from itself")
+        if key not in rows:
+            raise ValueError(f"unknown flavor {key!r}")
+        row = rows[key]
+        palette = dict(row.get("palette", {}))
+        parent = None
+        if "inherits" in row:
+            parent = resolve(row["inherits"], seen + (key,))
+            palette = dict(parent.palette, **palette)
+        missing = [k for k in PALETTE_KEYS if k not in palette]
+        if missing:
+            raise ValueError(f"flavor {key!r} is missing colors: {', '.join(missing)}")
+        flavors[key] = Flavor(
+            key,
+            row.get("label", key.capitalize()),
+            bool(row.get("dark", parent.dark if parent else True)),
+            palette,
+        )
+        return flavors[key]
+
+    return {key: resolve(key, ()) for key in rows}
@@ -0,0 +1,152 @@
+"""
+In-process theme generators.
+
+The generator scripts in the repository root expose pure ``render_theme``
+style functions next to their command-line ``main()``.  This registry
+imports each script once (again only when the file changes), calls its
+render function and writes the result atomically, so ``/api/generate`` no
+longer starts a Python interpreter per script.  Renders can also run on a
+warm process pool (``GENERATE_MODE=pool``) to keep them off the server's GIL.
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+import threading
+from concurrent.futures import Executor, TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Optional, Tuple, Union
+
+from themecompact import minify as minify_theme
+from themecss import ThemeSyntaxError
+from themefile import atomic_write
+
+
+# Part of every output's build inputs (see buildgraph.py); bump it when a
+# change here or in themetemplate.py alters what generators write.
+GENERATOR_VERSION = 2
+
+
+@dataclass(frozen=True)
+class Generator:
+    script: str                 # file in the repository root
+    render: Optional[str]       # pure function returning theme text
+    output: Optional[str]       # file written under the themes root; None: render
+                                # returns {file name: theme text}
+    inputs: Tuple[str, ...] = ()  # other root files the output depends on
+
+
+GENERATORS: Dict[str, Generator] = {
+    # Every Catppuccin flavor in palettes/catppuccin_flavors.json, in one pass.
+    "script_1.py": Generator("script_1.py", "render_flavors", None,
+                             ("catppuccin_enhanced.template.ovt", "catppuccin_enhanced_override.template.ovt",
+                              "palettes/catppuccin_flavors.json")),
+    # Lospec/TextMate converters; they need an input, so there's no default output.
+    "script_2.py": Generator("script_2.py", None, None),
+    "script_3.py": Generator("script_3.py", "render_theme", "catppuccin_enhanced_base.obt",
+                             ("catppuccin_enhanced_base.template.obt", "palettes/catppuccin_flavors.json")),
+    "script_4.py": Generator("script_4.py", "render_theme", "dracula_theme.ovt",
+                             ("dracula_theme.template.ovt",)),
+}
+
+_modules_lock = threading.Lock()
+_modules: Dict[str, Tuple[int, int, ModuleType]] = {}
+
+
+def load_script(root: Path, script: str) -> ModuleType:
+    """Import ``root/script`` as a module, reusing it until the file changes."""
+    path = Path(root) / script
+    st = os.stat(path)
+    with _modules_lock:
+        cached = _modules.get(str(path))
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            return cached[2]
+        spec = importlib.util.spec_from_file_location(f"_obs_styla_{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[str(path)] = (st.st_mtime_ns, st.st_size, module)
+        return module
+
+
+def render(root: Path, name: str, **options) -> Union[str, Dict[str, str]]:
+    """Theme text of generator ``name``; ``options`` go to its render function.
+
+    Multi-output generators (``output`` None) return {file name: text}.
+    """
+    gen = GENERATORS[name]
+    if gen.render is None:
+        raise ValueError(f"{name} has no default output to render")
+    return getattr(load_script(root, gen.script), gen.render)(**options)
+
+
+def _render_in_worker(root: str, name: str) -> Union[str, Dict[str, str]]:
+    # Process-pool entry point; the worker keeps its imported scripts warm.
+    return render(Path(root), name)
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """Atomically replace ``path`` with ``data`` unless it already holds it."""
+    try:
+        with open(path, "rb") as f:
+            # A size mismatch settles it without reading the file.
+            if os.fstat(f.fileno()).st_size == len(data) and f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    atomic_write(path, lambda f: f.write(data))
+    return True
+
+
+def _minified(output: str, text: str) -> Tuple[str, str]:
+    # Base themes (.obt) are extended by variants that may read any of their
+    # variables, so only variants lose their unused ones.
+    try:
+        result = minify_theme(text, drop_unused_vars=not output.endswith(".obt"))
+    except ThemeSyntaxError as e:
+        return text, f" (not minified: {e})"
+    r = result.report
+    return result.text, f" ({r.original_bytes} -> {r.minified_bytes} bytes)"
+
+
+def run_generator(name: str, root: Path, out_dir: Path, pool: Optional[Executor] = None,
+                  minify: bool = False, timeout: Optional[float] = None) -> dict:
+    """Run generator ``name`` and write its output; returns a generation result.
+
+    With ``minify`` each output is compacted with ``themecompact.minify``
+    first and the size reduction is noted in ``stdout``.  A render on
+    ``pool`` that takes longer than ``timeout`` seconds is abandoned and
+    reported as ``{"status": "timeout"}``; nothing is written.
+    """
+    gen = GENERATORS[name]
+    if gen.render is None:
+        load_script(root, gen.script)  # still fails loudly if the script is broken
+        return {"script": name, "returncode": 0, "stdout": "", "stderr": "", "outputs": []}
+    if pool is not None:
+        future = pool.submit(_render_in_worker, str(root), name)
+        try:
+            rendered = future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            return {"script": name, "status": "timeout"}
+    else:
+        rendered = render(root, name)
+    if gen.output is not None:
+        rendered = {gen.output: rendered}
+    lines = []
+    for output, text in rendered.items():
+        if os.path.basename(output) != output or output.startswith("."):
+            raise ValueError(f"{name} produced an invalid output name {output!r}")
+        note = ""
+        if minify:
+            text, note = _minified(output, text)
+        changed = write_if_changed(Path(out_dir) / output, text.encode("utf-8"))
+        lines.append(f"{'Wrote' if changed else 'Unchanged'} {output}{note}")
+    return {
+        "script": name,
+        "returncode": 0,
+        "stdout": "\n".join(lines),
+        "stderr": "",
+        "outputs": list(rendered),
+    }
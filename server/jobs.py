@@ -0,0 +1,258 @@
+"""
+Background generation jobs.
+
+``JobQueue.submit`` returns at once with a job whose scripts run
+concurrently on a bounded executor; ``JobQueue.get`` reports per-script
+status, timings and (truncated) output while it runs.  A submit whose key
+matches a job still in flight joins that job instead of starting another.
+
+With a ``SharedStore`` job snapshots are written through to SQLite, so under
+a prefork server any worker can answer for a job and identical requests
+landing on different workers still coalesce.
+"""
+from __future__ import annotations
+
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+
+RunScript = Callable[[str], dict]
+
+
+def new_job_id() -> str:
+    return secrets.token_hex(8)
+
+
+class Job:
+    def __init__(self, job_id: str, key: str, scripts: Iterable[str]):
+        self.id = job_id
+        self.key = key
+        self.state = PENDING
+        self.created = time.time()
+        self.finished: Optional[float] = None
+        self.requests = 1
+        self.scripts: Dict[str, dict] = {s: {"script": s, "status": PENDING} for s in scripts}
+        self.done = threading.Event()
+        self.version = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _touch(self) -> None:
+        # Caller holds self._lock.
+        self.version += 1
+        self._changed.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "id": self.id,
+                "state": self.state,
+                "created": self.created,
+                "finished": self.finished,
+                "requests": self.requests,
+                "scripts": [dict(s) for s in self.scripts.values()],
+            }
+
+
+class JobQueue:
+    def __init__(self, executor: Executor, run_script: RunScript,
+                 on_done: Optional[Callable[[Job], None]] = None,
+                 shared=None, keep: int = 100, stale_after: float = 600.0):
+        self.executor = executor
+        self.run_script = run_script
+        self.on_done = on_done
+        self.shared = shared
+        self.keep = keep
+        # A shared in-flight job not updated for this long is presumed to
+        # belong to a dead worker and is no longer joined.
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._inflight: Dict[str, Job] = {}
+        self._subscribers: Dict[str, List[Callable[[], None]]] = {}
+
+    def submit(self, key: str, scripts: Iterable[str]) -> Tuple[dict, bool]:
+        """Start (or join) the job for ``key``; returns (snapshot, coalesced)."""
+        scripts = tuple(scripts)
+        with self._lock:
+            joined = self._inflight.get(key)
+            if joined is not None:
+                with joined._lock:
+                    joined.requests += 1
+                    joined._touch()
+            else:
+                job = Job(new_job_id(), key, scripts)
+                if self.shared is not None:
+                    existing = self.shared.claim_job(key, job.id, job.snapshot(), self.stale_after)
+                    if existing is not None:
+                        return existing, True
+                self._inflight[key] = job
+                self._remember(job)
+        if joined is not None:
+            # Other workers read the count from the shared store.
+            self._publish(joined)
+            return self._snapshot(joined), True
+        with job._lock:
+            job.state = RUNNING
+            job._touch()
+        self._publish(job)
+        for script in scripts:
+            self.executor.submit(self._run, job, script)
+        return self._snapshot(job), False
+
+    def _snapshot(self, job: Job) -> dict:
+        """``job.snapshot()`` counting requests that joined from other workers."""
+        snapshot = job.snapshot()
+        if self.shared is not None:
+            snapshot["requests"] += self.shared.job_joins(job.id)
+        return snapshot
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return self._snapshot(job)
+        if self.shared is not None:
+            return self.shared.get_job(job_id)
+        return None
+
+    def wait(self, job_id: str, timeout: Optional[float] = None, poll: float = 0.25) -> Optional[dict]:
+        """Block until the job is done; returns its final snapshot.
+
+        Jobs run by another worker are polled through the shared store.
+        Returns the latest snapshot (possibly unfinished) on timeout.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            job.done.wait(timeout)
+            return self._snapshot(job)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.get(job_id)
+            if snapshot is None or snapshot["state"] == DONE:
+                return snapshot
+            if deadline is not None and time.monotonic() >= deadline:
+                return snapshot
+            time.sleep(poll)
+
+    def watch(self, job_id: str, heartbeat: float = 15.0, poll: float = 0.25) -> Iterator[Optional[dict]]:
+        """Yield a job's snapshot each time it changes, ending once it is done.
+
+        Yields None after ``heartbeat`` seconds without a change so callers
+        can keep a connection alive.  Jobs run by another worker are polled
+        through the shared store.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        last = None
+        seen = -1
+        idle = 0.0
+        while True:
+            if job is not None:
+                with job._changed:
+                    job._changed.wait_for(lambda: job.version != seen, timeout=heartbeat)
+                    seen = job.version
+                snapshot = self._snapshot(job)
+            else:
+                snapshot = self.get(job_id)
+                if snapshot is None:
+                    return
+            if snapshot != last:
+                last, idle = snapshot, 0.0
+                yield snapshot
+                if snapshot["state"] == DONE:
+                    return
+            elif job is not None:
+                yield None
+            else:
+                time.sleep(poll)
+                idle += poll
+                if idle >= heartbeat:
+                    idle = 0.0
+                    yield None
+
+    def subscribe(self, job_id: str, callback: Callable[[], None]) -> Optional[Callable[[], None]]:
+        """Call ``callback()`` from the job's threads each time it changes.
+
+        Unlike ``watch`` this ties up no thread between changes; the callback
+        only signals, and the subscriber reads the job with ``get``.  Returns
+        a function that unsubscribes, or None if the job isn't run by this
+        queue (a finished or another worker's job has no more changes to
+        push; poll ``get`` instead).
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done.is_set():
+                return None
+            self._subscribers.setdefault(job_id, []).append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                callbacks = self._subscribers.get(job_id, [])
+                if callback in callbacks:
+                    callbacks.remove(callback)
+                if not callbacks:
+                    self._subscribers.pop(job_id, None)
+        return unsubscribe
+
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.keep:
+            oldest = next(iter(self._jobs.values()))
+            if not oldest.done.is_set():
+                break
+            self._jobs.popitem(last=False)
+
+    def _run(self, job: Job, script: str) -> None:
+        start = time.time()
+        with job._lock:
+            job.scripts[script].update(status=RUNNING, started=start)
+            job._touch()
+        self._publish(job)
+        try:
+            result = self.run_script(script)
+        except Exception as e:
+            result = {"script": script, "status": "error", "error": str(e)[:500]}
+        finished = time.time()
+        if "status" not in result:
+            result = dict(result, status="ok" if result.get("returncode") == 0 else "failed")
+        with job._lock:
+            job.scripts[script] = dict(result, started=start, finished=finished,
+                                       duration=round(finished - start, 3))
+            last = all(s["status"] not in (PENDING, RUNNING) for s in job.scripts.values())
+            if not last:
+                job._touch()
+        if last:
+            self._finish(job)
+        else:
+            self._publish(job)
+
+    def _finish(self, job: Job) -> None:
+        try:
+            if self.on_done is not None:
+                self.on_done(job)
+        finally:
+            with self._lock:
+                self._inflight.pop(job.key, None)
+            with job._lock:
+                job.state = DONE
+                job.finished = time.time()
+                job._touch()
+            self._publish(job)
+            job.done.set()
+
+    def _publish(self, job: Job) -> None:
+        if self.shared is not None:
+            self.shared.put_job(job.id, job.key, job.snapshot())
+        with self._lock:
+            callbacks = list(self._subscribers.get(job.id, ()))
+        for callback in callbacks:
+            callback()
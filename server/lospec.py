@@ -0,0 +1,297 @@
+"""
+Lospec palettes with an on-disk cache and an offline mirror.
+
+``LospecProvider.get(slug)`` answers from, in order:
+
+1. the cache, while the entry is younger than ``ttl`` seconds;
+2. the network, through one pooled ``requests.Session`` with timeouts and
+   retries; a stale cache entry is revalidated with ``If-None-Match`` /
+   ``If-Modified-Since`` so an unchanged palette costs a 304;
+3. a stale cache entry, then the mirror, when the network fails.
+
+In offline mode step 2 is skipped.  The cache holds one JSON file per slug;
+the mirror is a directory of ``<slug>.json`` files in Lospec's own format
+(``python server/lospec.py SLUG... --mirror-to DIR`` writes one).
+``get_many`` fetches several slugs concurrently on a bounded thread pool.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from themefile import atomic_write
+
+LOSPEC_URL = "https://lospec.com/palette-list/{slug}.json"
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_TIMEOUT = (3.05, 10.0)  # (connect, read) seconds
+
+_SLUG_RE = re.compile(r"[a-z0-9][a-z0-9-]{0,127}")
+_HEX_RE = re.compile(r"#?([0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+
+
+class PaletteUnavailable(Exception):
+    """The palette could not be had from the network, the cache or the mirror."""
+
+    def __init__(self, slug: str, reason: str):
+        super().__init__(f"{slug}: {reason}")
+        self.slug = slug
+
+
+class PaletteNotFound(PaletteUnavailable):
+    """Lospec has no palette with this slug."""
+
+
+@dataclass(frozen=True)
+class Palette:
+    slug: str
+    title: str
+    colors: Tuple[str, ...]
+    source: str  # network | revalidated | cache | stale | mirror
+
+
+def parse_palette(slug: str, data: dict) -> Palette:
+    """A ``Palette`` from Lospec's JSON (colors come without ``#``)."""
+    colors = []
+    for color in data.get("colors") or ():
+        match = _HEX_RE.fullmatch(str(color).strip())
+        if match is None:
+            raise ValueError(f"{slug}: not a hex color: {color!r}")
+        colors.append("#" + match.group(1).lower())
+    if not colors:
+        raise ValueError(f"{slug}: palette has no colors")
+    title = data.get("name") or data.get("title") or slug
+    return Palette(slug, str(title), tuple(colors), "network")
+
+
+def check_slug(slug: str) -> str:
+    if not isinstance(slug, str) or not _SLUG_RE.fullmatch(slug):
+        raise ValueError(f"invalid palette slug: {slug!r}")
+    return slug
+
+
+class PaletteCache:
+    """One JSON file per slug: the Lospec body plus its validators and fetch time."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def path(self, slug: str) -> Path:
+        return self.directory / f"{slug}.json"
+
+    def load(self, slug: str) -> Optional[dict]:
+        try:
+            with open(self.path(slug), encoding="utf-8") as f:
+                entry = json.load(f)
+            parse_palette(slug, entry["data"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return entry
+
+    def store(self, slug: str, data: dict, etag: Optional[str], last_modified: Optional[str],
+              fetched_at: float) -> dict:
+        entry = {"slug": slug, "fetched_at": fetched_at, "etag": etag,
+                 "last_modified": last_modified, "data": data}
+        body = json.dumps(entry, sort_keys=True).encode("utf-8")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path(slug), lambda f: f.write(body))
+        return entry
+
+
+class LospecProvider:
+    def __init__(self, cache_dir: Optional[Path] = None, mirror_dir: Optional[Path] = None,
+                 ttl: float = DEFAULT_TTL, offline: bool = False, url: str = LOSPEC_URL,
+                 timeout=DEFAULT_TIMEOUT, retries: int = 2, max_workers: int = 8, clock=time.time):
+        self.cache = PaletteCache(cache_dir) if cache_dir else None
+        self.mirror_dir = Path(mirror_dir) if mirror_dir else None
+        self.ttl = ttl
+        self.offline = offline
+        self.url = url
+        self.timeout = timeout
+        self.retries = retries
+        self.max_workers = max(1, max_workers)
+        self.clock = clock
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The shared session; its pool holds one connection per worker."""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                retry = Retry(total=self.retries, backoff_factor=0.2, raise_on_status=False,
+                              status_forcelist=(429, 500, 502, 503, 504),
+                              allowed_methods=frozenset({"GET"}))
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = "obs-styla"
+                self._session = session
+            return self._session
+
+    def close(self) -> None:
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def __enter__(self) -> "LospecProvider":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get(self, slug: str, refresh: bool = False) -> Palette:
+        """The palette ``slug``; ``refresh`` skips the fresh-cache shortcut."""
+        check_slug(slug)
+        entry = self.cache.load(slug) if self.cache else None
+        if entry is not None and not refresh and self.clock() - entry["fetched_at"] < self.ttl:
+            return self._from_entry(slug, entry, "cache")
+        reason = "offline"
+        if not self.offline:
+            try:
+                return self._fetch(slug, entry)
+            except PaletteNotFound:
+                raise
+            except (OSError, ValueError) as e:  # requests' exceptions are OSErrors
+                reason = str(e)
+        if entry is not None:
+            return self._from_entry(slug, entry, "stale")
+        mirrored = self._from_mirror(slug)
+        if mirrored is not None:
+            return mirrored
+        raise PaletteUnavailable(slug, reason)
+
+    def get_many(self, slugs: Iterable[str]) -> Dict[str, Union[Palette, Exception]]:
+        """``get`` for each distinct slug, concurrently; failures are returned, not raised."""
+        slugs = list(dict.fromkeys(slugs))
+
+        def one(slug):
+            try:
+                return self.get(slug)
+            except (PaletteUnavailable, ValueError) as e:
+                return e
+
+        if len(slugs) <= 1:
+            return {slug: one(slug) for slug in slugs}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(slugs))) as pool:
+            return dict(zip(slugs, pool.map(one, slugs)))
+
+    def _fetch(self, slug: str, entry: Optional[dict]) -> Palette:
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        resp = self.session.get(self.url.format(slug=slug), headers=headers, timeout=self.timeout)
+        with resp:
+            now = self.clock()
+            if resp.status_code == 304 and entry is not None:
+                self._store(slug, entry["data"], resp.headers.get("ETag", entry.get("etag")),
+                            resp.headers.get("Last-Modified", entry.get("last_modified")), now)
+                return self._from_entry(slug, entry, "revalidated")
+            if resp.status_code == 404:
+                raise PaletteNotFound(slug, "no such palette on Lospec")
+            resp.raise_for_status()
+            data = resp.json()
+        palette = parse_palette(slug, data)
+        self._store(slug, data, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), now)
+        return palette
+
+    def _store(self, slug: str, data: dict, etag: Optional[str], last_modified: Optional[str],
+               fetched_at: float) -> None:
+        if self.cache is None:
+            return
+        try:
+            self.cache.store(slug, data, etag, last_modified, fetched_at)
+        except OSError:
+            pass  # an unwritable cache only costs a refetch
+
+    def _from_entry(self, slug: str, entry: dict, source: str) -> Palette:
+        palette = parse_palette(slug, entry["data"])
+        return Palette(palette.slug, palette.title, palette.colors, source)
+
+    def _from_mirror(self, slug: str) -> Optional[Palette]:
+        if self.mirror_dir is None:
+            return None
+        try:
+            with open(self.mirror_dir / f"{slug}.json", encoding="utf-8") as f:
+                palette = parse_palette(slug, json.load(f))
+        except (OSError, ValueError):
+            return None
+        return Palette(palette.slug, palette.title, palette.colors, "mirror")
+
+
+def write_mirror(palettes: Iterable[Palette], directory: Path) -> None:
+    """Save ``palettes`` as ``<slug>.json`` files a provider can use as its mirror."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for palette in palettes:
+        body = json.dumps({"name": palette.title, "colors": [c.lstrip("#") for c in palette.colors]},
+                          indent=2).encode("utf-8")
+        atomic_write(directory / f"{palette.slug}.json", lambda f: f.write(body))
+
+
+_default: Optional[LospecProvider] = None
+_default_lock = threading.Lock()
+
+
+def default_provider() -> LospecProvider:
+    """The process-wide provider configured from ``Config`` (shared session and cache)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            from config import ROOT, Config
+
+            config = Config()
+            _default = LospecProvider(
+                cache_dir=ROOT / config.LOSPEC_CACHE_DIR if config.LOSPEC_CACHE_DIR else None,
+                mirror_dir=ROOT / config.LOSPEC_MIRROR_DIR if config.LOSPEC_MIRROR_DIR else None,
+                ttl=config.LOSPEC_CACHE_TTL,
+                offline=config.LOSPEC_OFFLINE,
+                max_workers=config.LOSPEC_WORKERS,
+            )
+        return _default
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fetch Lospec palettes through the cache.")
+    parser.add_argument("slugs", nargs="+")
+    parser.add_argument("--offline", action="store_true", help="use only the cache and the mirror")
+    parser.add_argument("--refresh", action="store_true", help="revalidate even fresh cache entries")
+    parser.add_argument("--mirror-to", type=Path, help="also write the palettes into this mirror directory")
+    args = parser.parse_args(argv)
+
+    provider = default_provider()
+    provider.offline = provider.offline or args.offline
+    if args.refresh:
+        provider.ttl = 0
+    results = provider.get_many(args.slugs)
+    failed = 0
+    for slug, result in results.items():
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"{slug}: error: {result}", file=sys.stderr)
+        else:
+            print(f"{slug}: {result.title!r}, {len(result.colors)} colors ({result.source})")
+    if args.mirror_to:
+        write_mirror([r for r in results.values() if isinstance(r, Palette)], args.mirror_to)
+    provider.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
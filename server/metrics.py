@@ -0,0 +1,226 @@
+"""
+Minimal in-process metrics rendered in the Prometheus text exposition format.
+
+Counters and histograms are plain Python objects guarded by one small lock
+each, so recording a sample costs a dict lookup, a bisect and an increment
+(single-digit microseconds).  Values that already live elsewhere (cache hit
+counters, the task counts of a ``CountingThreadPool``) are exported through
+callback gauges that are only evaluated when ``/metrics`` is scraped.
+
+Metrics are per process; under ``serve.py`` each worker reports its own.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[i] += 1
+            series[-1] += value
+
+    def time(self, *labelvalues: str) -> "_Timer":
+        return _Timer(self, labelvalues)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = []
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                le = 'le="%s"' % _num(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("_hist", "_labels", "_start")
+
+    def __init__(self, hist: Histogram, labelvalues: LabelValues):
+        self._hist = hist
+        self._labels = labelvalues
+
+    def __enter__(self):
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._hist.observe(perf_counter() - self._start, *self._labels)
+        return False
+
+
+class CallbackGauge:
+    """Gauge whose samples are produced by ``collect`` at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str],
+                 collect: Callable[[], Iterable[Tuple[LabelValues, float]]], kind: str = "gauge"):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+        self._collect = collect
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in self._collect()]
+
+
+class CountingThreadPool(ThreadPoolExecutor):
+    """ThreadPoolExecutor that counts its tasks as they are submitted, start and finish.
+
+    ``submitted - started`` is the queue depth and ``started - finished`` the
+    tasks running, without reaching into the executor's private queue.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._count_lock = threading.Lock()
+        self.submitted = 0
+        self.started = 0
+        self.finished = 0
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._count_lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def submit(self, fn, /, *args, **kwargs):
+        def run(*args, **kwargs):
+            self._count("started")
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._count("finished")
+
+        # Counted first so a task can't start before it was submitted.
+        self._count("submitted")
+        try:
+            return super().submit(run, *args, **kwargs)
+        except BaseException:
+            self._count("submitted", -1)
+            raise
+
+    def counts(self) -> Tuple[int, int, int]:
+        """(submitted, started, finished), read together."""
+        with self._count_lock:
+            return self.submitted, self.started, self.finished
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        out = []
+        for m in metrics:
+            out.append(f"# HELP {m.name} {m.help}")
+            out.append(f"# TYPE {m.name} {m.kind}")
+            out.extend(m.render())
+        return "\n".join(out) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help, labelnames))
+
+
+def histogram(name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labelnames, buckets))
+
+
+def callback_gauge(name: str, help: str, labelnames: Sequence[str],
+                   collect: Callable[[], Iterable[Tuple[LabelValues, float]]], kind: str = "gauge") -> CallbackGauge:
+    return REGISTRY.register(CallbackGauge(name, help, labelnames, collect, kind))
+
+
+# Shared by modules that record into them directly.
+VALIDATION_SECONDS = histogram(
+    "obs_styla_theme_validation_seconds",
+    "Time spent in validate_theme_content for one theme file.",
+)
+CATALOG_SCAN_SECONDS = histogram(
+    "obs_styla_catalog_scan_seconds",
+    "Time to scan the theme directory.",
+)
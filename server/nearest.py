@@ -0,0 +1,141 @@
+"""
+Nearest palette color lookups in OKLab.
+
+``NearestColors`` converts a palette to OKLab once and answers batched
+"closest palette color to X" queries.  Small palettes are searched with one
+vectorized distance matrix per batch; larger ones build a KD-tree whose leaf
+buckets are scanned with NumPy, so a query touches a few leaves instead of
+every color.
+"""
+from __future__ import annotations
+
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from colorspace import hex_to_oklab, parse_hex
+
+# Palettes up to this size are searched by brute force (see
+# benchmarks/bench_nearest.py for where the KD-tree starts to pay off).
+BRUTE_FORCE_MAX = 384
+LEAF_SIZE = 16
+# Distance-matrix queries are split so one chunk stays around a few MB.
+_CHUNK_CELLS = 1 << 18
+
+Targets = Union[Sequence[str], np.ndarray]
+
+
+class _KDTree:
+    """Static KD-tree over an (n, 3) array, split at the median of the widest axis."""
+
+    def __init__(self, points: np.ndarray, leafsize: int = LEAF_SIZE):
+        self.leafsize = leafsize
+        self.order = np.arange(len(points))
+        # Node k: (axis, split, left, right) for inner nodes, (-1, 0.0, start, end) for leaves.
+        self.nodes: List[Tuple[int, float, int, int]] = []
+        self._build(points, 0, len(points))
+        self.points = points[self.order]
+
+    def _build(self, points: np.ndarray, start: int, end: int) -> int:
+        node = len(self.nodes)
+        self.nodes.append((-1, 0.0, start, end))
+        if end - start <= self.leafsize:
+            return node
+        idx = self.order[start:end]
+        block = points[idx]
+        axis = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+        mid = (end - start) // 2
+        part = np.argpartition(block[:, axis], mid)
+        self.order[start:end] = idx[part]
+        split = float(points[self.order[start + mid], axis])
+        left = self._build(points, start, start + mid)
+        right = self._build(points, start + mid, end)
+        self.nodes[node] = (axis, split, left, right)
+        return node
+
+    def query(self, target: np.ndarray) -> Tuple[float, int]:
+        """(squared distance, index into the original points) of the nearest point."""
+        best_d, best_i = np.inf, -1
+        stack = [(0, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if bound >= best_d:
+                continue
+            axis, split, a, b = self.nodes[node]
+            if axis < 0:
+                d = ((self.points[a:b] - target) ** 2).sum(axis=1)
+                k = int(np.argmin(d))
+                if d[k] < best_d:
+                    best_d, best_i = float(d[k]), int(self.order[a + k])
+                continue
+            diff = float(target[axis]) - split
+            near, far = (a, b) if diff < 0 else (b, a)
+            # Push the far side first so the near side is searched first.
+            stack.append((far, diff * diff))
+            stack.append((near, bound))
+        return best_d, best_i
+
+
+class NearestColors:
+    """Nearest-color index over ``palette`` (hex strings; unparseable values are skipped)."""
+
+    def __init__(self, palette: Sequence[str], brute_force_max: int = BRUTE_FORCE_MAX):
+        colors = []
+        for color in dict.fromkeys(palette):
+            try:
+                parse_hex(color)
+            except (AttributeError, TypeError, ValueError):
+                continue
+            colors.append(color)
+        self.colors = colors
+        self.lab = hex_to_oklab(colors)
+        self._tree = _KDTree(self.lab) if len(colors) > brute_force_max else None
+
+    def __len__(self) -> int:
+        return len(self.colors)
+
+    def query(self, targets: Targets) -> Tuple[np.ndarray, np.ndarray]:
+        """(OKLab distances, palette indices) of the closest color to each target.
+
+        ``targets`` are hex strings or an (n, 3) OKLab array.
+        """
+        if not self.colors:
+            raise ValueError("palette has no valid colors")
+        lab = _as_lab(targets)
+        if self._tree is not None:
+            found = [self._tree.query(t) for t in lab]
+            d2 = np.array([d for d, _ in found], dtype=float)
+            idx = np.array([i for _, i in found], dtype=int)
+            return np.sqrt(d2), idx
+        d2 = np.empty(len(lab))
+        idx = np.empty(len(lab), dtype=int)
+        step = max(1, _CHUNK_CELLS // len(self.colors))
+        for start in range(0, len(lab), step):
+            block = lab[start:start + step]
+            dist = ((block[:, None, :] - self.lab[None, :, :]) ** 2).sum(axis=2)
+            idx[start:start + step] = np.argmin(dist, axis=1)
+            d2[start:start + step] = dist[np.arange(len(block)), idx[start:start + step]]
+        return np.sqrt(d2), idx
+
+    def closest(self, targets: Targets) -> List[str]:
+        """The palette color closest to each target."""
+        _, idx = self.query(targets)
+        return [self.colors[i] for i in idx]
+
+
+def _as_lab(targets: Targets) -> np.ndarray:
+    if isinstance(targets, np.ndarray):
+        return np.asarray(targets, dtype=float).reshape(-1, 3)
+    return hex_to_oklab(list(targets)) if len(targets) else np.empty((0, 3))
+
+
+def closest_colors(palette: Sequence[str], targets: Sequence[str],
+                   fallback: Optional[str] = None) -> List[Optional[str]]:
+    """One-shot lookup: the color of ``palette`` closest to each of ``targets``.
+
+    Returns ``fallback`` for every target when the palette has no valid colors.
+    """
+    index = NearestColors(palette)
+    if not index:
+        return [fallback] * len(targets)
+    return index.closest(targets)
@@ -0,0 +1,133 @@
+"""
+Compact palettes from VS Code / TextMate themes.
+
+A theme's ``colors`` section often lists hundreds of keys that reuse a few
+dozen colors, many only differing in an alpha suffix.  ``color_weights``
+normalizes every color to ``#rrggbb`` and weights it by how much the theme
+uses it (once per ``colors`` key, once per scope of a ``tokenColors`` or
+``semanticTokenColors`` rule, scaled by alpha).  ``extract_palette`` then
+clusters the distinct colors with weighted k-means in OKLab and keeps, per
+cluster, the theme color nearest the centroid, so the palette only holds
+colors the theme really uses.
+"""
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from colorspace import hex_to_oklab
+
+DEFAULT_SIZE = 26
+_HEX_RE = re.compile(r"#([0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+
+
+def normalize_color(value) -> Tuple[str, float]:
+    """(``#rrggbb``, alpha 0..1) of a theme color; ValueError if it isn't one."""
+    match = _HEX_RE.fullmatch(value.strip()) if isinstance(value, str) else None
+    if match is None:
+        raise ValueError(f"not a hex color: {value!r}")
+    h = match.group(1).lower()
+    if len(h) <= 4:
+        h = "".join(c * 2 for c in h)
+    alpha = int(h[6:8], 16) / 255 if len(h) == 8 else 1.0
+    return "#" + h[:6], alpha
+
+
+def _theme_colors(theme: dict) -> Iterable[Tuple[object, float]]:
+    colors = theme.get("colors")
+    if isinstance(colors, dict):
+        for value in colors.values():
+            yield value, 1.0
+    rules = theme.get("tokenColors")
+    for rule in rules if isinstance(rules, list) else ():
+        if not isinstance(rule, dict) or not isinstance(rule.get("settings"), dict):
+            continue
+        scope = rule.get("scope")
+        uses = len(scope) if isinstance(scope, list) else len(str(scope).split(",")) if scope else 1
+        for key in ("foreground", "background"):
+            if key in rule["settings"]:
+                yield rule["settings"][key], float(max(uses, 1))
+    semantic = theme.get("semanticTokenColors")
+    if isinstance(semantic, dict):
+        for value in semantic.values():
+            yield (value.get("foreground") if isinstance(value, dict) else value), 1.0
+
+
+def color_weights(theme: dict) -> Dict[str, float]:
+    """{``#rrggbb``: usage weight} over the theme; unparseable and transparent values are dropped."""
+    # Themes repeat the same strings many times; normalize each one once.
+    raw: Dict[str, float] = {}
+    for value, uses in _theme_colors(theme):
+        if isinstance(value, str):
+            raw[value] = raw.get(value, 0.0) + uses
+    weights: Dict[str, float] = {}
+    for value, uses in raw.items():
+        try:
+            color, alpha = normalize_color(value)
+        except ValueError:
+            continue
+        if alpha > 0:
+            weights[color] = weights.get(color, 0.0) + uses * alpha
+    return weights
+
+
+def weighted_kmeans(points: np.ndarray, weights: np.ndarray, k: int,
+                    iterations: int = 50, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """(centers, labels) of weighted k-means on ``points``.
+
+    Seeded with greedy weighted k-means++ from a fixed seed (the heaviest
+    point first; each further seed is the best of a few sampled candidates),
+    so a theme always yields the same palette.  Returns fewer than ``k``
+    centers when there are fewer distinct points.
+    """
+    points = np.asarray(points, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    rng = np.random.default_rng(seed)
+    trials = 2 + int(np.log(max(k, 1)))
+    centers = [points[int(np.argmax(weights))]]
+    d2 = ((points - centers[0]) ** 2).sum(axis=1)
+    while len(centers) < k:
+        p = weights * d2
+        total = p.sum()
+        if total <= 0:
+            break
+        candidates = rng.choice(len(points), size=trials, p=p / total)
+        cand_d2 = np.minimum(d2, ((points[None, :, :] - points[candidates][:, None, :]) ** 2).sum(axis=2))
+        best = int(np.argmin(cand_d2 @ weights))
+        centers.append(points[candidates[best]])
+        d2 = cand_d2[best]
+    centers = np.array(centers)
+
+    for _ in range(iterations):
+        labels = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        mass = np.bincount(labels, weights, minlength=len(centers))
+        sums = np.stack([np.bincount(labels, weights * points[:, c], minlength=len(centers))
+                         for c in range(points.shape[1])], axis=1)
+        moved = centers.copy()
+        filled = mass > 0
+        moved[filled] = sums[filled] / mass[filled, None]
+        if np.allclose(moved, centers, rtol=0.0, atol=1e-9):
+            break
+        centers = moved
+    labels = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    return centers, labels
+
+
+def extract_palette(theme: dict, size: int = DEFAULT_SIZE) -> List[str]:
+    """Up to ``size`` representative theme colors, most used first."""
+    weights = color_weights(theme)
+    if len(weights) <= size:
+        return sorted(weights, key=lambda c: -weights[c])
+    colors = list(weights)
+    w = np.array([weights[c] for c in colors])
+    lab = hex_to_oklab(colors)
+    centers, labels = weighted_kmeans(lab, w, size)
+    picked = []
+    for j in range(len(centers)):
+        members = np.flatnonzero(labels == j)
+        if len(members):
+            nearest = members[np.argmin(((lab[members] - centers[j]) ** 2).sum(axis=1))]
+            picked.append((-w[members].sum(), colors[nearest]))
+    return [color for _, color in sorted(picked)]
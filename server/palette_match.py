@@ -0,0 +1,145 @@
+"""
+Assigning an arbitrary palette to Catppuccin semantic roles.
+
+The palette is converted to OKLCh once, as an array.  Neutral roles take the
+darkest and lightest colors by OKLab lightness; accent roles are then
+matched to the remaining colors by solving one assignment problem over a
+cost matrix of weighted hue, lightness and chroma distances to a reference
+palette (normally Catppuccin Mocha), so no role can take a color another
+role needed more.  Roles the palette is too small to give a color of their
+own take the color closest in OKLab to their reference (see ``nearest``).
+"""
+from __future__ import annotations
+
+from typing import Dict, Mapping, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+from colorspace import hex_to_oklch
+from nearest import NearestColors
+
+DARK_ROLES = ("base", "mantle", "surface0", "surface1", "surface2")
+# Lightest first.
+LIGHT_ROLES = ("text", "subtext1", "subtext0", "overlay2", "overlay1", "overlay0")
+ACCENT_ROLES = (
+    "red", "maroon", "peach", "yellow", "green", "teal", "blue", "lavender",
+    "mauve", "pink", "flamingo", "rosewater", "sky", "sapphire",
+)
+ROLES = DARK_ROLES + LIGHT_ROLES + ACCENT_ROLES
+
+
+class Weights(NamedTuple):
+    hue: float = 1.0         # per half turn of hue difference
+    lightness: float = 0.5   # per unit of OKLab L
+    chroma: float = 2.0      # per unit of OKLCh C (Catppuccin accents sit near 0.1-0.15)
+
+
+def linear_sum_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum-cost assignment of rows to columns (Hungarian algorithm).
+
+    Returns ``(rows, cols)`` like ``scipy.optimize.linear_sum_assignment``:
+    every row is assigned when there are at most as many rows as columns,
+    otherwise every column.  Shortest augmenting paths with potentials,
+    O(n^2 m), with the inner loop over columns vectorized.
+    """
+    cost = np.asarray(cost, dtype=float)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=int)   # owner[j]: 1-based row matched to column j
+    way = np.zeros(m + 1, dtype=int)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            done = np.flatnonzero(used)
+            u[owner[done]] += delta
+            v[done] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+    cols = np.flatnonzero(owner[1:])
+    rows = owner[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def role_costs(lch: np.ndarray, targets: np.ndarray, weights: Weights = Weights()) -> np.ndarray:
+    """(roles, colors) matrix of weighted OKLCh distances to the role targets."""
+    dh = np.abs(targets[:, None, 2] - lch[None, :, 2]) % (2 * np.pi)
+    dh = np.minimum(dh, 2 * np.pi - dh) / np.pi
+    # A grey's hue is noise: against a colorful target it counts as a quarter
+    # turn off, and a grey target ignores hue altogether.
+    target_sat = np.clip(targets[:, None, 1] / 0.05, 0.0, 1.0)
+    color_sat = np.clip(lch[None, :, 1] / 0.05, 0.0, 1.0)
+    dh = target_sat * (color_sat * dh + (1.0 - color_sat) * 0.5)
+    dl = np.abs(targets[:, None, 0] - lch[None, :, 0])
+    dc = np.abs(targets[:, None, 1] - lch[None, :, 1])
+    return weights.hue * dh + weights.lightness * dl + weights.chroma * dc
+
+
+def assign_palette(palette: Sequence[str], reference: Mapping[str, str],
+                   weights: Weights = Weights(), dark: bool = True) -> Dict[str, str]:
+    """Map each role in ``ROLES`` to a color of ``palette``.
+
+    ``reference`` gives every role's target color.  Colors are used once
+    where the palette is large enough; roles left over take the color
+    perceptually closest to their target.  For light themes
+    (``dark=False``) the background roles take the lightest colors and the
+    text roles the darkest.  An empty palette maps nothing.
+    """
+    colors = list(dict.fromkeys(c.lower() for c in palette))
+    if not colors:
+        return {}
+    lch = hex_to_oklch(colors)
+    mapping: Dict[str, str] = {}
+    free = np.ones(len(colors), dtype=bool)
+
+    by_lightness = np.argsort(lch[:, 0], kind="stable")
+    if not dark:
+        by_lightness = by_lightness[::-1]
+    if len(colors) >= len(DARK_ROLES):
+        for role, i in zip(DARK_ROLES, by_lightness):
+            mapping[role] = colors[i]
+            free[i] = False
+    if len(colors) >= len(DARK_ROLES) + 3:
+        for role, i in zip(LIGHT_ROLES, by_lightness[::-1]):
+            if free[i]:
+                mapping[role] = colors[i]
+                free[i] = False
+
+    targets = hex_to_oklch([reference[r] for r in ROLES])
+    costs = role_costs(lch, targets, weights)
+    accents = [ROLES.index(r) for r in ACCENT_ROLES]
+    candidates = np.flatnonzero(free)
+    if len(candidates):
+        rows, cols = linear_sum_assignment(costs[np.ix_(accents, candidates)])
+        for r, c in zip(rows, cols):
+            mapping[ACCENT_ROLES[r]] = colors[candidates[c]]
+    leftover = [role for role in ROLES if role not in mapping]
+    if leftover:
+        closest = NearestColors(colors).closest([reference[role] for role in leftover])
+        mapping.update(zip(leftover, closest))
+    return {role: mapping[role] for role in ROLES}
@@ -0,0 +1,201 @@
+"""
+Opt-in profiling of single requests.
+
+When ``PROFILING_ENABLED`` is set, ``server.py`` wraps the WSGI app in
+``ProfilingMiddleware``.  A request from one of ``PROFILE_ALLOWED_CLIENTS``
+that carries ``X-Profile: 1`` (or ``?profile=1``) is run under either
+cProfile (``PROFILE_MODE=cprofile``, written as ``<id>.pstats``) or a stack
+sampler (``PROFILE_MODE=sample``, written as ``<id>.speedscope.json`` for
+https://www.speedscope.app).  The id comes back in ``X-Profile-Id`` and the
+directory keeps only the newest ``PROFILE_KEEP`` profiles.
+
+With profiling disabled the middleware is never installed, so ordinary
+requests pay nothing.  One request is profiled at a time; a profile request
+arriving while another runs is served normally without an id.
+"""
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+MODES = ("cprofile", "sample")
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+def new_profile_id() -> str:
+    return f"{int(time.time() * 1000):x}-{secrets.token_hex(4)}"
+
+
+class StackSampler:
+    """Sample one thread's Python stack every ``interval`` seconds."""
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frames: List[dict] = []
+        self._frame_index: Dict[Tuple[str, str, int], int] = {}
+        self.samples: List[List[int]] = []
+        self.weights: List[float] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def _index(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = self._frame_index[key] = len(self.frames)
+            self.frames.append({"name": key[0], "file": key[1], "line": key[2]})
+        return index
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._index(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples.append(stack)
+            self.weights.append(now - last)
+            last = now
+
+    def speedscope(self, name: str) -> dict:
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "obs-styla",
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(self.weights),
+                "samples": self.samples,
+                "weights": self.weights,
+            }],
+        }
+
+
+class ProfileStore:
+    """Ring directory holding at most ``keep`` profile files."""
+
+    def __init__(self, directory: Path, keep: int = 20):
+        self.directory = Path(directory)
+        self.keep = keep
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def path_for(self, profile_id: str, suffix: str) -> Path:
+        return self.directory / f"{profile_id}{suffix}"
+
+    def prune(self) -> None:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for de in it:
+                if de.is_file() and de.name.endswith((".pstats", ".speedscope.json")):
+                    entries.append((de.stat().st_mtime_ns, de.path))
+        entries.sort()
+        for _, path in entries[:max(len(entries) - self.keep, 0)]:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+
+class ProfilingMiddleware:
+    """WSGI middleware profiling requests that ask for it (see module doc)."""
+
+    def __init__(self, app: Callable, store: ProfileStore, allowed_clients: Iterable[str],
+                 mode: str = "cprofile", interval: float = 0.001):
+        if mode not in MODES:
+            raise ValueError(f"PROFILE_MODE must be one of {MODES}")
+        self.app = app
+        self.store = store
+        self.allowed_clients = frozenset(allowed_clients)
+        self.mode = mode
+        self.interval = interval
+        self._busy = threading.Lock()
+
+    def wants(self, remote_addr: Optional[str], header: Optional[str], query: str) -> bool:
+        if remote_addr not in self.allowed_clients:
+            return False
+        if header == "1":
+            return True
+        return "profile" in query and parse_qs(query).get("profile") == ["1"]
+
+    def requested(self, environ: dict) -> bool:
+        return self.wants(environ.get("REMOTE_ADDR"), environ.get("HTTP_X_PROFILE"), environ.get("QUERY_STRING", ""))
+
+    def __call__(self, environ: dict, start_response: Callable):
+        if not self.requested(environ) or not self._busy.acquire(blocking=False):
+            return self.app(environ, start_response)
+        try:
+            return self._profiled(environ, start_response)
+        finally:
+            self._busy.release()
+
+    def _profiled(self, environ: dict, start_response: Callable) -> List[bytes]:
+        profile_id = new_profile_id()
+
+        def start_with_id(status, headers, exc_info=None):
+            headers.append((PROFILE_ID_HEADER, profile_id))
+            return start_response(status, headers, exc_info)
+
+        def run() -> List[bytes]:
+            # Drain the body inside the profile so streamed responses count.
+            iterable = self.app(environ, start_with_id)
+            try:
+                return list(iterable)
+            finally:
+                close = getattr(iterable, "close", None)
+                if close is not None:
+                    close()
+
+        name = f"{environ.get('REQUEST_METHOD')} {environ.get('PATH_INFO')}"
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                body = profiler.runcall(run)
+            finally:
+                profiler.dump_stats(str(self.store.path_for(profile_id, ".pstats")))
+        else:
+            sampler = StackSampler(threading.get_ident(), self.interval)
+            try:
+                with sampler:
+                    body = run()
+            finally:
+                with open(self.store.path_for(profile_id, ".speedscope.json"), "w", encoding="utf-8") as f:
+                    json.dump(sampler.speedscope(name), f)
+        self.store.prune()
+        return body
+
+
+def install(app, directory: Path, keep: int, allowed_clients: Iterable[str],
+            mode: str = "cprofile", interval: float = 0.001) -> ProfilingMiddleware:
+    """Wrap ``app.wsgi_app`` (a Flask app) in ``ProfilingMiddleware``."""
+    middleware = ProfilingMiddleware(app.wsgi_app, ProfileStore(directory, keep), allowed_clients, mode, interval)
+    app.wsgi_app = middleware
+    return middleware
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Production entry point: a prefork gunicorn server configured through Config.
+
+Workers, threads, worker class and timeouts come from ``server.Config``
+(``WORKERS``, ``THREADS``, ``WORKER_CLASS``, ``TIMEOUT``, ``GRACEFUL_TIMEOUT``,
+``KEEPALIVE``).  ``WORKER_CLASS=asgi`` runs the ASGI mode from ``asgi.py`` on
+uvicorn workers.  Unless ``SHARED_CACHE_PATH`` is set explicitly, the workers
+share a SQLite catalog/parse cache next to this file so N workers don't each
+scan and parse every theme.
+
+The master only reads ``Config``: the app is imported in ``load()``, after
+the fork, so its executors, cache connections and the Gemini client belong
+to each worker rather than being inherited from a master that never serves.
+
+Run:
+  pip install -r requirements.txt
+  python serve.py
+"""
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+
+# Must be set before ``server`` reads its Config.
+os.environ.setdefault("SHARED_CACHE_PATH", str(APP_DIR / "shared_cache.sqlite3"))
+sys.path.insert(0, str(APP_DIR))
+
+from gunicorn.app.base import BaseApplication
+
+from config import Config
+
+logger = logging.getLogger("serve")
+
+config = Config()
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "asgi": "uvicorn.workers.UvicornWorker",
+}
+
+
+class ThemeServer(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Runs in each worker after the fork.
+        import server
+        if os.environ.get("GEMINI_API_KEY"):
+            server.configure_search()
+        if config.WORKER_CLASS == "asgi":
+            from asgi import app
+            return app
+        return server.app
+
+
+def gunicorn_options() -> dict:
+    if config.WORKER_CLASS not in WORKER_CLASSES:
+        raise ValueError(f"WORKER_CLASS must be one of {sorted(WORKER_CLASSES)}")
+    return {
+        "bind": f"{config.HOST}:{config.PORT}",
+        "workers": config.WORKERS,
+        "threads": config.THREADS,
+        "worker_class": WORKER_CLASSES[config.WORKER_CLASS],
+        "timeout": config.TIMEOUT,
+        "graceful_timeout": config.GRACEFUL_TIMEOUT,
+        "keepalive": config.KEEPALIVE,
+        # server.py writes its own structured access log (ACCESS_LOG).
+        "accesslog": None,
+        "errorlog": "-",
+    }
+
+
+def run_upload_script() -> None:
+    """``server.run_upload_script`` without importing the app into the master."""
+    try:
+        subprocess.run([sys.executable, str(APP_DIR / "upload_themes.py")], check=True, capture_output=True, text=True)
+        logger.info("Theme upload script completed successfully.")
+    except subprocess.CalledProcessError as e:
+        logger.error(f"Theme upload script failed: {e.stderr}")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    if os.environ.get("GEMINI_API_KEY"):
+        # Once, in the master, before any worker accepts search requests.
+        # It runs in its own process, so nothing of it is inherited.
+        run_upload_script()
+    else:
+        logger.warning("GEMINI_API_KEY not set. Search functionality will be disabled.")
+    ThemeServer(gunicorn_options()).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ Endpoints:
   GET  /            -> serves index.html
   GET  /api/themes   -> list available .ovt/.obt/.json theme files
   GET  /api/themes/<name> -> download a theme file
+  GET  /api/themes/archive?names=...|filter=... -> stream a ZIP of several themes
   POST /api/generate -> run generation scripts (script_1.py, script_2.py, script_3.py)
 
 Run:
@@ -16,8 +17,9 @@ Run:
 
 """
 from __future__ import annotations
-from dataclasses import dataclass
+import fnmatch
 import os
+import posixpath
 import re
 import json
 import logging
@@ -25,19 +27,23 @@ import subprocess
 import sys
 import threading
 from functools import lru_cache, wraps
-from time import time
+from time import perf_counter, time
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
-from flask import Flask, jsonify, send_from_directory, request
+from flask import Flask, Response, g, jsonify, request, send_from_directory, stream_with_context
 from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from werkzeug.datastructures import FileStorage
+from werkzeug.utils import secure_filename
+
+import applog
+from config import APP_DIR, ROOT, Config
 
-import logging.config
-import google.generativeai as genai
-from google.generativeai import types
+logger = logging.getLogger(__name__)
+
+config = Config()
 
 LOGGING_CONFIG = {
     'version': 1,
@@ -46,6 +52,9 @@ LOGGING_CONFIG = {
         'standard': {
             'format': '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
         },
+        'json': {
+            '()': 'applog.JsonFormatter',
+        },
     },
     'handlers': {
         'default': {
@@ -56,9 +65,12 @@ LOGGING_CONFIG = {
         'file': {
             'level': 'ERROR',
             'formatter': 'standard',
-            'class': 'logging.FileHandler',
+            'class': 'logging.handlers.RotatingFileHandler',
             'filename': 'app_errors.log',
             'mode': 'a',
+            'maxBytes': config.LOG_MAX_BYTES,
+            'backupCount': config.LOG_BACKUP_COUNT,
+            'delay': True,
         },
     },
     'loggers': {
@@ -66,30 +78,32 @@ LOGGING_CONFIG = {
             'handlers': ['default', 'file'],
             'level': 'INFO',
             'propagate': False
-        }
+        },
+        applog.ACCESS_LOGGER: {
+            'handlers': [],
+            'level': 'INFO',
+            'propagate': False,
+        },
     }
 }
+if config.ACCESS_LOG:
+    LOGGING_CONFIG['handlers']['access'] = {
+        'formatter': 'json',
+        'class': 'logging.handlers.RotatingFileHandler',
+        'filename': config.ACCESS_LOG,
+        'maxBytes': config.LOG_MAX_BYTES,
+        'backupCount': config.LOG_BACKUP_COUNT,
+        'delay': True,
+    }
+    LOGGING_CONFIG['loggers'][applog.ACCESS_LOGGER]['handlers'] = ['access']
+else:
+    LOGGING_CONFIG['loggers'][applog.ACCESS_LOGGER]['level'] = 'CRITICAL'
 
-logging.config.dictConfig(LOGGING_CONFIG)
-logger = logging.getLogger(__name__)
-
-ROOT = Path(__file__).resolve().parent.parent
-APP_DIR = Path(__file__).resolve().parent
-
-@dataclass
-class Config:
-    HOST: str = os.getenv('HOST', '127.0.0.1')
-    PORT: int = int(os.getenv('PORT', '5000'))
-    DEBUG: bool = os.getenv('DEBUG', 'False').lower() == 'true'
-    SECRET_KEY: str = os.getenv('SECRET_KEY') or os.urandom(32).hex()
-    MAX_CONTENT_LENGTH: int = int(os.getenv('MAX_CONTENT_LENGTH', '1048576'))  # 1MB
-
-    def __post_init__(self):
-        if self.DEBUG and self.SECRET_KEY == 'dev-key-change-in-production':
-            import warnings
-            warnings.warn("Using default secret key in debug mode", UserWarning)
+# Handlers run on a listener thread; log calls only enqueue (see applog.py).
+applog.configure(LOGGING_CONFIG, queued=config.LOG_QUEUED)
+access_logger = logging.getLogger(applog.ACCESS_LOGGER)
 
-config = Config()
+THEMES_ROOT = (ROOT / config.THEMES_DIR).resolve() if config.THEMES_DIR else ROOT
 
 app = Flask(__name__, static_folder=str(APP_DIR), static_url_path="")
 app.config.from_object(config)
@@ -101,82 +115,163 @@ limiter = Limiter(
     default_limits=["200 per day", "50 per hour"]
 )
 
+profiler = None
+if config.PROFILING_ENABLED:
+    import profiling
+
+    profiler = profiling.install(
+        app,
+        ROOT / config.PROFILE_DIR,
+        keep=config.PROFILE_KEEP,
+        allowed_clients=[c.strip() for c in config.PROFILE_ALLOWED_CLIENTS.split(',') if c.strip()],
+        mode=config.PROFILE_MODE,
+    )
+
+from blobstore import BlobStore
+from catalog import is_safe_relative_path, scan_themes, shard_path
+
+blob_store = (
+    BlobStore(ROOT / config.BLOB_STORE_DIR, link_mode=config.BLOB_LINK_MODE)
+    if config.BLOB_STORE_DIR else None
+)
+
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import contextvars
+
+import metrics
+from metrics import CountingThreadPool
 
 # Create thread pool for I/O operations
-io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="file_io")
+io_executor = CountingThreadPool(max_workers=4, thread_name_prefix="file_io")
+# Shard walks get their own pool so a scan running on io_executor never waits
+# on tasks queued behind itself.
+scan_executor = CountingThreadPool(max_workers=8, thread_name_prefix="catalog_scan")
+
+from shared_cache import SharedStore
+
+shared_store = SharedStore(ROOT / config.SHARED_CACHE_PATH) if config.SHARED_CACHE_PATH else None
 
 _file_cache_lock = threading.RLock()
 _file_cache = {}
 _cache_timestamp = 0
+_catalog_hits = 0
+_catalog_misses = 0
 CACHE_DURATION = 30
+# With a shared store the per-process copy only absorbs bursts; other
+# workers' writes become visible after this long.
+LOCAL_CACHE_DURATION = 1 if shared_store is not None else CACHE_DURATION
+
+def _scan_catalog() -> List[dict]:
+    """Scan THEMES_ROOT for theme files (blocking).
+
+    With a shared store, a listing another worker scanned within
+    CACHE_DURATION is reused and concurrent scans collapse into one.
+    """
+    if shared_store is not None:
+        return shared_store.get_or_scan_catalog(str(THEMES_ROOT), CACHE_DURATION, _scan_themes_root)
+    return _scan_themes_root()
+
+
+def _scan_themes_root() -> List[dict]:
+    def annotate(entry, stat_result):
+        entry["blob"] = blob_store.digest_for(stat_result)
+
+    with metrics.CATALOG_SCAN_SECONDS.time():
+        return scan_themes(
+            THEMES_ROOT,
+            max_depth=config.THEMES_MAX_DEPTH,
+            executor=scan_executor,
+            annotate=annotate if blob_store is not None else None,
+        )
+
+
+def _cached_catalog(current_time: float):
+    global _catalog_hits, _catalog_misses
+    if current_time - _cache_timestamp < LOCAL_CACHE_DURATION and _file_cache:
+        _catalog_hits += 1
+        applog.note_cache("catalog", True)
+        return _file_cache.copy()
+    _catalog_misses += 1
+    applog.note_cache("catalog", False)
+    return None
+
+
+def _store_catalog(results: List[dict], current_time: float) -> None:
+    global _file_cache, _cache_timestamp
+    _file_cache = results
+    _cache_timestamp = current_time
+
+
+async def run_in_io(func, *args):
+    """Run ``func`` on io_executor in a copy of the caller's context.
+
+    ``run_in_executor`` alone drops contextvars, and with them the request's
+    cache flags (``applog.note_cache``).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor, contextvars.copy_context().run, func, *args)
+
 
 async def find_theme_files_async() -> List[dict]:
-    """Async file scanning to prevent blocking."""
-    loop = asyncio.get_event_loop()
+    """Cached catalog listing that scans on io_executor without blocking the loop."""
+    current_time = time()
+    with _file_cache_lock:
+        cached = _cached_catalog(current_time)
+    if cached is not None:
+        return cached
+    results = await run_in_io(_scan_catalog)
+    with _file_cache_lock:
+        _store_catalog(results, current_time)
+    return results.copy()
 
-    def scan_files():
-        results = []
-        theme_extensions = {'.ovt', '.obt', '.json'}
 
-        try:
-            for file_path in ROOT.iterdir():
-                if (file_path.is_file() and
-                     file_path.suffix.lower() in theme_extensions):
-                    try:
-                        stat_result = file_path.stat()
-                        results.append({
-                            "name": file_path.name,
-                            "path": str(file_path.relative_to(ROOT)),
-                            "size": stat_result.st_size,
-                            "modified": stat_result.st_mtime,
-                        })
-                    except OSError:
-                        continue
-        except OSError:
-            return []
-
-        return sorted(results, key=lambda r: r["name"])
-
-    return await loop.run_in_executor(io_executor, scan_files)
-
-# For Flask compatibility, provide sync wrapper
 def find_theme_files() -> List[dict]:
-    """Sync wrapper for async file scanning."""
-    global _file_cache, _cache_timestamp
+    """Cached catalog listing for synchronous (WSGI) callers."""
     current_time = time()
     with _file_cache_lock:
-        if current_time - _cache_timestamp < CACHE_DURATION and _file_cache:
-            return _file_cache.copy()
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            results = loop.run_until_complete(find_theme_files_async())
-            _file_cache = results
-            _cache_timestamp = current_time
-            return results.copy()
-        finally:
-            loop.close()
+        cached = _cached_catalog(current_time)
+        if cached is not None:
+            return cached
+        results = _scan_catalog()
+        _store_catalog(results, current_time)
+        return results.copy()
+
+
+def invalidate_catalog() -> None:
+    """Force the next listing to rescan, e.g. after scripts rewrote outputs."""
+    global _cache_timestamp
+    with _file_cache_lock:
+        _cache_timestamp = 0
+    if shared_store is not None:
+        shared_store.invalidate_catalog(str(THEMES_ROOT))
 
 
-from validation import validate_theme_content, ValidationReport
+def _update_catalog_entry(name: str, stat_result: os.stat_result) -> None:
+    """Refresh one cached catalog entry after a known write, without a rescan."""
+    with _file_cache_lock:
+        for i, entry in enumerate(_file_cache):
+            if entry["name"] == name:
+                _file_cache[i] = dict(entry, size=stat_result.st_size, modified=stat_result.st_mtime)
+                break
+    if shared_store is not None:
+        shared_store.update_catalog_entry(
+            str(THEMES_ROOT), name, size=stat_result.st_size, modified=stat_result.st_mtime,
+        )
+
+
+from archive import COMPRESSION_METHODS, DeflateCache, iter_zip
+from themecompact import MinifyCache
+from themecss import ThemeSyntaxError
+from themefile import FileLocks, ParseCache, write_meta
 from pydantic import ValidationError
 from werkzeug.exceptions import BadRequest, NotFound, Forbidden
 import traceback
 
 def validate_filename(filename: str) -> bool:
-    """Validate filename for security and format."""
-    if not filename or len(filename) > 255:
-        return False
-    # Check for path traversal attempts
-    if '..' in filename or '/' in filename or '\\' in filename:
-        return False
-    # Check for valid extensions
-    allowed_extensions = {'.ovt', '.obt', '.json'}
-    return any(filename.lower().endswith(ext) for ext in allowed_extensions)
+    """Validate a theme path (relative to THEMES_ROOT) for security and format."""
+    return is_safe_relative_path(filename, config.THEMES_MAX_DEPTH)
 
-from werkzeug.exceptions import BadRequest, NotFound, Forbidden
+from werkzeug.exceptions import BadRequest, NotFound, Forbidden, RequestEntityTooLarge
 import traceback
 
 class ThemeError(Exception):
@@ -191,37 +286,62 @@ class SecurityError(ThemeError):
     """Raised when security checks fail."""
     pass
 
+class PayloadTooLarge(ThemeError):
+    """Raised when a request body exceeds MAX_CONTENT_LENGTH."""
+    pass
+
+
+def resolve_theme_path(filename: str) -> Path:
+    """Resolve a validated theme path, refusing anything outside THEMES_ROOT."""
+    secure_path = THEMES_ROOT.joinpath(filename).resolve()
+    if THEMES_ROOT not in secure_path.parents:
+        raise SecurityError(f"Path escapes theme root: {filename}")
+    return secure_path
+
+def error_response(e: Exception, where: str) -> Tuple[dict, int]:
+    """JSON body and status for an exception raised in handler ``where``.
+
+    Shared by ``handle_errors`` and the ASGI app; call it from an ``except``
+    block so DEBUG responses can include the traceback.
+    """
+    if isinstance(e, ValidationError):
+        logger.warning(f"Validation error in {where}: {str(e)}")
+        return {"error": "Validation failed", "details": str(e)}, 400
+    if isinstance(e, SecurityError):
+        logger.error(f"Security error in {where}: {str(e)}")
+        return {"error": "Access denied"}, 403
+    if isinstance(e, (PayloadTooLarge, RequestEntityTooLarge)):
+        logger.info(f"Request body too large in {where}")
+        return {"error": "Request body too large"}, 413
+    if isinstance(e, FileNotFoundError):
+        logger.info(f"File not found in {where}: {str(e)}")
+        return {"error": "File not found"}, 404
+    if isinstance(e, PermissionError):
+        logger.warning(f"Permission error in {where}: {str(e)}")
+        return {"error": "Permission denied"}, 403
+    if isinstance(e, OSError):
+        logger.error(f"I/O error in {where}: {str(e)}")
+        return {"error": "File system error"}, 500
+    logger.error(f"Unexpected error in {where}: {str(e)}", exc_info=True)
+    # In development, include traceback
+    if app.config.get('DEBUG'):
+        return {
+            "error": "Internal server error",
+            "details": str(e),
+            "traceback": traceback.format_exc()
+        }, 500
+    return {"error": "Internal server error"}, 500
+
+
 def handle_errors(f):
     """Enhanced error handler with specific exception handling."""
     @wraps(f)
     def wrapper(*args, **kwargs):
         try:
             return f(*args, **kwargs)
-        except ValidationError as e:
-            logger.warning(f"Validation error in {f.__name__}: {str(e)}")
-            return jsonify({"error": "Validation failed", "details": str(e)}), 400
-        except SecurityError as e:
-            logger.error(f"Security error in {f.__name__}: {str(e)}")
-            return jsonify({"error": "Access denied"}), 403
-        except FileNotFoundError as e:
-            logger.info(f"File not found in {f.__name__}: {str(e)}")
-            return jsonify({"error": "File not found"}), 404
-        except PermissionError as e:
-            logger.warning(f"Permission error in {f.__name__}: {str(e)}")
-            return jsonify({"error": "Permission denied"}), 403
-        except (OSError, IOError) as e:
-            logger.error(f"I/O error in {f.__name__}: {str(e)}")
-            return jsonify({"error": "File system error"}), 500
         except Exception as e:
-            logger.error(f"Unexpected error in {f.__name__}: {str(e)}", exc_info=True)
-            # In development, include traceback
-            if app.config.get('DEBUG'):
-                return jsonify({
-                    "error": "Internal server error",
-                    "details": str(e),
-                    "traceback": traceback.format_exc()
-                }), 500
-            return jsonify({"error": "Internal server error"}), 500
+            body, status = error_response(e, f.__name__)
+            return jsonify(body), status
     return wrapper
 
 @app.route("/")
@@ -237,22 +357,89 @@ def api_themes():
     return jsonify({"themes": find_theme_files()})
 
 
+# Parsed themes are shared by the meta, validate and archive endpoints; edits
+# lock only the file they touch.
+parse_cache = ParseCache(shared=shared_store)
+file_locks = FileLocks()
+
+MAX_ARCHIVE_ENTRIES = 1000
+archive_cache = DeflateCache()
+minify_cache = MinifyCache()
+MINIFIABLE_EXTENSIONS = {'.ovt', '.obt'}
+
+
+def wants_minified() -> bool:
+    return request.args.get("minified", "").lower() in ("1", "true")
+
+
+def minified_headers(report) -> dict:
+    """Size report of a ``?minified=1`` download."""
+    return {
+        "X-Original-Size": str(report.original_bytes),
+        "X-Minified-Size": str(report.minified_bytes),
+        "X-Minify-Rules": f"{report.rules_before}->{report.rules_after}",
+        "X-Minify-Vars": f"{report.vars_before}->{report.vars_after}",
+    }
+
+
+@app.route("/api/themes/archive", methods=["GET"])
+@handle_errors
+def api_themes_archive():
+    """Stream a ZIP of several theme files built on the fly.
+
+    Select files with ``names`` (repeated or comma separated) and/or a glob
+    ``filter`` matched against catalog names, e.g. ``?filter=catppuccin_*``.
+    """
+    names = []
+    for value in request.args.getlist("names"):
+        names.extend(n.strip() for n in value.split(",") if n.strip())
+    pattern = request.args.get("filter")
+    if pattern:
+        names.extend(
+            t["name"] for t in find_theme_files()
+            if fnmatch.fnmatch(t["name"], pattern) or fnmatch.fnmatch(posixpath.basename(t["name"]), pattern)
+        )
+    if not names:
+        return jsonify({"error": "Provide names or filter"}), 400
+
+    compression = request.args.get("compression", "deflate")
+    if compression not in COMPRESSION_METHODS:
+        return jsonify({"error": "compression must be 'stored' or 'deflate'"}), 400
+
+    # Resolve and check every file before the first byte is sent; once the
+    # stream starts the status code can no longer change.
+    entries = []
+    seen = set()
+    for name in names:
+        if name in seen:
+            continue
+        seen.add(name)
+        if not validate_filename(name):
+            return jsonify({"error": f"Invalid filename: {name}"}), 400
+        secure_path = resolve_theme_path(name)
+        if not secure_path.is_file():
+            return jsonify({"error": f"File not found: {name}"}), 404
+        entries.append((name, secure_path))
+    if len(entries) > MAX_ARCHIVE_ENTRIES:
+        return jsonify({"error": f"Too many files (max {MAX_ARCHIVE_ENTRIES})"}), 400
+
+    archive_name = request.args.get("archive_name", "themes")
+    archive_name = secure_filename(archive_name) or "themes"
+    logger.info(f"Streaming archive of {len(entries)} theme files")
+    return Response(
+        stream_with_context(iter_zip(entries, compression=compression, cache=archive_cache)),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{archive_name}.zip"'},
+    )
+
+
 @app.route("/api/themes/<path:filename>", methods=["GET"])
 @handle_errors
 def api_theme_download(filename: str):
     if not validate_filename(filename):
         return jsonify({"error": "Invalid filename"}), 400
     try:
-        # Sanitize filename first
-        filename = os.path.basename(filename)  # Remove any path components
-        secure_path = Path(ROOT).joinpath(filename).resolve()
-        root_resolved = ROOT.resolve()
-
-        # More robust security check
-        try:
-            secure_path.relative_to(root_resolved)
-        except ValueError:
-            return jsonify({"error": "Access denied"}), 403
+        secure_path = resolve_theme_path(filename)
 
         # Additional extension whitelist check
         allowed_extensions = {'.ovt', '.obt', '.json'}
@@ -262,7 +449,20 @@ def api_theme_download(filename: str):
         if not secure_path.exists() or not secure_path.is_file():
             return jsonify({"error": "File not found"}), 404
 
-        return send_from_directory(str(ROOT), filename, as_attachment=True)
+        if wants_minified():
+            if secure_path.suffix.lower() not in MINIFIABLE_EXTENSIONS:
+                return jsonify({"error": "Only .ovt and .obt themes can be minified"}), 400
+            try:
+                result = minify_cache.get(secure_path)
+            except ThemeSyntaxError as e:
+                return jsonify({"error": f"Theme can't be minified: {e}"}), 422
+            basename = secure_path.name.replace('"', "")
+            return Response(result.text, mimetype="text/plain", headers={
+                "Content-Disposition": f'attachment; filename="{basename}"',
+                **minified_headers(result.report),
+            })
+
+        return send_from_directory(str(THEMES_ROOT), filename, as_attachment=True)
 
     except (OSError, ValueError) as e:
         return jsonify({"error": "Invalid file path"}), 400
@@ -274,15 +474,13 @@ def api_theme_delete(filename: str):
     if not validate_filename(filename):
         return jsonify({"error": "Invalid filename"}), 400
     try:
-        # Path validation code here (same as before)
-        secure_path = Path(ROOT).joinpath(filename).resolve()
-        root_resolved = ROOT.resolve()
-
-        if not (secure_path == root_resolved or root_resolved in secure_path.parents):
-            return jsonify({"error": "Access denied"}), 403
+        secure_path = resolve_theme_path(filename)
 
         # Attempt deletion directly, handle FileNotFoundError
+        stat_result = secure_path.stat()
         secure_path.unlink()
+        if blob_store is not None:
+            blob_store.release(stat_result)
         return jsonify({"success": True, "message": f"Theme '{filename}' deleted."})
 
     except FileNotFoundError:
@@ -295,9 +493,6 @@ def api_theme_delete(filename: str):
         return jsonify({"error": "Invalid filename"}), 400
 
 
-import bleach
-from werkzeug.utils import secure_filename
-
 def validate_theme_name(name: str) -> tuple[bool, str]:
     """Validate theme name for security and format compliance."""
     if not name or len(name.strip()) == 0:
@@ -336,6 +531,8 @@ def api_theme_duplicate(filename: str):
         return jsonify({"error": "Missing new_name"}), 400
 
     # Sanitize and validate new name
+    import bleach  # only needed by this route; keeps it off the startup path
+
     new_name = bleach.clean(str(new_name).strip())
     valid, message = validate_theme_name(new_name)
     if not valid:
@@ -349,22 +546,31 @@ def api_theme_duplicate(filename: str):
     # Use secure_filename for additional safety
     safe_new_name = secure_filename(new_name)
 
-    # Security: only allow files from the repository root
-    secure_path = Path(ROOT).joinpath(filename).resolve()
-    root_resolved = ROOT.resolve()
-    if not (secure_path == root_resolved or root_resolved in secure_path.parents):
-        return jsonify({"error": "Invalid filename"}), 403
-
-    new_path = Path(ROOT).joinpath(safe_new_name).resolve()
-    if not (new_path == root_resolved or root_resolved in new_path.parents):
-        return jsonify({"error": "Invalid new_name"}), 403
+    # Security: only allow files inside the theme root. The copy goes to its
+    # hash shard when sharding is on, otherwise next to the original.
+    secure_path = resolve_theme_path(filename)
+    if config.THEMES_SHARD_LEVELS:
+        new_rel = shard_path(safe_new_name, config.THEMES_SHARD_LEVELS)
+    else:
+        new_rel = posixpath.join(posixpath.dirname(filename), safe_new_name)
+    if not validate_filename(new_rel):
+        return jsonify({"error": "Invalid new_name"}), 400
+    new_path = resolve_theme_path(new_rel)
+    new_path.parent.mkdir(parents=True, exist_ok=True)
 
     if new_path.exists():
         return jsonify({"error": "File with new_name already exists"}), 400
 
-    import shutil
-    shutil.copy(secure_path, new_path)
-    return jsonify({"success": True, "message": f"Theme '{filename}' duplicated to '{safe_new_name}'."})
+    if blob_store is not None:
+        # Copy-free: the duplicate is another reference to the same blob.
+        try:
+            blob_store.duplicate(secure_path, new_path)
+        except FileExistsError:
+            return jsonify({"error": "File with new_name already exists"}), 400
+    else:
+        import shutil
+        shutil.copy(secure_path, new_path)
+    return jsonify({"success": True, "message": f"Theme '{filename}' duplicated to '{new_rel}'."})
 
 
 @app.route("/api/themes/<path:filename>/meta", methods=["GET", "POST"])
@@ -372,45 +578,36 @@ def api_theme_duplicate(filename: str):
 def api_theme_meta(filename: str):
     if not validate_filename(filename):
         return jsonify({"error": "Invalid filename"}), 400
-    # Security: only allow files from the repository root
-    secure_path = Path(ROOT).joinpath(filename).resolve()
-    if ROOT.resolve() not in secure_path.parents:
-        return jsonify({"error": "Invalid filename"}), 400
+    secure_path = resolve_theme_path(filename)
 
     if not secure_path.exists():
         return jsonify({"error": "Not found"}), 404
 
     if request.method == "GET":
         try:
-            text = secure_path.read_text(encoding='utf-8')
-            report = validate_theme_content(text)
-            return jsonify(report["meta"])
+            parsed = parse_cache.get(secure_path)
+            return jsonify(parsed.report.meta.model_dump())
         except Exception as e:
             return jsonify({"error": f"Error reading theme: {e}"}), 500
 
     if request.method == "POST":
-        new_meta = request.json.get("meta")
-        if not new_meta:
+        data = request.get_json(silent=True) or {}
+        new_meta = data.get("meta")
+        if not new_meta or not isinstance(new_meta, dict):
             return jsonify({"error": "Missing meta"}), 400
 
         try:
-            text = secure_path.read_text(encoding='utf-8')
-            meta_block_re = re.compile(r"(@OBSThemeMeta\s*\{)([\s\S]*?)(\})")
-
-            new_meta_content = "\n"
-            for key, value in new_meta.items():
-                new_meta_content += f"    {key}: {json.dumps(str(value))},\n"
-
-            new_text, count = meta_block_re.sub(r"\1" + new_meta_content + r"\3", text, 1)
-
-            if count == 0:
-                return jsonify({"error": "Could not find @OBSThemeMeta block"}), 500
-
-            secure_path.write_text(new_text, encoding='utf-8')
-            return jsonify({"success": True, "message": "Theme metadata updated."})
+            _, stat_result = write_meta(secure_path, new_meta, parse_cache, file_locks)
+        except ValueError as e:
+            return jsonify({"error": f"Invalid meta: {e}"}), 400
+        except LookupError as e:
+            return jsonify({"error": str(e)}), 500
         except Exception as e:
             return jsonify({"error": f"Error updating metadata: {e}"}), 500
 
+        _update_catalog_entry(filename, stat_result)
+        return jsonify({"success": True, "message": "Theme metadata updated."})
+
 
 @app.route("/api/convert", methods=["POST"])
 @handle_errors
@@ -446,73 +643,305 @@ def api_convert():
     return jsonify({"ovt": ovt_content})
 
 
-@app.route("/api/generate", methods=["POST"])
-@limiter.limit("5 per minute")
-@handle_errors
-def api_generate():
-    ALLOWED_SCRIPTS = {"script_1.py", "script_2.py", "script_3.py"}
-    results = []
+from generators import GENERATORS, run_generator
 
-    for script_name in ALLOWED_SCRIPTS:
-        script_path = ROOT / script_name
+GENERATE_SCRIPTS = ("script_1.py", "script_2.py", "script_3.py")
+GENERATE_TIMEOUT = 30
+GENERATE_OUTPUT_LIMIT = 2000
 
-        # Ensure script exists and is a regular file
-        if not script_path.exists() or not script_path.is_file():
-            results.append({"script": script_name, "status": "missing"})
-            continue
 
-        # Additional security: verify script integrity/hash if needed
-        try:
-            script_path_resolved = script_path.resolve()
-            if script_path_resolved.parent != ROOT.resolve():
-                results.append({"script": script_name, "status": "security_error"})
-                continue
-
-            # Use absolute path and restrict environment
-            proc = subprocess.run(
-                [sys.executable, str(script_path_resolved)],
-                cwd=str(ROOT.resolve()),
-                capture_output=True,
-                text=True,
-                timeout=30,  # Reduced timeout
-                shell=False,
-                env={'PATH': '', 'PYTHONPATH': str(ROOT)}  # Restricted environment
+def _generation_command(script_name: str):
+    """Return (argv, popen kwargs, None), or (None, None, status) if the script can't run."""
+    script_path = ROOT / script_name
+
+    # Ensure script exists and is a regular file
+    if not script_path.exists() or not script_path.is_file():
+        return None, None, {"script": script_name, "status": "missing"}
+
+    # Additional security: verify script integrity/hash if needed
+    script_path_resolved = script_path.resolve()
+    if script_path_resolved.parent != ROOT.resolve():
+        return None, None, {"script": script_name, "status": "security_error"}
+
+    # Use absolute path and restrict environment
+    argv = [sys.executable, str(script_path_resolved)]
+    kwargs = {
+        "cwd": str(ROOT.resolve()),
+        "env": {'PATH': '', 'PYTHONPATH': str(ROOT)},  # Restricted environment
+    }
+    return argv, kwargs, None
+
+
+def _generation_result(script_name: str, returncode: int, stdout: str, stderr: str) -> dict:
+    return {
+        "script": script_name,
+        "returncode": returncode,
+        "stdout": stdout[:GENERATE_OUTPUT_LIMIT] if stdout else "",
+        "stderr": stderr[:GENERATE_OUTPUT_LIMIT] if stderr else "",
+    }
+
+
+GENERATION_SECONDS = metrics.histogram(
+    "obs_styla_generation_script_seconds",
+    "Wall time of one generation script run.",
+    ("script",),
+)
+GENERATION_RUNS = metrics.counter(
+    "obs_styla_generation_script_runs_total",
+    "Generation script runs by outcome (exit code, timeout, missing, error).",
+    ("script", "status"),
+)
+
+
+def record_generation(result: dict, seconds: float) -> dict:
+    """Record a generation result's duration and outcome; returns ``result``."""
+    script = result["script"]
+    status = result.get("status")
+    if status is None:
+        status = str(result["returncode"])
+    GENERATION_RUNS.inc(script, status)
+    if status != "missing":
+        GENERATION_SECONDS.observe(seconds, script)
+    return result
+
+
+def run_generation_script(script_name: str) -> dict:
+    start = perf_counter()
+    return record_generation(_run_generation_script(script_name), perf_counter() - start)
+
+
+_generate_pool = None
+_generate_pool_lock = threading.Lock()
+
+
+def generate_pool():
+    """Warm process pool for GENERATE_MODE=pool, created on first use."""
+    global _generate_pool
+    with _generate_pool_lock:
+        if _generate_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn: forking a threaded server process is not safe.
+            _generate_pool = ProcessPoolExecutor(
+                max_workers=config.GENERATE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
             )
+        return _generate_pool
 
-            results.append({
-                "script": script_name,
-                "returncode": proc.returncode,
-                "stdout": proc.stdout[:2000] if proc.stdout else "",
-                "stderr": proc.stderr[:2000] if proc.stderr else ""
-            })
-        except subprocess.TimeoutExpired:
-            results.append({"script": script_name, "status": "timeout"})
+
+def _run_generation_script(script_name: str) -> dict:
+    if config.GENERATE_MODE != "subprocess" and script_name in GENERATORS:
+        try:
+            # In-process renders run on their own threads so a hung one is
+            # given up on after GENERATE_TIMEOUT, like a subprocess; the
+            # thread itself can't be stopped.
+            pool = generate_pool() if config.GENERATE_MODE == "pool" else render_executor
+            # Hash the inputs before rendering so edits made mid-build show as stale.
+            inputs = build_graph.inputs(script_name)
+            result = run_generator(script_name, ROOT, THEMES_ROOT, pool=pool, minify=config.GENERATE_MINIFY,
+                                   timeout=GENERATE_TIMEOUT)
+            if "outputs" in result:
+                build_graph.record(script_name, inputs, result["outputs"])
+            return result
         except Exception as e:
-            results.append({"script": script_name, "status": "error", "error": str(e)[:500]})
+            logger.error(f"Generator {script_name} failed: {e}", exc_info=True)
+            return {"script": script_name, "status": "error", "error": str(e)[:500]}
+    try:
+        argv, kwargs, status = _generation_command(script_name)
+        if status is not None:
+            return status
+        proc = subprocess.run(
+            argv,
+            capture_output=True,
+            text=True,
+            timeout=GENERATE_TIMEOUT,
+            shell=False,
+            **kwargs,
+        )
+        return _generation_result(script_name, proc.returncode, proc.stdout, proc.stderr)
+    except subprocess.TimeoutExpired:
+        return {"script": script_name, "status": "timeout"}
+    except Exception as e:
+        return {"script": script_name, "status": "error", "error": str(e)[:500]}
 
-    return jsonify({"results": results, "themes": find_theme_files()})
 
+from buildgraph import MANIFEST_NAME, BuildGraph
+from jobs import JobQueue
 
-@app.route("/api/validate", methods=["GET"])
+# Output hashes and build inputs of the in-process generators.
+build_graph = BuildGraph(THEMES_ROOT / MANIFEST_NAME, ROOT, THEMES_ROOT,
+                         options={"minify": config.GENERATE_MINIFY})
+
+# Bounded pool the generation jobs' scripts run on.
+generate_executor = CountingThreadPool(max_workers=config.GENERATE_WORKERS, thread_name_prefix="generate")
+# GENERATE_MODE=inprocess renders, waited on with GENERATE_TIMEOUT.
+render_executor = CountingThreadPool(max_workers=config.GENERATE_WORKERS, thread_name_prefix="generate_render")
+generation_jobs = JobQueue(
+    generate_executor,
+    run_generation_script,
+    on_done=lambda job: invalidate_catalog(),
+    shared=shared_store,
+)
+JOB_ID_RE = re.compile(r"^[0-9a-f]{16}$")
+
+
+def wants_wait() -> bool:
+    return request.args.get("wait", "").lower() in ("1", "true")
+
+
+def generation_plan(force: bool = False) -> Tuple[str, ...]:
+    """Scripts a generate request has to run: only stale ones, unless forced.
+
+    Subprocess mode can't see what a script reads or writes, so it always
+    runs everything.
+    """
+    if force or config.GENERATE_MODE == "subprocess":
+        return GENERATE_SCRIPTS
+    return tuple(build_graph.stale(GENERATE_SCRIPTS))
+
+
+def generation_wait_timeout(scripts: Tuple[str, ...]) -> float:
+    """How long ``?wait=1`` waits for a job before answering 202 instead.
+
+    Each script gives up after GENERATE_TIMEOUT; running them one after
+    another is the worst case.
+    """
+    return GENERATE_TIMEOUT * len(scripts) + 5
+
+
+def job_accepted(job: dict, coalesced: bool) -> dict:
+    """Body of a 202 answer for a job that is still running."""
+    return {
+        "job": job,
+        "coalesced": coalesced,
+        "status_url": f"/api/jobs/{job['id']}",
+        "events_url": f"/api/jobs/{job['id']}/events",
+    }
+
+
+def generate_job_key(scripts: Tuple[str, ...]) -> str:
+    # Requests that need the same scripts coalesce into one job.
+    return "generate:" + ",".join(scripts)
+
+
+def sse_event(event: Optional[str], data=None) -> str:
+    """One Server-Sent Events frame; ``event=None`` is a keep-alive comment."""
+    if event is None:
+        return ": keep-alive\n\n"
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def sse_response(events) -> Response:
+    """Stream ``events`` (an iterable of SSE frames) without buffering."""
+    return Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.route("/api/generate", methods=["POST"])
+@limiter.limit("5 per minute")
 @handle_errors
-def api_validate():
-    """Validate all generated theme files and return a report."""
-    themes = find_theme_files()
-    reports = []
+def api_generate():
+    """Start (or join) a generation job and return its id with 202.
+
+    Only scripts whose outputs are stale run; when none are, the answer is
+    200 ``{"status": "up to date"}`` with no job.  ``?force=1`` runs them
+    all.  ``?wait=1`` keeps the old blocking behaviour and returns the
+    results and refreshed theme list once the job is done, or the usual 202
+    if it isn't done within ``generation_wait_timeout``.
+    """
+    scripts = generation_plan(force=request.args.get("force", "").lower() in ("1", "true"))
+    if not scripts:
+        if wants_wait():
+            return jsonify({"status": "up to date", "job": None, "results": [], "themes": find_theme_files()})
+        return jsonify({"status": "up to date", "job": None})
+    job, coalesced = generation_jobs.submit(generate_job_key(scripts), scripts)
+    if wants_wait():
+        job = generation_jobs.wait(job["id"], timeout=generation_wait_timeout(scripts))
+        if job["state"] == "done":
+            return jsonify({"job": job["id"], "results": job["scripts"], "themes": find_theme_files()})
+    return jsonify(job_accepted(job, coalesced)), 202
+
+
+@app.route("/api/jobs/<job_id>", methods=["GET"])
+@limiter.limit("120 per minute")
+@handle_errors
+def api_job(job_id: str):
+    """Per-script status, timings and truncated output of a generation job."""
+    if not JOB_ID_RE.match(job_id):
+        return jsonify({"error": "Invalid job id"}), 400
+    job = generation_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
+
+class JobEvents:
+    """SSE frames for successive snapshots of a job: ``job`` first, ``script`` per status change, ``done``."""
+
+    def __init__(self):
+        self.first = True
+        self.scripts: dict = {}
+
+    def frames(self, job: Optional[dict]) -> List[str]:
+        """Frames for one snapshot; None (nothing changed for a while) is a keep-alive."""
+        if job is None:
+            return [sse_event(None)]
+        frames = []
+        if self.first:
+            frames.append(sse_event("job", job))
+            self.first = False
+        for s in job["scripts"]:
+            if self.scripts.get(s["script"]) != s["status"]:
+                self.scripts[s["script"]] = s["status"]
+                if s["status"] != "pending":
+                    frames.append(sse_event("script", s))
+        if job["state"] == "done":
+            frames.append(sse_event("done", job))
+        return frames
+
+
+def iter_job_events(job_id: str):
+    events = JobEvents()
+    for job in generation_jobs.watch(job_id):
+        yield from events.frames(job)
+
+
+@app.route("/api/jobs/<job_id>/events", methods=["GET"])
+@limiter.limit("30 per minute")
+@handle_errors
+def api_job_events(job_id: str):
+    """Stream a generation job's progress as Server-Sent Events."""
+    if not JOB_ID_RE.match(job_id):
+        return jsonify({"error": "Invalid job id"}), 400
+    if generation_jobs.get(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
+    return sse_response(iter_job_events(job_id))
+
+
+def validate_catalog_entry(t: dict) -> dict:
+    """Validation report entry for one catalog entry (blocking, cached)."""
+    p = THEMES_ROOT / t["path"]
+    try:
+        report_model = parse_cache.get(p).report
+        return {"name": t["name"], "report": report_model.dict()}
+    except ValidationError as e:
+        return {"name": t["name"], "error": f"Validation model error: {e}"}
+    except Exception as e:
+        return {"name": t["name"], "error": f"Could not read or validate file: {e}"}
+
+
+def summarize_validations(reports: List[dict]) -> dict:
+    """Flag theme ids shared by several files and build the response body."""
     id_map: dict = {}
-    for t in themes:
-        p = ROOT / t["path"]
-        try:
-            text = p.read_text(encoding='utf-8')
-            report_model = validate_theme_content(text)
-            reports.append({"name": t["name"], "report": report_model.dict()})
-            mid = report_model.meta.id
+    for r in reports:
+        if "report" in r:
+            mid = r["report"]["meta"]["id"]
             if mid:
-                id_map.setdefault(mid, []).append(t["name"])
-        except ValidationError as e:
-            reports.append({"name": t["name"], "error": f"Validation model error: {e}"})
-        except Exception as e:
-            reports.append({"name": t["name"], "error": f"Could not read or validate file: {e}"})
+                id_map.setdefault(mid, []).append(r["name"])
 
     # detect duplicates
     duplicate_ids = []
@@ -525,7 +954,57 @@ def api_validate():
                         {"code": "DUPLICATE_THEME_ID", "message": f"Theme id {mid} used by multiple files"}
                     )
 
-    return jsonify({"validations": reports, "duplicate_ids": duplicate_ids})
+    return {"validations": reports, "duplicate_ids": duplicate_ids}
+
+
+@app.route("/api/validate", methods=["GET"])
+@handle_errors
+def api_validate():
+    """Validate all generated theme files and return a report."""
+    reports = [validate_catalog_entry(t) for t in find_theme_files()]
+    return jsonify(summarize_validations(reports))
+
+
+def iter_validation_events(themes: List[dict], full: bool = True):
+    """SSE frames for validating ``themes`` one at a time.
+
+    Each report is sent and dropped as soon as it is built; only theme ids
+    are kept, so duplicate ids are reported once at the end instead of as
+    per-report warnings.
+    """
+    total = len(themes)
+    yield sse_event("start", {"total": total})
+    id_map: dict = {}
+    failed = 0
+    for index, t in enumerate(themes, 1):
+        r = validate_catalog_entry(t)
+        event = {"index": index, "total": total, "name": r["name"]}
+        if "report" in r:
+            report = r["report"]
+            mid = report["meta"]["id"]
+            if mid:
+                id_map.setdefault(mid, []).append(r["name"])
+            event["summary"] = report["summary"]
+            if full:
+                event["report"] = report
+        else:
+            failed += 1
+            event["error"] = r["error"]
+        yield sse_event("theme", event)
+    duplicate_ids = [{"id": mid, "files": files} for mid, files in id_map.items() if len(files) > 1]
+    yield sse_event("done", {"total": total, "failed": failed, "duplicate_ids": duplicate_ids})
+
+
+@app.route("/api/validate/events", methods=["GET"])
+@limiter.limit("10 per minute")
+@handle_errors
+def api_validate_events():
+    """Validate all theme files, streaming one Server-Sent Event per theme.
+
+    ``?summary=1`` sends only each theme's summary instead of its full report.
+    """
+    full = request.args.get("summary", "").lower() not in ("1", "true")
+    return sse_response(iter_validation_events(find_theme_files(), full=full))
 
 
 @app.route("/health")
@@ -540,20 +1019,47 @@ def health_check():
 
     # Check file system access
     try:
-        ROOT.stat()
+        THEMES_ROOT.stat()
         checks["dependencies"]["filesystem"] = "ok"
     except OSError:
         checks["dependencies"]["filesystem"] = "error"
         checks["status"] = "unhealthy"
 
     # Check Python scripts existence
-    for script in ["script_1.py", "script_2.py", "script_3.py"]:
+    for script in GENERATE_SCRIPTS:
         script_path = ROOT / script
         checks["dependencies"][script] = "ok" if script_path.exists() else "missing"
 
     status_code = 200 if checks["status"] == "healthy" else 503
     return jsonify(checks), status_code
 
+def search_store_name():
+    store_name_file = APP_DIR / "file_search_store.txt"
+    if not store_name_file.exists():
+        return None
+    return store_name_file.read_text().strip()
+
+
+def run_search(query: str, store_name: str) -> str:
+    """Run a file-search backed query against Gemini (blocking network call)."""
+    genai = _genai()
+    from google.generativeai import types
+    response = genai.models.generate_content(
+        model="gemini-1.5-flash",
+        contents=query,
+        config=types.GenerateContentConfig(
+            tools=[
+                types.Tool(
+                    file_search=types.FileSearch(
+                        file_search_store_names=[store_name],
+                    )
+                )
+            ]
+        )
+    )
+    return response.text
+
+
 @app.route("/api/search", methods=["POST"])
 @handle_errors
 def api_search():
@@ -570,43 +1076,147 @@ def api_search():
     if not query:
         return jsonify({"error": "Missing query"}), 400
 
-    store_name_file = APP_DIR / "file_search_store.txt"
-    if not store_name_file.exists():
+    store_name = search_store_name()
+    if store_name is None:
         return jsonify({"error": "File search store not found"}), 500
 
-    store_name = store_name_file.read_text().strip()
-
     try:
-        response = genai.models.generate_content(
-            model="gemini-1.5-flash",
-            contents=query,
-            config=types.GenerateContentConfig(
-                tools=[
-                    types.Tool(
-                        file_search=types.FileSearch(
-                            file_search_store_names=[store_name],
-                        )
-                    )
-                ]
-            )
-        )
-        return jsonify({"response": response.text})
+        return jsonify({"response": run_search(query, store_name)})
     except Exception as e:
         logger.error(f"Error during file search: {e}")
         return jsonify({"error": "Failed to perform search"}), 500
 
 
+SECURITY_HEADERS = {
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'DENY',
+    'X-XSS-Protection': '1; mode=block',
+    'Content-Security-Policy': "default-src 'self'; style-src 'self' 'unsafe-inline'; script-src 'self'",
+    'Strict-Transport-Security': 'max-age=31536000; includeSubDomains',
+}
+
+
 @app.after_request
 def add_security_headers(response):
     """Add security headers to all responses."""
-    response.headers['X-Content-Type-Options'] = 'nosniff'
-    response.headers['X-Frame-Options'] = 'DENY'
-    response.headers['X-XSS-Protection'] = '1; mode=block'
-    response.headers['Content-Security-Policy'] = "default-src 'self'; style-src 'self' 'unsafe-inline'; script-src 'self'"
-    response.headers['Strict-Transport-Security'] = 'max-age=31536000; includeSubDomains'
+    response.headers.update(SECURITY_HEADERS)
+    return response
+
+
+HTTP_REQUESTS = metrics.counter(
+    "obs_styla_http_requests_total",
+    "HTTP requests by route template, method and status.",
+    ("route", "method", "status"),
+)
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "obs_styla_http_request_seconds",
+    "Time from request start to response headers, by route template.",
+    ("route", "method"),
+)
+RATELIMIT_REJECTIONS = metrics.counter(
+    "obs_styla_ratelimit_rejections_total",
+    "Requests rejected with 429 by the rate limiter.",
+    ("route",),
+)
+
+
+def _cache_samples():
+    with _file_cache_lock:
+        catalog = (_catalog_hits, _catalog_misses)
+    yield "catalog", catalog
+    yield "parse", (parse_cache.hits, parse_cache.misses)
+    yield "archive_deflate", (archive_cache.hits, archive_cache.misses)
+    yield "theme_minify", (minify_cache.hits, minify_cache.misses)
+
+
+def _cache_ratio_samples():
+    for name, (hits, misses) in _cache_samples():
+        total = hits + misses
+        yield (name,), hits / total if total else 0.0
+
+
+metrics.callback_gauge(
+    "obs_styla_cache_hits_total", "Cache lookups served from cache.", ("cache",),
+    lambda: (((name,), hits) for name, (hits, _) in _cache_samples()), kind="counter",
+)
+metrics.callback_gauge(
+    "obs_styla_cache_misses_total", "Cache lookups that had to do the work.", ("cache",),
+    lambda: (((name,), misses) for name, (_, misses) in _cache_samples()), kind="counter",
+)
+metrics.callback_gauge(
+    "obs_styla_cache_hit_ratio", "Hits over lookups since process start.", ("cache",),
+    _cache_ratio_samples,
+)
+EXECUTORS = {"file_io": io_executor, "catalog_scan": scan_executor, "generate": generate_executor,
+             "generate_render": render_executor}
+
+
+def _executor_samples(pick):
+    for name, executor in EXECUTORS.items():
+        yield (name,), pick(*executor.counts())
+
+
+metrics.callback_gauge(
+    "obs_styla_executor_tasks_submitted_total", "Tasks submitted to the pool.", ("pool",),
+    lambda: _executor_samples(lambda submitted, started, finished: submitted), kind="counter",
+)
+metrics.callback_gauge(
+    "obs_styla_executor_tasks_finished_total", "Tasks the pool has finished running.", ("pool",),
+    lambda: _executor_samples(lambda submitted, started, finished: finished), kind="counter",
+)
+metrics.callback_gauge(
+    "obs_styla_executor_queue_depth", "Tasks waiting for a worker thread.", ("pool",),
+    lambda: _executor_samples(lambda submitted, started, finished: submitted - started),
+)
+
+
+def log_access(route: str, method: str, path: str, status: int, seconds, size, remote_addr, cache) -> None:
+    """Write one structured access-log record (JSON via the access handler)."""
+    access_logger.info("%s %s %s", method, path, status, extra={
+        "route": route,
+        "method": method,
+        "path": path,
+        "status": status,
+        "duration_ms": round(seconds * 1000, 3) if seconds is not None else None,
+        "bytes": size,
+        "remote": remote_addr,
+        "cache": cache or {},
+    })
+
+
+@app.before_request
+def start_request_timer():
+    g.request_start = perf_counter()
+    applog.begin_request()
+
+
+@app.after_request
+def record_request_metrics(response):
+    route = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    # The limiter's own before_request hook runs first, so a rejected request
+    # never starts the timer; it is still counted.
+    start = g.pop("request_start", None)
+    seconds = perf_counter() - start if start is not None else None
+    if seconds is not None:
+        HTTP_REQUEST_SECONDS.observe(seconds, route, request.method)
+    HTTP_REQUESTS.inc(route, request.method, str(response.status_code))
+    if response.status_code == 429:
+        RATELIMIT_REJECTIONS.inc(route)
+    cache = applog.end_request()
+    if access_logger.isEnabledFor(logging.INFO):
+        # Streamed responses have no length up front; logged as null.
+        log_access(route, request.method, request.path, response.status_code, seconds,
+                   response.content_length, request.remote_addr, cache)
     return response
 
 
+@app.route("/metrics")
+@limiter.exempt
+def metrics_endpoint():
+    """Prometheus scrape endpoint (per process)."""
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+
 @app.before_request
 def limit_remote_addr():
     """Basic rate limiting by IP."""
@@ -627,9 +1237,21 @@ def run_upload_script():
     except subprocess.CalledProcessError as e:
         logger.error(f"Theme upload script failed: {e.stderr}")
 
+def _genai():
+    """Import the Gemini SDK on first use; most of server startup otherwise."""
+    import google.generativeai as genai
+
+    return genai
+
+
+def configure_search():
+    _genai().configure(api_key=os.environ["GEMINI_API_KEY"])
+
+
 if __name__ == "__main__":
+    # Development server; use serve.py for multi-worker production serving.
     if os.environ.get("GEMINI_API_KEY"):
-        genai.configure(api_key=os.environ["GEMINI_API_KEY"])
+        configure_search()
         # Run the upload script synchronously to ensure the search store is ready.
         run_upload_script()
     else:
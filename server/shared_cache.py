@@ -0,0 +1,264 @@
+"""
+Cross-process backing store for the theme catalog and parse cache.
+
+Each prefork worker keeps its own in-memory caches; this SQLite database (WAL
+mode, so readers never block the single writer) sits behind them so a theme
+scanned or parsed by one worker is reused by the others instead of every
+worker repeating the work.  Parsed themes, including their validation
+reports, are stored as JSON keyed on file identity plus (size, mtime).
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from themefile import ParsedTheme
+from validation import ValidationReport
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog (
+    root TEXT PRIMARY KEY,
+    scanned_at REAL NOT NULL,
+    entries TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parsed (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (dev, ino)
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, state);
+-- The worker currently scanning a root; the others wait for its listing.
+CREATE TABLE IF NOT EXISTS catalog_scans (
+    root TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    claimed_at REAL NOT NULL
+);
+-- Requests that joined a job from another worker.  Kept apart from the
+-- payload, which the worker running the job keeps overwriting.
+CREATE TABLE IF NOT EXISTS job_joins (
+    id TEXT PRIMARY KEY,
+    joined INTEGER NOT NULL
+);
+"""
+
+# Finished jobs are kept this long for GET /api/jobs/<id>.
+JOB_RETENTION = 24 * 3600
+
+
+class SharedStore:
+    def __init__(self, path: Path, busy_timeout: float = 30.0):
+        self.path = Path(path)
+        self.busy_timeout = busy_timeout
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread per process; a connection inherited
+        # across fork() must never be used by the child.
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        conn = sqlite3.connect(str(self.path), timeout=self.busy_timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    # --- catalog -----------------------------------------------------------
+
+    def get_catalog(self, root: str, max_age: float) -> Optional[List[dict]]:
+        row = self._connect().execute(
+            "SELECT scanned_at, entries FROM catalog WHERE root = ?", (root,)
+        ).fetchone()
+        if row is None or time.time() - row[0] >= max_age:
+            return None
+        return json.loads(row[1])
+
+    def get_or_scan_catalog(self, root: str, max_age: float, scan: Callable[[], List[dict]],
+                            poll: float = 0.05, scan_timeout: float = 60.0) -> List[dict]:
+        """Return a fresh shared catalog, scanning at most once across workers.
+
+        The first worker to find the listing stale claims the scan in a short
+        transaction and scans with no lock held; the others poll until its
+        listing is stored.  A claim older than ``scan_timeout`` is presumed
+        dead and taken over.
+        """
+        owner = f"{os.getpid()}:{threading.get_ident()}"
+        while True:
+            entries, claimed = self._claim_scan(root, max_age, owner, scan_timeout)
+            if entries is not None:
+                return entries
+            if claimed:
+                break
+            time.sleep(poll)
+        started = time.time()
+        try:
+            entries = scan()
+        except BaseException:
+            self._connect().execute("DELETE FROM catalog_scans WHERE root = ? AND owner = ?", (root, owner))
+            raise
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO catalog (root, scanned_at, entries) VALUES (?, ?, ?)",
+                (root, started, json.dumps(entries)),
+            )
+            conn.execute("DELETE FROM catalog_scans WHERE root = ? AND owner = ?", (root, owner))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return entries
+
+    def _claim_scan(self, root: str, max_age: float, owner: str, scan_timeout: float):
+        """(fresh entries, None) or (None, whether ``owner`` now holds the scan claim)."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute("SELECT scanned_at, entries FROM catalog WHERE root = ?", (root,)).fetchone()
+            if row is not None and now - row[0] < max_age:
+                conn.execute("COMMIT")
+                return json.loads(row[1]), False
+            claim = conn.execute("SELECT claimed_at FROM catalog_scans WHERE root = ?", (root,)).fetchone()
+            claimed = claim is None or now - claim[0] >= scan_timeout
+            if claimed:
+                conn.execute("INSERT OR REPLACE INTO catalog_scans (root, owner, claimed_at) VALUES (?, ?, ?)",
+                             (root, owner, now))
+            conn.execute("COMMIT")
+            return None, claimed
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update_catalog_entry(self, root: str, name: str, **fields) -> None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT entries FROM catalog WHERE root = ?", (root,)).fetchone()
+            if row is not None:
+                entries = json.loads(row[0])
+                for entry in entries:
+                    if entry["name"] == name:
+                        entry.update(fields)
+                        conn.execute("UPDATE catalog SET entries = ? WHERE root = ?", (json.dumps(entries), root))
+                        break
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def invalidate_catalog(self, root: str) -> None:
+        self._connect().execute("UPDATE catalog SET scanned_at = 0 WHERE root = ?", (root,))
+
+    # --- parsed themes ------------------------------------------------------
+
+    def get_parsed(self, stat_result: os.stat_result) -> Optional[ParsedTheme]:
+        row = self._connect().execute(
+            "SELECT payload FROM parsed WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?",
+            (stat_result.st_dev, stat_result.st_ino, stat_result.st_size, stat_result.st_mtime_ns),
+        ).fetchone()
+        if row is None:
+            return None
+        data = json.loads(row[0])
+        return ParsedTheme(
+            path=data["path"],
+            dev=stat_result.st_dev,
+            ino=stat_result.st_ino,
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            meta_span=tuple(data["meta_span"]) if data["meta_span"] else None,
+            vars_span=tuple(data["vars_span"]) if data["vars_span"] else None,
+            report=ValidationReport.model_validate(data["report"]),
+        )
+
+    def put_parsed(self, parsed: ParsedTheme) -> None:
+        payload = json.dumps({
+            "path": parsed.path,
+            "meta_span": parsed.meta_span,
+            "vars_span": parsed.vars_span,
+            "report": parsed.report.model_dump(),
+        })
+        self._connect().execute(
+            "INSERT OR REPLACE INTO parsed (dev, ino, size, mtime_ns, payload) VALUES (?, ?, ?, ?, ?)",
+            (parsed.dev, parsed.ino, parsed.size, parsed.mtime_ns, payload),
+        )
+
+    # --- generation jobs ----------------------------------------------------
+
+    def claim_job(self, key: str, job_id: str, payload: dict, stale_after: float) -> Optional[dict]:
+        """Register a new in-flight job for ``key`` unless one already exists.
+
+        Returns the existing job's snapshot to join, or None if ``job_id``
+        was registered and the caller should run it.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT id, payload FROM jobs WHERE key = ? AND state != 'done' AND updated_at > ? "
+                "ORDER BY updated_at DESC LIMIT 1",
+                (key, now - stale_after),
+            ).fetchone()
+            if row is not None:
+                (joined,) = conn.execute(
+                    "INSERT INTO job_joins (id, joined) VALUES (?, 1) "
+                    "ON CONFLICT (id) DO UPDATE SET joined = joined + 1 RETURNING joined",
+                    (row[0],),
+                ).fetchone()
+                conn.execute("COMMIT")
+                existing = json.loads(row[1])
+                existing["requests"] += joined
+                return existing
+            conn.execute("DELETE FROM jobs WHERE updated_at < ?", (now - JOB_RETENTION,))
+            conn.execute("DELETE FROM job_joins WHERE id NOT IN (SELECT id FROM jobs)")
+            conn.execute(
+                "INSERT INTO jobs (id, key, state, updated_at, payload) VALUES (?, ?, ?, ?, ?)",
+                (job_id, key, payload["state"], now, json.dumps(payload)),
+            )
+            conn.execute("COMMIT")
+            return None
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def put_job(self, job_id: str, key: str, payload: dict) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO jobs (id, key, state, updated_at, payload) VALUES (?, ?, ?, ?, ?)",
+            (job_id, key, payload["state"], time.time(), json.dumps(payload)),
+        )
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        row = self._connect().execute(
+            "SELECT payload, joined FROM jobs LEFT JOIN job_joins USING (id) WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = json.loads(row[0])
+        job["requests"] += row[1] or 0
+        return job
+
+    def job_joins(self, job_id: str) -> int:
+        """Requests that joined ``job_id`` through ``claim_job``."""
+        row = self._connect().execute("SELECT joined FROM job_joins WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row is not None else 0
@@ -0,0 +1,64 @@
+import json
+import logging
+import tempfile
+import unittest
+from pathlib import Path
+
+import applog
+
+
+class TestQueuedLogging(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "access.log"
+        applog.configure({
+            "version": 1,
+            "disable_existing_loggers": False,
+            "formatters": {"json": {"()": "applog.JsonFormatter"}},
+            "handlers": {
+                "access": {
+                    "class": "logging.handlers.RotatingFileHandler",
+                    "formatter": "json",
+                    "filename": str(self.path),
+                    "maxBytes": 400,
+                    "backupCount": 2,
+                },
+            },
+            "loggers": {"test.access": {"handlers": ["access"], "level": "INFO", "propagate": False}},
+        })
+        self.logger = logging.getLogger("test.access")
+
+    def tearDown(self):
+        applog.stop()
+        self.tmp.cleanup()
+
+    def test_records_are_written_as_json_off_thread(self):
+        self.assertIsInstance(self.logger.handlers[0], logging.handlers.QueueHandler)
+        self.logger.info("GET %s %d", "/api/themes", 200, extra={"route": "/api/themes", "status": 200})
+        applog.stop()
+        record = json.loads(self.path.read_text().splitlines()[0])
+        self.assertEqual(record["msg"], "GET /api/themes 200")
+        self.assertEqual(record["route"], "/api/themes")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["logger"], "test.access")
+
+    def test_rotates_by_size(self):
+        for i in range(20):
+            self.logger.info("request %d", i)
+        applog.stop()
+        self.assertTrue(Path(str(self.path) + ".1").exists())
+        self.assertLessEqual(self.path.stat().st_size, 400)
+
+    def test_cache_flags_are_per_request(self):
+        applog.note_cache("catalog", True)  # outside a request: ignored
+        applog.begin_request()
+        applog.note_cache("parse", True)
+        applog.note_cache("parse", False)
+        applog.note_cache("catalog", True)
+        self.assertEqual(applog.end_request(), {"parse": False, "catalog": True})
+        self.assertIsNone(applog.end_request())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import io
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from archive import DeflateCache, iter_zip
+from config import ROOT
+
+
+class TestStreamingArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.files = {
+            "a.ovt": "@OBSThemeMeta { id: 'a.b'; }\n" * 200,
+            "b.obt": "QWidget { color: var(--text); }\n" * 50,
+        }
+        self.entries = []
+        for name, text in self.files.items():
+            path = root / name
+            path.write_text(text, encoding="utf-8")
+            self.entries.append((name, path))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read(self, data: bytes) -> dict:
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertIsNone(zf.testzip())
+            return {n: zf.read(n).decode("utf-8") for n in zf.namelist()}
+
+    def test_stored_and_deflate_round_trip(self):
+        """Both compression modes produce archives zipfile can read back."""
+        for compression in ("stored", "deflate"):
+            data = b"".join(iter_zip(self.entries, compression=compression))
+            self.assertEqual(self._read(data), self.files)
+
+    def test_cached_blobs_are_reused(self):
+        """A second archive of the same files is served from the deflate cache."""
+        cache = DeflateCache()
+        first = b"".join(iter_zip(self.entries, cache=cache))
+        self.assertEqual(cache.misses, 2)
+        second = b"".join(iter_zip(self.entries, cache=cache))
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(self._read(first), self._read(second))
+        # Cached entries carry sizes in the local header, so no data descriptor.
+        self.assertLess(len(second), len(first))
+
+    def test_stored_entry_matches_the_bytes_sent(self):
+        """A file rewritten after its header was sent still yields a valid entry."""
+        name, path = self.entries[0]
+        chunks = iter_zip(self.entries, compression="stored")
+        head = next(chunks)
+        path.write_text("changed\n", encoding="utf-8")
+        self.assertEqual(self._read(head + b"".join(chunks))[name], "changed\n")
+
+
+class TestArchiveEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        import server
+        self.client = server.app.test_client()
+
+    def test_filter_streams_a_zip_of_matching_themes(self):
+        expected = sorted(p.name for p in ROOT.glob("catppuccin_*.o?t") if ".template." not in p.name)
+        response = self.client.get("/api/themes/archive?filter=catppuccin_*&archive_name=mine&compression=stored")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/zip")
+        self.assertEqual(response.headers["Content-Disposition"], 'attachment; filename="mine.zip"')
+        with zipfile.ZipFile(io.BytesIO(response.get_data())) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(sorted(zf.namelist()), expected)
+            self.assertEqual(zf.read(expected[0]), (ROOT / expected[0]).read_bytes())
+
+    def test_requires_a_selection(self):
+        self.assertEqual(self.client.get("/api/themes/archive").status_code, 400)
+        self.assertEqual(self.client.get("/api/themes/archive?names=missing.ovt").status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
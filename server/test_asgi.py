@@ -0,0 +1,215 @@
+import asyncio
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import asgi
+import server
+from jobs import JobQueue
+
+
+def call(path, method="GET", query=b"", body=b"", leave_after=None):
+    """Drive ``asgi.app`` with one request; returns the messages it sent.
+
+    The client disconnects once ``leave_after`` body messages were sent.
+    """
+    sent = []
+    received = []
+
+    async def receive():
+        if not received:
+            received.append(True)
+            return {"type": "http.request", "body": body, "more_body": False}
+        while leave_after is None or len(sent) <= leave_after:
+            await asyncio.sleep(0.01)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "http_version": "1.1", "method": method, "path": path, "query_string": query,
+             "headers": [], "client": ("127.0.0.1", 1234)}
+    asyncio.run(asgi.app(scope, receive, send))
+    return sent
+
+
+def starts(sent):
+    return [m for m in sent if m["type"] == "http.response.start"]
+
+
+def body(sent):
+    return b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+
+
+class TestRouting(unittest.TestCase):
+
+    def test_native_and_flask_routes(self):
+        self.assertEqual(asgi._match("GET", "/api/themes"), (asgi.api_themes, ()))
+        self.assertEqual(asgi._match("GET", "/api/themes/a%20b.ovt"), (asgi.api_theme_download, ("a b.ovt",)))
+        self.assertEqual(asgi._match("GET", "/api/jobs/0123456789abcdef/events"),
+                         (asgi.api_job_events, ("0123456789abcdef",)))
+        for method, path in (("GET", "/api/themes/archive"), ("GET", "/api/themes/a.ovt/meta"),
+                             ("POST", "/api/themes/a.ovt/duplicate"), ("GET", "/health")):
+            self.assertIsNone(asgi._match(method, path), path)
+
+    def test_native_route_answers(self):
+        sent = call("/api/themes")
+        self.assertEqual([m["status"] for m in starts(sent)], [200])
+        names = [t["name"] for t in json.loads(body(sent))["themes"]]
+        self.assertIn("catppuccin_enhanced_base.obt", names)
+
+    def test_unknown_routes_fall_through_to_flask(self):
+        with mock.patch.object(asgi.app, "fallback", wraps=asgi.app.fallback) as fallback:
+            sent = call("/health")
+        fallback.assert_called_once()
+        self.assertEqual([m["status"] for m in starts(sent)], [200])
+
+    def test_access_log_reports_off_loop_cache_lookups(self):
+        log_access = mock.Mock()
+        with mock.patch.object(asgi, "access_logger", mock.Mock()), \
+                mock.patch.object(asgi, "log_access", log_access), \
+                mock.patch.object(server, "parse_cache", server.ParseCache()):
+            server.invalidate_catalog()
+            call("/api/themes")
+            server.invalidate_catalog()
+            call("/api/validate")
+            call("/api/validate")
+        self.assertEqual([c.args[-1] for c in log_access.call_args_list], [
+            {"catalog": False},
+            {"catalog": False, "parse": False},
+            {"catalog": True, "parse": True},
+        ])
+
+
+class TestErrors(unittest.TestCase):
+
+    def route(self, handler):
+        patcher = mock.patch.dict(asgi.ROUTES, {("GET", "/api/test-error"): handler})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        labels = mock.patch.dict(asgi.ROUTE_LABELS, {handler: "/api/test-error"})
+        labels.start()
+        self.addCleanup(labels.stop)
+        limits = mock.patch.object(server.limiter, "enabled", False)
+        limits.start()
+        self.addCleanup(limits.stop)
+
+    def test_error_before_the_response_is_a_json_500(self):
+        async def failing(request, send):
+            raise RuntimeError("boom")
+
+        self.route(failing)
+        with self.assertLogs("server", "ERROR"):
+            sent = call("/api/test-error")
+        self.assertEqual([m["status"] for m in starts(sent)], [500])
+        self.assertEqual(json.loads(body(sent)), {"error": "Internal server error"})
+
+    def test_errors_map_like_the_flask_routes(self):
+        for error, status, message in ((FileNotFoundError("x.ovt"), 404, "File not found"),
+                                       (PermissionError("x.ovt"), 403, "Permission denied"),
+                                       (server.SecurityError("x"), 403, "Access denied"),
+                                       (ValueError("internal detail"), 500, "Internal server error")):
+            async def failing(request, send, error=error):
+                raise error
+
+            self.route(failing)
+            with self.assertLogs("server"):
+                sent = call("/api/test-error")
+            self.assertEqual([m["status"] for m in starts(sent)], [status], error)
+            self.assertEqual(json.loads(body(sent))["error"], message)
+
+    def test_oversized_body_is_a_413(self):
+        async def reading(request, send):
+            await request.body()
+
+        self.route(reading)
+        with mock.patch.object(asgi.config, "MAX_CONTENT_LENGTH", 10), self.assertLogs("server"):
+            sent = call("/api/test-error", body=b"x" * 11)
+        self.assertEqual([m["status"] for m in starts(sent)], [413])
+
+    def test_error_while_streaming_only_ends_the_body(self):
+        async def failing(request, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"partial", "more_body": True})
+            raise RuntimeError("boom")
+
+        self.route(failing)
+        with self.assertLogs("asgi", "ERROR"):
+            sent = call("/api/test-error")
+        self.assertEqual([m["status"] for m in starts(sent)], [200])
+        self.assertEqual(sent[-1], {"type": "http.response.body", "body": b""})
+        self.assertEqual(body(sent), b"partial")
+
+    def test_error_after_the_response_ended_sends_nothing_more(self):
+        async def failing(request, send):
+            await asgi.send_json(send, {"ok": True})
+            raise RuntimeError("boom")
+
+        self.route(failing)
+        with self.assertLogs("asgi", "ERROR"):
+            sent = call("/api/test-error")
+        self.assertEqual(len(sent), 2)
+
+
+class TestJobEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(self.release.set)
+        self.queue = JobQueue(executor, self.run_script)
+        for patcher in (mock.patch.object(asgi, "generation_jobs", self.queue),
+                        mock.patch.object(server.limiter, "enabled", False)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_script(self, name):
+        self.release.wait(5)
+        return {"script": name, "returncode": 0, "stdout": "", "stderr": ""}
+
+    def events(self, sent):
+        return [frame.split("\n")[0] for frame in body(sent).decode().split("\n\n") if frame]
+
+    def test_streams_pushed_changes_until_done(self):
+        job, _ = self.queue.submit("k", ["a.py", "b.py"])
+        threading.Timer(0.1, self.release.set).start()
+        sent = call(f"/api/jobs/{job['id']}/events")
+        self.assertEqual([m["status"] for m in starts(sent)], [200])
+        events = self.events(sent)
+        self.assertEqual(events[0], "event: job")
+        self.assertEqual(events[-1], "event: done")
+        self.assertEqual(events.count("event: script"), 4)   # running and ok, per script
+        self.assertEqual(self.queue._subscribers, {})
+
+    def test_stops_when_the_client_leaves(self):
+        job, _ = self.queue.submit("k", ["a.py"])
+        sent = call(f"/api/jobs/{job['id']}/events", leave_after=1)
+        self.assertEqual(self.events(sent)[0], "event: job")
+        self.assertNotIn("event: done", self.events(sent))
+        self.assertEqual(self.queue._subscribers, {})
+        self.assertEqual(self.queue.get(job["id"])["state"], "running")
+
+    def generate(self, timeout):
+        with mock.patch.object(asgi, "generation_plan", lambda force: ("a.py",)), \
+                mock.patch.object(asgi, "generation_wait_timeout", lambda scripts: timeout), \
+                mock.patch.object(asgi, "find_theme_files_async", mock.AsyncMock(return_value=[])):
+            sent = call("/api/generate", method="POST", query=b"wait=1")
+        return starts(sent)[0]["status"], json.loads(body(sent))
+
+    def test_wait_answers_202_once_the_timeout_passes(self):
+        status, answer = self.generate(0.1)
+        self.assertEqual(status, 202)
+        self.assertEqual(answer["job"]["state"], "running")
+        self.assertEqual(answer["status_url"], f"/api/jobs/{answer['job']['id']}")
+        self.assertEqual(self.queue._subscribers, {})
+        self.release.set()
+        status, answer = self.generate(5)
+        self.assertEqual(status, 200)
+        self.assertEqual([r["status"] for r in answer["results"]], ["ok"])
+
+
+if __name__ == "__main__":
+    unittest.main()
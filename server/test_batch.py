@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from batch import FAILED, UNCHANGED, WRITTEN, load_manifest, run_batch
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "t.template.ovt").write_text("--base: {base};\n--text: {text};\n")
+        (self.root / "night.json").write_text(json.dumps({"base": "#000000", "text": "#ffffff"}))
+        self.manifest = self.root / "manifest.json"
+        self.manifest.write_text(json.dumps({"items": [
+            {"template": "t.template.ovt", "palette": "night.json", "output": "out/night.ovt"},
+            {"template": "t.template.ovt", "palette": {"base": "#ffffff", "text": "#000000"}, "output": "out/day.ovt"},
+        ]}))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_renders_then_skips_unchanged_outputs(self):
+        summary = run_batch(load_manifest(self.manifest))
+        self.assertEqual((summary["total"], summary[WRITTEN]), (2, 2))
+        night = self.root / "out" / "night.ovt"
+        self.assertEqual(night.read_text(), "--base: #000000;\n--text: #ffffff;\n")
+        self.assertIn("render_ms", summary["items"][0])
+
+        os.utime(night, ns=(0, 0))
+        with ThreadPoolExecutor(2) as pool:
+            summary = run_batch(load_manifest(self.manifest), pool)
+        self.assertEqual(summary[UNCHANGED], 2)
+        self.assertEqual(night.stat().st_mtime_ns, 0)
+
+    def test_failed_items_do_not_stop_the_batch(self):
+        items = load_manifest(self.manifest, out_dir=self.root / "elsewhere")
+        items[0].palette.pop("text")
+        summary = run_batch(items)
+        self.assertEqual((summary[FAILED], summary[WRITTEN]), (1, 1))
+        self.assertIn("text", summary["items"][0]["error"])
+        self.assertTrue((self.root / "elsewhere" / "out" / "day.ovt").exists())
+
+    def test_rejects_duplicate_outputs(self):
+        items = load_manifest(self.manifest)
+        with self.assertRaises(ValueError):
+            run_batch(items + items[:1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from blobstore import BlobStore
+from generators import load_script
+from themefile import FileLocks, ParseCache, write_meta
+
+ROOT = Path(__file__).resolve().parent.parent
+
+THEME = """@OBSThemeMeta {
+    name: 'Blob';
+    id: 'com.example.blob';
+    dark: 'true';
+}
+@OBSThemeVars {
+    --base: #000000;
+}
+"""
+
+
+class TestBlobStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.store = BlobStore(self.root / ".theme-blobs")
+        self.src = self.root / "a.ovt"
+        self.src.write_text(THEME, encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_duplicate_is_a_reference(self):
+        """Duplicates share one inode with the blob; nothing is copied."""
+        dst = self.root / "b.ovt"
+        digest = self.store.duplicate(self.src, dst)
+        blob = self.store.blob_path(digest)
+        self.assertEqual(os.stat(blob).st_ino, os.stat(dst).st_ino)
+        self.assertEqual(os.stat(blob).st_nlink, 3)
+        self.assertEqual(self.store.digest_for(os.stat(dst)), digest)
+        with self.assertRaises(FileExistsError):
+            self.store.duplicate(self.src, dst)
+
+    def test_regenerating_the_source_leaves_duplicates_alone(self):
+        """Generator scripts replace their output, so linked copies keep the old body."""
+        src = self.root / "dracula_theme.ovt"
+        src.write_text(THEME, encoding="utf-8")
+        dst = self.root / "copy.ovt"
+        digest = self.store.duplicate(src, dst)
+
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        try:
+            load_script(ROOT, "script_4.py").main()
+        finally:
+            os.chdir(cwd)
+
+        self.assertIn("--background: #282a36;", src.read_text(encoding="utf-8"))
+        self.assertEqual(dst.read_text(encoding="utf-8"), THEME)
+        self.assertEqual(self.store.blob_path(digest).read_text(encoding="utf-8"), THEME)
+
+    def test_parse_cache_shares_entry_and_edit_breaks_link(self):
+        """Linked duplicates hit one cache entry; a meta edit gives the file its own body."""
+        dst = self.root / "b.ovt"
+        self.store.duplicate(self.src, dst)
+        cache = ParseCache()
+        first = cache.get(self.src)
+        self.assertIs(cache.get(dst), first)
+
+        write_meta(dst, {"name": "Copy", "id": "com.example.copy", "dark": "true"}, cache, FileLocks())
+        self.assertEqual(self.src.read_text(encoding="utf-8"), THEME)
+        self.assertIsNone(self.store.digest_for(os.stat(dst)))
+
+    def test_release_drops_unreferenced_blob(self):
+        digest = self.store.ingest(self.src)
+        st = os.stat(self.src)
+        self.src.unlink()
+        self.assertTrue(self.store.release(st))
+        self.assertFalse(self.store.blob_path(digest).exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import generators
+from buildgraph import BuildGraph
+from generators import Generator, run_generator
+
+
+class TestBuildGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "gen.py").write_text(
+            "from pathlib import Path\n"
+            "def render_theme():\n"
+            "    return (Path(__file__).parent / 'palette.txt').read_text()\n"
+        )
+        (self.root / "palette.txt").write_text("one")
+        patcher = mock.patch.dict(generators.GENERATORS, {
+            "gen.py": Generator("gen.py", "render_theme", "out.ovt", ("palette.txt",)),
+            "none.py": Generator("none.py", None, None),
+        })
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.graph = BuildGraph(self.root / ".build-manifest.json", self.root, self.root)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, graph=None):
+        graph = graph or self.graph
+        inputs = graph.inputs("gen.py")
+        result = run_generator("gen.py", self.root, self.root)
+        graph.record("gen.py", inputs, result["outputs"])
+
+    def test_fresh_after_build_and_across_instances(self):
+        self.assertEqual(self.graph.stale(["gen.py", "none.py", "unknown.py"]), ["gen.py", "unknown.py"])
+        self.build()
+        self.assertEqual(self.graph.stale(["gen.py", "none.py"]), [])
+        other = BuildGraph(self.root / ".build-manifest.json", self.root, self.root)
+        self.assertEqual(other.stale(["gen.py"]), [])
+
+    def test_changed_inputs_make_the_output_stale(self):
+        self.build()
+        (self.root / "palette.txt").write_text("two, longer")
+        self.assertEqual(self.graph.stale(["gen.py"]), ["gen.py"])
+        self.build()
+        self.assertEqual((self.root / "out.ovt").read_text(), "two, longer")
+        self.assertEqual(self.graph.stale(["gen.py"]), [])
+
+        with mock.patch("buildgraph.GENERATOR_VERSION", generators.GENERATOR_VERSION + 1):
+            self.assertEqual(self.graph.stale(["gen.py"]), ["gen.py"])
+
+    def test_switching_on_an_output_option_makes_the_output_stale(self):
+        self.build()
+        off = BuildGraph(self.root / ".build-manifest.json", self.root, self.root, options={"minify": False})
+        self.assertEqual(off.stale(["gen.py"]), [])
+        on = BuildGraph(self.root / ".build-manifest.json", self.root, self.root, options={"minify": True})
+        self.assertEqual(on.stale(["gen.py"]), ["gen.py"])
+
+    def test_deleted_or_edited_outputs_are_rebuilt(self):
+        self.build()
+        (self.root / "out.ovt").unlink()
+        self.assertEqual(self.graph.stale(["gen.py"]), ["gen.py"])
+        self.build()
+        (self.root / "out.ovt").write_text("edited by hand")
+        self.assertEqual(self.graph.stale(["gen.py"]), ["gen.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()
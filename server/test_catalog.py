@@ -0,0 +1,55 @@
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from catalog import is_safe_relative_path, scan_themes, shard_path
+from config import Config
+
+
+class TestCatalogScan(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        for rel in ("top.ovt", "notes.txt", "ab/one.ovt", "ab/cd/two.obt",
+                    "ef/three.json", ".blobs/aa/hidden.ovt", "node_modules/x.ovt"):
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x", encoding="utf-8")
+        self.root = root
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_depth_limits_and_skips(self):
+        flat = [e["path"] for e in scan_themes(self.root)]
+        self.assertEqual(flat, ["top.ovt"])
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            nested = [e["path"] for e in scan_themes(self.root, max_depth=2, executor=pool)]
+        self.assertEqual(nested, ["ab/cd/two.obt", "ab/one.ovt", "ef/three.json", "top.ovt"])
+        one_level = [e["path"] for e in scan_themes(self.root, max_depth=1)]
+        self.assertNotIn("ab/cd/two.obt", one_level)
+
+    def test_safe_relative_paths(self):
+        self.assertTrue(is_safe_relative_path("a.ovt"))
+        self.assertFalse(is_safe_relative_path("ab/a.ovt"))
+        self.assertTrue(is_safe_relative_path("ab/a.ovt", max_depth=1))
+        for bad in ("/etc/a.ovt", "ab/../a.ovt", "ab//a.ovt", ".blobs/a.ovt",
+                    "ab\\a.ovt", "ab/a.txt", "ab/"):
+            self.assertFalse(is_safe_relative_path(bad, max_depth=3), bad)
+        self.assertTrue(is_safe_relative_path(shard_path("mine.ovt", 2), max_depth=2))
+
+
+class TestThemesConfig(unittest.TestCase):
+
+    def test_nested_scans_need_a_themes_dir(self):
+        for themes_dir in ("", "."):
+            with self.assertRaises(ValueError):
+                Config(THEMES_DIR=themes_dir, THEMES_MAX_DEPTH=1)
+        self.assertEqual(Config(THEMES_DIR="themes", THEMES_MAX_DEPTH=2).THEMES_MAX_DEPTH, 2)
+        self.assertEqual(Config(THEMES_DIR="", THEMES_MAX_DEPTH=0).THEMES_MAX_DEPTH, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from flavors import load_flavors
+from generators import load_script
+
+ROOT = Path(__file__).resolve().parent.parent
+FLAVORS_FILE = ROOT / "palettes" / "catppuccin_flavors.json"
+
+
+class TestFlavors(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def table(self, rows):
+        path = Path(self.tmp.name) / "extra.json"
+        path.write_text(json.dumps(rows))
+        return path
+
+    def test_repository_table_has_the_four_flavors(self):
+        flavors = load_flavors(FLAVORS_FILE)
+        self.assertEqual(list(flavors), ["latte", "frappe", "macchiato", "mocha"])
+        self.assertFalse(flavors["latte"].dark)
+        self.assertEqual(flavors["mocha"].palette["base"], "#1e1e2e")
+
+    def test_user_flavors_inherit_and_override(self):
+        extra = self.table({"midnight": {"label": "Midnight", "inherits": "mocha", "palette": {"base": "#000000"}}})
+        midnight = load_flavors(FLAVORS_FILE, extra)["midnight"]
+        self.assertTrue(midnight.dark)
+        self.assertEqual(midnight.palette["base"], "#000000")
+        self.assertEqual(midnight.palette["mauve"], "#cba6f7")
+        self.assertEqual(midnight.theme_id, "com.catppuccin.enhanced.midnight")
+
+    def test_incomplete_or_cyclic_flavors_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "missing colors"):
+            load_flavors(self.table({"half": {"palette": {"base": "#000000"}}}))
+        with self.assertRaisesRegex(ValueError, "inherits from itself"):
+            load_flavors(self.table({"a": {"inherits": "b"}, "b": {"inherits": "a"}}))
+
+    def test_one_pass_renders_every_flavor_in_both_modes(self):
+        script_1 = load_script(ROOT, "script_1.py")
+        extra = self.table({"midnight": {"inherits": "mocha", "palette": {"base": "#000000"}}})
+        full = script_1.render_flavors("full", [extra])
+        thin = script_1.render_flavors("override", [extra])
+        self.assertEqual(list(full), list(thin))
+        self.assertEqual(len(full), 5)
+        midnight = thin["catppuccin_enhanced_midnight.ovt"]
+        self.assertIn("extends: 'com.catppuccin.enhanced.base';", midnight)
+        self.assertIn("--base: #000000;", midnight)
+        self.assertLess(len(midnight), len(full["catppuccin_enhanced_midnight.ovt"]) // 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
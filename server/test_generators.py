@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+import generators
+from generators import Generator, load_script, run_generator
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestRepositoryGenerators(unittest.TestCase):
+
+    def test_scripts_render_without_side_effects(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cwd = os.getcwd()
+            os.chdir(tmp)
+            try:
+                flavors = generators.render(ROOT, "script_1.py")
+                base = generators.render(ROOT, "script_3.py", palette={"base": "#000000"})
+                dracula = generators.render(ROOT, "script_4.py")
+            finally:
+                os.chdir(cwd)
+            self.assertEqual(os.listdir(tmp), [])
+        self.assertEqual(sorted(flavors), [f"catppuccin_enhanced_{f}.ovt"
+                                           for f in ("frappe", "latte", "macchiato", "mocha")])
+        self.assertIn("id: 'com.catppuccin.enhanced.mocha';", flavors["catppuccin_enhanced_mocha.ovt"])
+        self.assertIn("    --base: #000000;", base)
+        self.assertIn("--background: #282a36;", dracula)
+
+    def test_script_1_accepts_a_palette(self):
+        module = load_script(ROOT, "script_1.py")
+        palette = dict(module.catppuccin_mocha, mauve="#123456")
+        text = module.render_theme(palette, name="Custom", theme_id="com.example.custom")
+        self.assertIn("--mauve: #123456;", text)
+        self.assertIn("name: 'Custom';", text)
+
+
+class TestRunGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.script = self.root / "gen.py"
+        self.script.write_text("def render_theme():\n    return 'one'\n")
+        patcher = mock.patch.dict(generators.GENERATORS, {"gen.py": Generator("gen.py", "render_theme", "out.ovt")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_output_and_skips_unchanged(self):
+        result = run_generator("gen.py", self.root, self.root)
+        self.assertEqual(result["returncode"], 0)
+        out = self.root / "out.ovt"
+        self.assertEqual(out.read_text(), "one")
+        mtime = out.stat().st_mtime_ns
+        self.assertTrue(run_generator("gen.py", self.root, self.root)["stdout"].startswith("Unchanged"))
+        self.assertEqual(out.stat().st_mtime_ns, mtime)
+
+    def test_minify_compacts_the_output(self):
+        self.script.write_text("def render_theme():\n    return '/* banner */\\nQWidget {\\n    color: red;\\n}\\n'\n")
+        result = run_generator("gen.py", self.root, self.root, minify=True)
+        self.assertEqual((self.root / "out.ovt").read_text(), "QWidget{color:red}\n")
+        self.assertIn("bytes)", result["stdout"])
+
+    def test_reloads_changed_script(self):
+        run_generator("gen.py", self.root, self.root)
+        self.script.write_text("def render_theme():\n    return 'two, longer'\n")
+        run_generator("gen.py", self.root, self.root)
+        self.assertEqual((self.root / "out.ovt").read_text(), "two, longer")
+
+    def test_render_on_a_pool_gives_up_after_the_timeout(self):
+        self.script.write_text("import threading\nrelease = threading.Event()\n"
+                               "def render_theme():\n    release.wait(5)\n    return 'late'\n")
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            result = run_generator("gen.py", self.root, self.root, pool=pool, timeout=0.05)
+            load_script(self.root, "gen.py").release.set()
+        self.assertEqual(result, {"script": "gen.py", "status": "timeout"})
+        self.assertFalse((self.root / "out.ovt").exists())
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            self.assertEqual(run_generator("gen.py", self.root, self.root, pool=pool, timeout=5)["returncode"], 0)
+        self.assertEqual((self.root / "out.ovt").read_text(), "late")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent
+
+
+def loaded_modules(module: str, candidates) -> set:
+    code = (
+        f"import sys; sys.path.insert(0, {str(SERVER_DIR)!r}); import {module}; "
+        f"print(','.join(m for m in {list(candidates)!r} if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=SERVER_DIR, capture_output=True,
+                         text=True, check=True, env=dict(os.environ, ACCESS_LOG="")).stdout.strip()
+    return set(filter(None, out.split(",")))
+
+
+class TestLazyImports(unittest.TestCase):
+
+    def test_validator_cli_does_not_import_flask(self):
+        self.assertEqual(loaded_modules("validate_cli", ["flask", "google.generativeai", "bleach"]), set())
+
+    def test_server_defers_optional_dependencies(self):
+        self.assertEqual(loaded_modules("server", ["google.generativeai", "bleach"]), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+from jobs import DONE, JobQueue
+from shared_cache import SharedStore
+
+
+class JobQueueCase(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=3)
+        self.release = threading.Event()
+        self.calls = []
+        self.finished = []
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.shutdown(wait=True)
+
+    def run_script(self, name):
+        self.calls.append(name)
+        self.release.wait(5)
+        if name == "bad.py":
+            return {"script": name, "status": "timeout"}
+        return {"script": name, "returncode": 0, "stdout": "out", "stderr": ""}
+
+    def _queue(self, shared=None):
+        return JobQueue(self.executor, self.run_script, on_done=self.finished.append, shared=shared)
+
+
+class TestJobQueue(JobQueueCase):
+
+    def test_job_reports_per_script_status(self):
+        queue = self._queue()
+        job, coalesced = queue.submit("k", ["a.py", "bad.py"])
+        self.assertFalse(coalesced)
+        self.assertEqual(queue.get(job["id"])["state"], "running")
+        self.release.set()
+        final = queue.wait(job["id"], timeout=5)
+        self.assertEqual(final["state"], DONE)
+        scripts = {s["script"]: s for s in final["scripts"]}
+        self.assertEqual(scripts["a.py"]["status"], "ok")
+        self.assertEqual(scripts["bad.py"]["status"], "timeout")
+        self.assertIn("duration", scripts["a.py"])
+        self.assertEqual(len(self.finished), 1)
+
+    def test_identical_inflight_requests_coalesce(self):
+        queue = self._queue()
+        first, _ = queue.submit("k", ["a.py"])
+        second, coalesced = queue.submit("k", ["a.py"])
+        self.assertTrue(coalesced)
+        self.assertEqual(first["id"], second["id"])
+        self.assertEqual(queue.get(first["id"])["requests"], 2)
+        self.release.set()
+        queue.wait(first["id"], timeout=5)
+        self.assertEqual(self.calls, ["a.py"])
+        third, coalesced = queue.submit("k", ["a.py"])
+        self.assertFalse(coalesced)
+        self.assertNotEqual(third["id"], first["id"])
+
+    def test_watch_yields_each_change_until_done(self):
+        queue = self._queue()
+        job, _ = queue.submit("k", ["a.py", "b.py"])
+        seen = []
+        for snapshot in queue.watch(job["id"], heartbeat=5):
+            seen.append(snapshot)
+            if len(seen) == 1:
+                self.release.set()
+        self.assertEqual(seen[0]["state"], "running")
+        self.assertEqual(seen[-1]["state"], DONE)
+        self.assertEqual({s["status"] for s in seen[-1]["scripts"]}, {"ok"})
+        self.assertEqual(list(queue.watch("0" * 16)), [])
+
+    def test_jobs_are_shared_between_queues(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SharedStore(Path(tmp) / "shared.sqlite3")
+            worker_a, worker_b = self._queue(store), self._queue(store)
+            job, _ = worker_a.submit("k", ["a.py"])
+            joined, coalesced = worker_b.submit("k", ["a.py"])
+            self.assertTrue(coalesced)
+            self.assertEqual(joined["id"], job["id"])
+            self.assertEqual(joined["requests"], 2)
+            worker_a.submit("k", ["a.py"])
+            self.assertEqual(worker_a.get(job["id"])["requests"], 3)
+            self.assertEqual(worker_b.get(job["id"])["requests"], 3)
+            self.release.set()
+            final = worker_b.wait(job["id"], timeout=5, poll=0.01)
+            self.assertEqual(final["state"], DONE)
+            self.assertEqual(self.calls, ["a.py"])
+
+
+class TestJobEndpoints(JobQueueCase):
+
+    def test_generate_returns_a_job_to_poll(self):
+        import server
+        queue = self._queue()
+        client = server.app.test_client()
+        with mock.patch.object(server, "generation_jobs", queue), \
+                mock.patch.object(server.limiter, "enabled", False):
+            response = client.post("/api/generate?force=1")
+            self.assertEqual(response.status_code, 202)
+            body = response.get_json()
+            self.assertFalse(body["coalesced"])
+            job_id = body["job"]["id"]
+            self.assertEqual(body["status_url"], f"/api/jobs/{job_id}")
+            self.assertTrue(client.post("/api/generate?force=1").get_json()["coalesced"])
+
+            job = client.get(body["status_url"]).get_json()
+            self.assertEqual((job["state"], job["requests"]), ("running", 2))
+            self.assertEqual([s["script"] for s in job["scripts"]], list(server.GENERATE_SCRIPTS))
+            self.release.set()
+            queue.wait(job_id, timeout=5)
+            job = client.get(body["status_url"]).get_json()
+            self.assertEqual(job["state"], DONE)
+            self.assertEqual({s["status"] for s in job["scripts"]}, {"ok"})
+
+            self.assertEqual(client.get("/api/jobs/not-a-job").status_code, 400)
+            self.assertEqual(client.get("/api/jobs/" + "0" * 16).status_code, 404)
+
+    def test_wait_gives_up_with_a_202(self):
+        import server
+        queue = self._queue()
+        client = server.app.test_client()
+        with mock.patch.object(server, "generation_jobs", queue), \
+                mock.patch.object(server, "generation_wait_timeout", lambda scripts: 0.1), \
+                mock.patch.object(server.limiter, "enabled", False):
+            response = client.post("/api/generate?force=1&wait=1")
+        self.assertEqual(response.status_code, 202)
+        body = response.get_json()
+        self.assertEqual(body["job"]["state"], "running")
+        self.assertEqual(body["status_url"], f"/api/jobs/{body['job']['id']}")
+
+
+if __name__ == "__main__":
+    unittest.main()
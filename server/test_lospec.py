@@ -0,0 +1,114 @@
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from lospec import LospecProvider, Palette, PaletteNotFound, PaletteUnavailable, write_mirror
+
+PALETTES = {
+    "two-tone": {"name": "Two Tone", "author": "", "colors": ["222323", "F0F6F0"]},
+    "flaky": {"name": "Flaky", "colors": ["000000", "ffffff", "ff0000"]},
+}
+
+
+class LospecStandIn(BaseHTTPRequestHandler):
+    hits = []
+    fail_next = set()
+
+    def do_GET(self):
+        slug = self.path.rsplit("/", 1)[-1][:-len(".json")]
+        self.hits.append((slug, self.headers.get("If-None-Match")))
+        if slug in self.fail_next:
+            self.fail_next.discard(slug)
+            return self.reply(503, b"")
+        if slug not in PALETTES:
+            return self.reply(404, b"")
+        etag = f'"{slug}-v1"'
+        if self.headers.get("If-None-Match") == etag:
+            return self.reply(304, b"", etag)
+        self.reply(200, json.dumps(PALETTES[slug]).encode(), etag)
+
+    def reply(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestLospecProvider(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), LospecStandIn)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/palette-list/{{slug}}.json"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.now = 1000.0
+        LospecStandIn.hits.clear()
+
+    def provider(self, url=None, **kwargs):
+        provider = LospecProvider(cache_dir=Path(self.tmp.name) / "cache", url=url or self.url,
+                                  ttl=60, timeout=2, clock=lambda: self.now, **kwargs)
+        self.addCleanup(provider.close)
+        return provider
+
+    def test_cache_ttl_and_etag_revalidation(self):
+        provider = self.provider()
+        first = provider.get("two-tone")
+        self.assertEqual(first, Palette("two-tone", "Two Tone", ("#222323", "#f0f6f0"), "network"))
+        self.assertEqual(provider.get("two-tone").source, "cache")
+        # A new provider (another process) reads the same on-disk cache.
+        self.assertEqual(self.provider().get("two-tone").source, "cache")
+        self.assertEqual(len(LospecStandIn.hits), 1)
+
+        self.now += 61
+        self.assertEqual(provider.get("two-tone").source, "revalidated")
+        self.assertEqual(LospecStandIn.hits[-1], ("two-tone", '"two-tone-v1"'))
+        self.assertEqual(provider.get("two-tone").source, "cache")
+        self.assertEqual(len(LospecStandIn.hits), 2)
+
+    def test_get_many_retries_and_reports_failures(self):
+        LospecStandIn.fail_next.add("flaky")
+        results = self.provider(max_workers=4).get_many(["two-tone", "flaky", "missing", "Bad/Slug", "two-tone"])
+        self.assertEqual(list(results), ["two-tone", "flaky", "missing", "Bad/Slug"])
+        self.assertEqual(results["two-tone"].colors, ("#222323", "#f0f6f0"))
+        self.assertEqual(results["flaky"].title, "Flaky")
+        self.assertIsInstance(results["missing"], PaletteNotFound)
+        self.assertIsInstance(results["Bad/Slug"], ValueError)
+
+    def test_offline_and_unreachable_fall_back_to_cache_then_mirror(self):
+        mirror = Path(self.tmp.name) / "mirror"
+        write_mirror([Palette("mirrored", "Mirrored", ("#123456",), "network")], mirror)
+        self.provider().get("two-tone")
+        self.now += 3600
+        hits = len(LospecStandIn.hits)
+
+        offline = self.provider(mirror_dir=mirror, offline=True)
+        self.assertEqual(offline.get("two-tone").source, "stale")
+        self.assertEqual(offline.get("mirrored"), Palette("mirrored", "Mirrored", ("#123456",), "mirror"))
+        with self.assertRaises(PaletteUnavailable):
+            offline.get("flaky")
+        self.assertEqual(len(LospecStandIn.hits), hits)
+
+        unreachable = self.provider("http://127.0.0.1:9/{slug}.json", mirror_dir=mirror, retries=0)
+        self.assertEqual(unreachable.get("two-tone").source, "stale")
+        self.assertEqual(unreachable.get("mirrored").source, "mirror")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import re
+import threading
+import unittest
+
+from metrics import Counter, CountingThreadPool, Histogram, Registry
+
+
+def sample(text: str, name: str, labels: str) -> float:
+    match = re.search(rf"^{re.escape(name + '{' + labels + '}')} (\S+)$", text, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+class TestMetrics(unittest.TestCase):
+
+    def test_histogram_buckets_are_cumulative(self):
+        h = Histogram("t_seconds", "help", ("route",), buckets=(0.1, 1.0))
+        for v in (0.05, 0.1, 0.5, 2.0):
+            h.observe(v, "/a")
+        lines = h.render()
+        self.assertIn('t_seconds_bucket{route="/a",le="0.1"} 2', lines)
+        self.assertIn('t_seconds_bucket{route="/a",le="1"} 3', lines)
+        self.assertIn('t_seconds_bucket{route="/a",le="+Inf"} 4', lines)
+        self.assertIn('t_seconds_count{route="/a"} 4', lines)
+        self.assertIn('t_seconds_sum{route="/a"} 2.65', lines)
+
+    def test_registry_renders_help_type_and_escaped_labels(self):
+        registry = Registry()
+        c = registry.register(Counter("t_total", "Things.", ("name",)))
+        c.inc('a"b')
+        c.inc('a"b', amount=2)
+        text = registry.render()
+        self.assertIn("# HELP t_total Things.\n# TYPE t_total counter\n", text)
+        self.assertIn('t_total{name="a\\"b"} 3\n', text)
+        with self.assertRaises(ValueError):
+            registry.register(Counter("t_total", "again"))
+
+    def test_counting_pool_tracks_queued_and_finished_tasks(self):
+        release = threading.Event()
+        with CountingThreadPool(max_workers=1) as pool:
+            futures = [pool.submit(release.wait, 5) for _ in range(3)]
+            while pool.counts()[1] < 1:
+                release.wait(0.01)
+            self.assertEqual(pool.counts(), (3, 1, 0))
+            release.set()
+            for f in futures:
+                f.result()
+            self.assertEqual(pool.counts(), (3, 3, 3))
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+
+    def setUp(self):
+        import server
+        self.server = server
+        # A fresh address so other tests' requests don't count against it.
+        self.client = server.app.test_client()
+        self.client.environ_base["REMOTE_ADDR"] = "198.51.100.32"
+
+    def scrape(self) -> str:
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        return response.get_data(as_text=True)
+
+    def test_scrapes_are_not_rate_limited(self):
+        if not self.server.limiter.enabled:
+            self.skipTest("rate limiting disabled")
+        for _ in range(60):
+            self.scrape()
+        # Whereas a limited route (30 per minute) starts answering 429.
+        statuses = {self.client.get("/api/jobs/x/events").status_code for _ in range(31)}
+        self.assertEqual(statuses, {400, 429})
+        rejected = sample(self.scrape(), "obs_styla_ratelimit_rejections_total",
+                          'route="/api/jobs/<job_id>/events"')
+        self.assertGreaterEqual(rejected, 1)
+
+    def test_requests_are_counted(self):
+        labels = 'route="/api/themes",method="GET",status="200"'
+        before = sample(self.scrape(), "obs_styla_http_requests_total", labels)
+        self.assertEqual(self.client.get("/api/themes").status_code, 200)
+        text = self.scrape()
+        self.assertEqual(sample(text, "obs_styla_http_requests_total", labels), before + 1)
+        self.assertGreater(sample(text, "obs_styla_http_request_seconds_count", 'route="/api/themes",method="GET"'), 0)
+        self.assertIn('obs_styla_executor_queue_depth{pool="file_io"}', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
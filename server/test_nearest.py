@@ -0,0 +1,40 @@
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from colorspace import hex_to_oklab, srgb_to_hex
+from flavors import load_flavors
+from nearest import NearestColors, closest_colors
+
+MOCHA = load_flavors(Path(__file__).resolve().parent.parent / "palettes" / "catppuccin_flavors.json")["mocha"].palette
+
+
+class TestNearestColors(unittest.TestCase):
+
+    def test_tree_matches_distance_matrix(self):
+        rng = np.random.default_rng(0)
+        for size in (1, 5, 17, 300):
+            palette = srgb_to_hex(rng.random((size, 3)))
+            queries = srgb_to_hex(rng.random((200, 3)))
+            dist, idx = NearestColors(palette, brute_force_max=0).query(queries)
+            want = np.linalg.norm(hex_to_oklab(queries)[:, None] - hex_to_oklab(palette)[None], axis=2)
+            np.testing.assert_allclose(dist, want.min(axis=1))
+            np.testing.assert_allclose(want[np.arange(len(queries)), idx], want.min(axis=1))
+            np.testing.assert_allclose(NearestColors(palette).query(queries)[0], dist)
+
+    def test_roles_fall_back_to_their_closest_reference(self):
+        palette = ["#1e1e2e", "#cdd6f4", "#f38ba8", "#a6e3a1", "#89b4fa", "transparent", None]
+        roles = ["base", "text", "maroon", "teal", "lavender"]
+        got = closest_colors(palette, [MOCHA[r] for r in roles])
+        self.assertEqual(got, ["#1e1e2e", "#cdd6f4", "#f38ba8", "#a6e3a1", "#89b4fa"])
+
+    def test_empty_palette_uses_fallback(self):
+        self.assertEqual(closest_colors(["not a color"], ["#ffffff", "#000000"], "#888888"), ["#888888"] * 2)
+        self.assertEqual(len(NearestColors([])), 0)
+        with self.assertRaises(ValueError):
+            NearestColors([]).query(["#ffffff"])
+
+
+if __name__ == "__main__":
+    unittest.main()
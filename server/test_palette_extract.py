@@ -0,0 +1,41 @@
+import unittest
+
+from palette_extract import color_weights, extract_palette, normalize_color
+
+
+class TestPaletteExtract(unittest.TestCase):
+
+    def test_normalize_and_weigh_colors(self):
+        self.assertEqual(normalize_color(" #ABC "), ("#aabbcc", 1.0))
+        self.assertEqual(normalize_color("#11223380"), ("#112233", 128 / 255))
+        with self.assertRaises(ValueError):
+            normalize_color("red")
+        theme = {
+            "colors": {"editor.background": "#1e1e2e", "editor.lineHighlight": "#1E1E2E80",
+                       "widget.shadow": "#00000000", "contrastBorder": "transparent"},
+            "tokenColors": [{"scope": ["comment", "string"], "settings": {"foreground": "#a6e3a1"}},
+                            {"scope": "keyword, storage", "settings": {"foreground": "#cba6f7"}},
+                            {"settings": {"background": "#1e1e2e"}}],
+            "semanticTokenColors": {"variable": {"foreground": "#cdd6f4"}, "parameter": "#cdd6f4"},
+        }
+        weights = color_weights(theme)
+        self.assertEqual(set(weights), {"#1e1e2e", "#a6e3a1", "#cba6f7", "#cdd6f4"})
+        self.assertAlmostEqual(weights["#1e1e2e"], 2 + 128 / 255)
+        self.assertEqual((weights["#a6e3a1"], weights["#cba6f7"], weights["#cdd6f4"]), (2.0, 2.0, 2.0))
+
+    def test_clusters_keep_one_real_color_per_group(self):
+        groups = ["#1e1e2e", "#cdd6f4", "#f38ba8", "#a6e3a1", "#89b4fa"]
+        colors, group_of = {}, {}
+        for g, base in enumerate(groups):
+            r, gr, b = (int(base[i:i + 2], 16) for i in (1, 3, 5))
+            for k in range(10 - g):  # the first group is used most
+                colors[f"{g}.{k}"] = color = f"#{min(r + k, 255):02x}{gr:02x}{b:02x}"
+                group_of[color] = g
+        palette = extract_palette({"colors": colors}, size=5)
+        self.assertEqual([group_of[c] for c in palette], [0, 1, 2, 3, 4])
+        self.assertEqual(extract_palette({"colors": colors}, size=5), palette)
+        self.assertEqual(extract_palette({"colors": {"a": "#000", "b": "#fff", "c": "#ffffff"}}), ["#ffffff", "#000000"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import itertools
+import random
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from colorspace import hex_to_oklab, oklab_to_srgb, srgb_to_hex
+from flavors import load_flavors
+from nearest import closest_colors
+from palette_match import ACCENT_ROLES, DARK_ROLES, LIGHT_ROLES, ROLES, assign_palette, linear_sum_assignment
+
+FLAVORS = load_flavors(Path(__file__).resolve().parent.parent / "palettes" / "catppuccin_flavors.json")
+GREYS = ["#000000", "#111111", "#222222", "#333333", "#444444",
+         "#eeeeee", "#f0f0f0", "#f4f4f4", "#f8f8f8", "#fcfcfc", "#ffffff"]
+
+
+class TestLinearSumAssignment(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            n, m = int(rng.integers(1, 5)), int(rng.integers(1, 6))
+            cost = rng.integers(0, 4, (n, m)).astype(float)
+            rows, cols = linear_sum_assignment(cost)
+            self.assertEqual(len(set(rows)), min(n, m))
+            self.assertEqual(len(set(cols)), min(n, m))
+            if n <= m:
+                best = min(sum(cost[i, p[i]] for i in range(n)) for p in itertools.permutations(range(m), n))
+            else:
+                best = min(sum(cost[p[j], j] for j in range(m)) for p in itertools.permutations(range(n), m))
+            self.assertAlmostEqual(cost[rows, cols].sum(), best)
+
+
+class TestAssignPalette(unittest.TestCase):
+
+    def test_oklab_round_trip(self):
+        colors = ["#ffffff", "#000000", "#1e1e2e", "#f38ba8"]
+        self.assertEqual(srgb_to_hex(oklab_to_srgb(hex_to_oklab(colors))), colors)
+
+    def test_recovers_a_dark_flavor_from_shuffled_colors(self):
+        reference = FLAVORS["mocha"].palette
+        for flavor in ("mocha", "frappe"):
+            palette = FLAVORS[flavor].palette
+            colors = [palette[r] for r in ACCENT_ROLES] + GREYS
+            random.Random(1).shuffle(colors)
+            mapping = assign_palette(colors, reference)
+            self.assertEqual({r: mapping[r] for r in ACCENT_ROLES}, {r: palette[r] for r in ACCENT_ROLES})
+            self.assertEqual(mapping["base"], "#000000")
+            self.assertEqual(mapping["text"], "#ffffff")
+
+    def test_light_themes_put_backgrounds_on_the_lightest_colors(self):
+        palette = FLAVORS["latte"].palette
+        colors = [palette[r] for r in ACCENT_ROLES] + ["#555555", "#f0f0f0"] + GREYS[:5] + GREYS[-5:]
+        mapping = assign_palette(colors, palette, dark=False)
+        self.assertEqual(mapping["base"], "#ffffff")
+        self.assertEqual(mapping["text"], "#000000")
+        self.assertEqual(mapping["red"], palette["red"])
+
+    def test_small_palettes_fill_every_role(self):
+        mapping = assign_palette(["#FF0000", "#00ff00", "#ff0000"], FLAVORS["mocha"].palette)
+        self.assertEqual(list(mapping), list(ROLES))
+        self.assertEqual(mapping["red"], "#ff0000")
+        self.assertEqual(mapping["green"], "#00ff00")
+        self.assertEqual(assign_palette([], FLAVORS["mocha"].palette), {})
+
+    def test_leftover_roles_take_the_nearest_color(self):
+        palette = ["#f38ba8", "#89b4fa", "#1e1e2e"]
+        reference = FLAVORS["mocha"].palette
+        mapping = assign_palette(palette, reference)
+        # Too few colors for the neutrals, which are all nearest lookups.
+        leftover = DARK_ROLES + LIGHT_ROLES
+        self.assertEqual([mapping[r] for r in leftover], closest_colors(palette, [reference[r] for r in leftover]))
+
+
+if __name__ == "__main__":
+    unittest.main()
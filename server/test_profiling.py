@@ -0,0 +1,62 @@
+import json
+import pstats
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from werkzeug.test import Client
+from werkzeug.wrappers import Response
+
+from profiling import PROFILE_ID_HEADER, ProfileStore, ProfilingMiddleware
+
+
+def slow_app(environ, start_response):
+    deadline = time.perf_counter() + 0.02
+    while time.perf_counter() < deadline:
+        pass
+    return Response("ok")(environ, start_response)
+
+
+class TestProfilingMiddleware(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _get(self, path="/", mode="cprofile", keep=20, remote_addr="127.0.0.1", **kwargs):
+        app = ProfilingMiddleware(slow_app, ProfileStore(self.dir, keep), ["127.0.0.1"], mode)
+        return Client(app).get(path, environ_base={"REMOTE_ADDR": remote_addr}, **kwargs)
+
+    def test_unrequested_or_disallowed_requests_are_not_profiled(self):
+        self.assertNotIn(PROFILE_ID_HEADER, self._get().headers)
+        r = self._get(headers={"X-Profile": "1"}, remote_addr="10.0.0.9")
+        self.assertNotIn(PROFILE_ID_HEADER, r.headers)
+        self.assertEqual(list(self.dir.iterdir()), [])
+
+    def test_cprofile_writes_pstats(self):
+        r = self._get("/?profile=1")
+        self.assertEqual(r.get_data(as_text=True), "ok")
+        path = self.dir / (r.headers[PROFILE_ID_HEADER] + ".pstats")
+        stats = pstats.Stats(str(path))
+        self.assertTrue(any(func[2] == "slow_app" for func in stats.stats))
+
+    def test_sampler_writes_speedscope(self):
+        r = self._get(mode="sample", headers={"X-Profile": "1"})
+        path = self.dir / (r.headers[PROFILE_ID_HEADER] + ".speedscope.json")
+        data = json.loads(path.read_text())
+        profile = data["profiles"][0]
+        self.assertEqual(profile["type"], "sampled")
+        self.assertEqual(len(profile["samples"]), len(profile["weights"]))
+        self.assertIn("slow_app", {f["name"] for f in data["shared"]["frames"]})
+
+    def test_ring_keeps_newest(self):
+        ids = [self._get("/?profile=1", keep=2).headers[PROFILE_ID_HEADER] for _ in range(4)]
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir()), sorted(i + ".pstats" for i in ids[2:]))
+
+
+if __name__ == "__main__":
+    unittest.main()
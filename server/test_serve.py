@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+
+
+class TestServe(unittest.TestCase):
+
+    def test_master_does_not_import_the_app(self):
+        # Executors, cache connections and the Gemini client must be created
+        # in the workers, after the fork.
+        code = ("import sys, serve\n"
+                "assert 'server' not in sys.modules and 'flask' not in sys.modules\n"
+                "app = serve.ThemeServer.load(object.__new__(serve.ThemeServer))\n"
+                "assert app is sys.modules['server'].app\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, SHARED_CACHE_PATH=str(Path(tmp) / "cache.sqlite3"))
+            env.pop("GEMINI_API_KEY", None)
+            subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, env=env, check=True, capture_output=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
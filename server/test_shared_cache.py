@@ -0,0 +1,99 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import themefile
+from shared_cache import SharedStore
+from themefile import ParseCache
+
+THEME = """@OBSThemeMeta {
+    name: 'Shared';
+    id: 'com.example.shared';
+    dark: 'true';
+}
+@OBSThemeVars {
+    --base: #000000;
+}
+"""
+
+
+class TestSharedStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.store = SharedStore(self.root / "shared.sqlite3")
+        self.theme = self.root / "a.ovt"
+        self.theme.write_text(THEME, encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_reused_across_caches(self):
+        """A second worker's cache is filled from the store, not by parsing."""
+        first = ParseCache(shared=self.store).get(self.theme)
+        with mock.patch.object(themefile, "parse_theme", side_effect=AssertionError("parsed twice")):
+            second = ParseCache(shared=self.store).get(self.theme)
+        self.assertEqual(second.report, first.report)
+        self.assertEqual(second.meta_span, first.meta_span)
+
+    def test_catalog_scanned_once_until_invalidated(self):
+        scans = []
+
+        def scan():
+            scans.append(1)
+            return [{"name": "a.ovt", "path": "a.ovt", "size": 1, "modified": 0.0}]
+
+        self.store.get_or_scan_catalog("root", 30, scan)
+        entries = self.store.get_or_scan_catalog("root", 30, scan)
+        self.assertEqual(len(scans), 1)
+        self.assertEqual(entries[0]["name"], "a.ovt")
+
+        self.store.update_catalog_entry("root", "a.ovt", size=5)
+        self.assertEqual(self.store.get_catalog("root", 30)[0]["size"], 5)
+
+        self.store.invalidate_catalog("root")
+        self.store.get_or_scan_catalog("root", 30, scan)
+        self.assertEqual(len(scans), 2)
+
+    def test_scan_holds_no_database_lock(self):
+        started, release, scans = threading.Event(), threading.Event(), []
+
+        def slow_scan():
+            scans.append(1)
+            started.set()
+            release.wait(5)
+            return [{"name": "a.ovt", "path": "a.ovt", "size": 1, "modified": 0.0}]
+
+        results = []
+
+        def list_catalog():
+            results.append(self.store.get_or_scan_catalog("root", 30, slow_scan))
+
+        scanners = [threading.Thread(target=list_catalog) for _ in range(2)]
+        scanners[0].start()
+        self.assertTrue(started.wait(5))
+        scanners[1].start()
+        # Another worker keeps writing while the scan runs.
+        other = SharedStore(self.root / "shared.sqlite3", busy_timeout=0.2)
+        other.put_job("0" * 16, "k", {"state": "running", "requests": 1})
+        ParseCache(shared=other).get(self.theme)
+        release.set()
+        for t in scanners:
+            t.join(5)
+        self.assertEqual(len(scans), 1)
+        self.assertEqual(results[0], results[1])
+
+    def test_failed_scan_releases_its_claim(self):
+        def failing():
+            raise OSError("gone")
+
+        with self.assertRaises(OSError):
+            self.store.get_or_scan_catalog("root", 30, failing)
+        self.assertEqual(self.store.get_or_scan_catalog("root", 30, lambda: []), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+
+from textmate_import import FAILED, SKIPPED, UNCHANGED, WRITTEN, collect, import_themes, output_name, parse_jsonc
+
+JSONC_THEME = """﻿// Night Owl-ish
+{
+  "name": "Night /* not a comment */ Owl",
+  "type": "dark",
+  "colors": {
+    "editor.background": "#011627", // trailing comment
+    "editor.foreground": "#d6deeb",
+    /* block
+       comment */
+    "errorForeground": "#ef5350",
+  },
+  "tokenColors": [{"scope": "comment", "settings": {"foreground": "#637777"}},],
+}
+"""
+
+
+class TestTextMateImport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+
+    def test_parse_jsonc(self):
+        theme = parse_jsonc(JSONC_THEME)
+        self.assertEqual(theme["name"], "Night /* not a comment */ Owl")
+        self.assertEqual(list(theme["colors"]), ["editor.background", "editor.foreground", "errorForeground"])
+        self.assertEqual(parse_jsonc('{"url": "http://x//y", "a": [1, 2, // c\n]}'), {"url": "http://x//y", "a": [1, 2]})
+        self.assertEqual(output_name("themes/Dracula-Color-Theme.json"), "dracula_theme.ovt")
+
+    def test_directory_and_archive_with_bad_files(self):
+        src = self.root / "src"
+        (src / "nested").mkdir(parents=True)
+        (src / "night-owl-color-theme.jsonc").write_text(JSONC_THEME)
+        (src / "nested" / "broken.json").write_text('{"colors": {')
+        (src / "nested" / "settings.json").write_text('{"editor.fontSize": 14}')
+        with zipfile.ZipFile(self.root / "ext.vsix", "w") as zf:
+            zf.writestr("extension/package.json", '{"name": "ext"}')
+            zf.writestr("extension/themes/night-owl.json", json.dumps({"name": "Light Owl", "type": "light",
+                                                                         "colors": {"editor.background": "#fbfbfb"}}))
+        out = self.root / "out"
+
+        items = collect([src, self.root / "ext.vsix"], out)
+        self.assertEqual([Path(i.output).name for i in items],
+                         ["broken_theme.ovt", "settings_theme.ovt", "night-owl_theme.ovt", "night-owl-2_theme.ovt"])
+        summary = import_themes(items)
+        by_output = {Path(r["output"]).name: r for r in summary["items"]}
+        self.assertEqual((summary[WRITTEN], summary[SKIPPED], summary[FAILED]), (2, 1, 1))
+        self.assertEqual(by_output["broken_theme.ovt"]["status"], FAILED)
+        self.assertEqual(by_output["settings_theme.ovt"]["status"], SKIPPED)
+
+        dark = (out / "night-owl_theme.ovt").read_text()
+        self.assertIn("name: 'Night /* not a comment */ Owl';", dark)
+        self.assertIn("--bg_window: var(--base, #011627);", dark)
+        self.assertIn("dark: 'false';", (out / "night-owl-2_theme.ovt").read_text())
+
+        self.assertEqual(import_themes(collect([src, self.root / "ext.vsix"], out))[UNCHANGED], 2)
+
+    def test_unreadable_sources_fail_alone(self):
+        good = self.root / "night-owl.jsonc"
+        good.write_text(JSONC_THEME)
+        (self.root / "bad.zip").write_bytes(b"not an archive")
+        with zipfile.ZipFile(self.root / "crc.zip", "w") as zf:
+            zf.writestr("a.json", '{"colors": {"editor.background": "#000000"}}')
+            zf.writestr("b.json", '{"colors": {"editor.background": "#ffffff"}}')
+        data = (self.root / "crc.zip").read_bytes()
+        (self.root / "crc.zip").write_bytes(data.replace(b"#000000", b"#000001"))
+        out = self.root / "out"
+
+        items = collect([good, self.root / "bad.zip", self.root / "missing.tgz", self.root / "crc.zip"], out)
+        summary = import_themes(items)
+        by_source = {Path(r["source"]).name: r for r in summary["items"]}
+        self.assertEqual((summary[WRITTEN], summary[FAILED]), (2, 3))
+        self.assertEqual(by_source["night-owl.jsonc"]["status"], WRITTEN)
+        self.assertEqual(by_source["crc.zip!b.json"]["status"], WRITTEN)
+        for source in ("bad.zip", "missing.tgz", "crc.zip!a.json"):
+            self.assertEqual(by_source[source]["status"], FAILED, source)
+            self.assertTrue(by_source[source]["error"], source)
+            self.assertIsNone(by_source[source]["output"], source)
+
+
+if __name__ == "__main__":
+    unittest.main()
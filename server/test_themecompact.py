@@ -0,0 +1,154 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from themecompact import MinifyCache, merge_identical_bodies, minify
+from themecss import ThemeSyntaxError, parse_blocks, serialize
+from validation import REQUIRED_VARS, validate_theme_content
+
+ROOT = Path(__file__).resolve().parent.parent
+
+THEME = """/* ===== Banner ===== */
+@OBSThemeMeta {
+    name: 'Test';
+    id: 'com.example.test';
+    dark: 'true';
+}
+
+@OBSThemeVars {
+%s
+    --accent: #cba6f7;
+    --accent_alias: var(--accent);
+    --unused: #123456;
+    --accent: #b4befe;
+}
+
+/* Buttons */
+QPushButton {
+    color: var(--text);
+    color: var(--text);
+    background: var(--accent_alias);
+}
+
+QPushButton {
+    border: none;
+}
+
+QToolButton {
+    border: none;
+}
+
+QToolBar {
+    border: none;
+}
+
+QLabel {
+}
+
+QLineEdit { font-family: "Open  Sans"; }
+""" % "\n".join(f"    --{name}: #000000;" for name in REQUIRED_VARS)
+
+
+class TestMinify(unittest.TestCase):
+
+    def test_compacts_without_changing_the_rules(self):
+        result = minify(THEME)
+        blocks = parse_blocks(result.text)
+        self.assertEqual([b.selector for b in blocks[2:]], ["QPushButton", "QToolButton,QToolBar", "QLineEdit"])
+        self.assertEqual(blocks[2].declarations, [("color", "var(--text)"), ("background", "var(--accent_alias)"),
+                                                  ("border", "none")])
+        self.assertIn('font-family:"Open  Sans"', result.text)
+        self.assertNotIn("Banner", result.text)
+        self.assertIn("--accent:#b4befe;", result.text)
+        self.assertNotIn("#cba6f7", result.text)
+
+        report = result.report
+        self.assertEqual(report.original_bytes, len(THEME))
+        self.assertEqual(report.minified_bytes, len(result.text))
+        self.assertEqual((report.rules_before, report.rules_after), (6, 3))
+        self.assertEqual(report.vars_after, report.vars_before - 1)
+
+    def test_drops_unused_vars_unless_the_theme_extends_another(self):
+        result = minify(THEME, drop_unused_vars=True)
+        self.assertNotIn("--unused", result.text)
+        self.assertIn("--accent:#b4befe;", result.text)
+        for name in REQUIRED_VARS:
+            self.assertIn(f"--{name}:", result.text)
+
+        extending = THEME.replace("dark: 'true';", "dark: 'true';\n    extends: 'com.example.base';")
+        self.assertIn("--unused", minify(extending, drop_unused_vars=True).text)
+
+    def test_repository_themes_stay_valid(self):
+        for name in ("catppuccin_enhanced_base.obt", "catppuccin_enhanced_mocha.ovt"):
+            text = (ROOT / name).read_text(encoding="utf-8")
+            result = minify(text, drop_unused_vars=name.endswith(".ovt"))
+            before, after = validate_theme_content(text), validate_theme_content(result.text)
+            self.assertEqual(len(after.errors), len(before.errors), name)
+            self.assertEqual(after.meta, before.meta, name)
+            self.assertLess(result.report.minified_bytes, result.report.original_bytes * 0.85, name)
+
+    def test_unparseable_theme_raises(self):
+        with self.assertRaises(ThemeSyntaxError):
+            minify("QWidget {{ color: red; }}")
+
+
+def selectors(qss):
+    return [b.selector for b in merge_identical_bodies(parse_blocks(qss))]
+
+
+class TestMergeIdenticalBodies(unittest.TestCase):
+
+    def test_groups_rules_separated_by_unrelated_widgets(self):
+        qss = ("QLabel { color: red; }\n"
+               "QPushButton { color: blue; }\n"
+               "QMenu::item { color: green; }\n"
+               "QCheckBox { color: red; }\n")
+        self.assertEqual(selectors(qss), ["QLabel,QCheckBox", "QPushButton", "QMenu::item"])
+        qss = ("QMenuBar::item { background: red; }\n"
+               "QTreeWidget { background: blue; }\n"
+               "QTreeWidget::branch { background: blue; }\n"
+               "QTreeWidget::item { background: red; }\n")
+        self.assertEqual(selectors(qss), ["QMenuBar::item,QTreeWidget::item", "QTreeWidget,QTreeWidget::branch"])
+
+    def test_keeps_order_where_the_cascade_could_change(self):
+        # QFrame is a base class of QLabel, so moving the second rule up
+        # would let the QFrame rule override it.
+        qss = ("QSpinBox { color: red; }\n"
+               "QFrame { color: blue; }\n"
+               "QLabel { color: red; }\n")
+        self.assertEqual(selectors(qss), ["QSpinBox", "QFrame", "QLabel"])
+        # border-color and border override each other.
+        qss = ("QSpinBox { border: none; }\n"
+               "QWidget { border-color: red; }\n"
+               "QLineEdit { border: none; }\n")
+        self.assertEqual(selectors(qss), ["QSpinBox", "QWidget", "QLineEdit"])
+        # Unknown types may be any widget.
+        qss = ("QSpinBox { color: red; }\n"
+               "#preview { color: blue; }\n"
+               "VolumeMeter { color: red; }\n")
+        self.assertEqual(selectors(qss), ["QSpinBox", "#preview", "VolumeMeter"])
+
+    def test_linear_in_rule_count(self):
+        qss = "".join(f"#w{i} {{ color: red; }}\nQMenu::item:hover {{ color: blue; }}\n" for i in range(3000))
+        merged = merge_identical_bodies(parse_blocks(qss))
+        self.assertEqual(len(merged), 2)
+        self.assertEqual(len(parse_blocks(serialize(merged))), 2)
+
+
+class TestMinifyCache(unittest.TestCase):
+
+    def test_reuses_results_until_the_file_changes(self):
+        cache = MinifyCache()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "t.ovt"
+            path.write_text(THEME)
+            first = cache.get(path)
+            self.assertIs(cache.get(path), first)
+            self.assertNotIn("--unused", first.text)
+            path.write_text(THEME + "QMenu { color: red; }\n")
+            self.assertIn("QMenu{color:red}", cache.get(path).text)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from themefile import FileLocks, ParseCache, parse_theme, write_meta, write_text_atomic
+
+THEME = """/* header comment */
+@OBSThemeMeta {
+    name: 'Old Name';
+    id: 'com.example.old';
+    dark: 'true';
+}
+
+@OBSThemeVars {
+    --base: #1e1e2e;
+}
+
+QWidget { color: var(--base); }
+"""
+
+
+class TestMetaWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "theme.ovt"
+        self.path.write_text(THEME, encoding="utf-8")
+        self.cache = ParseCache()
+        self.locks = FileLocks()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_splices_only_meta_block(self):
+        """Text outside the meta block is preserved byte for byte."""
+        meta = {"name": "New Name", "id": "com.example.new", "dark": False}
+        updated, _ = write_meta(self.path, meta, self.cache, self.locks)
+        text = self.path.read_text(encoding="utf-8")
+        self.assertTrue(text.startswith("/* header comment */\n@OBSThemeMeta {"))
+        self.assertTrue(text.endswith(THEME[THEME.index("\n\n@OBSThemeVars"):]))
+        self.assertEqual(updated.report.meta.id, "com.example.new")
+        self.assertFalse(updated.report.meta.dark)
+
+    def test_text_writes_leave_other_links_alone(self):
+        link = Path(self.tmp.name) / "link.ovt"
+        os.link(self.path, link)
+        write_text_atomic(self.path, "QWidget { color: red; }\n")
+        self.assertEqual(self.path.read_text(encoding="utf-8"), "QWidget { color: red; }\n")
+        self.assertEqual(link.read_text(encoding="utf-8"), THEME)
+
+    def test_cache_matches_fresh_parse(self):
+        """The cache entry derived from the edit equals a re-parse of the file."""
+        updated, _ = write_meta(self.path, {"name": "X", "id": "a.b", "dark": "true"}, self.cache, self.locks)
+        fresh = parse_theme(self.path)
+        self.assertEqual(updated.meta_span, fresh.meta_span)
+        self.assertEqual(updated.vars_span, fresh.vars_span)
+        self.assertEqual(updated.report, fresh.report)
+        self.assertIs(self.cache.get(self.path), updated)
+
+    def test_rejects_block_breaking_values(self):
+        with self.assertRaises(ValueError):
+            write_meta(self.path, {"name": "x }"}, self.cache, self.locks)
+        self.assertEqual(self.path.read_text(encoding="utf-8"), THEME)
+
+    def test_concurrent_edits_to_same_file(self):
+        """Edits to one file serialize and always leave a parseable theme."""
+        def edit(i):
+            write_meta(self.path, {"name": f"N{i}", "id": f"com.example.n{i}", "dark": "true"},
+                       self.cache, self.locks)
+
+        threads = [threading.Thread(target=edit, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        report = parse_theme(self.path).report
+        self.assertEqual(report.summary.errors, 0)
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [self.path])
+
+
+if __name__ == '__main__':
+    unittest.main()
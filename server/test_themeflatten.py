@@ -0,0 +1,111 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from themeflatten import FlattenError, Flattener
+from themecss import parse_blocks
+from validation import REQUIRED_VARS, validate_theme_content
+
+ROOT = Path(__file__).resolve().parent.parent
+
+REQUIRED = "\n".join(f"    --{name}: #000000;" for name in REQUIRED_VARS)
+
+BASE = """@OBSThemeMeta {
+    name: 'Base';
+    id: 'com.example.base';
+}
+
+@OBSThemeVars {
+%s
+    --mauve: #cba6f7;
+    --border_width: 1px;
+    --accent: var(--mauve);
+    --bg_button_checked: var(--accent);
+}
+
+QPushButton:checked {
+    background-color: var(--bg_button_checked);
+    border: var(--border_width) solid var(--accent);
+}
+""" % REQUIRED
+
+CHILD = """@OBSThemeMeta {
+    name: 'Child';
+    id: 'com.example.child';
+    extends: 'com.example.base';
+}
+
+@OBSThemeVars {
+    --mauve: #c6a0f6;
+}
+
+QLabel {
+    color: var(--missing, rgba(1, 2, 3, 0.5));
+    background: var(--accent);
+}
+"""
+
+
+def declarations(text):
+    return {b.selector: dict(b.declarations) for b in parse_blocks(text)}
+
+
+class TestFlattener(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+
+    def flattener(self, **themes):
+        for name, text in themes.items():
+            (self.dir / name).write_text(text)
+        return Flattener(sorted(self.dir.iterdir()))
+
+    def test_resolves_through_extends_to_literals(self):
+        result = self.flattener(**{"base.obt": BASE, "child.ovt": CHILD}).flatten("com.example.child")
+        blocks = declarations(result.text)
+        self.assertEqual(blocks["QPushButton:checked"], {"background-color": "#c6a0f6",
+                                                         "border": "1px solid #c6a0f6"})
+        self.assertEqual(blocks["QLabel"], {"color": "rgba(1, 2, 3, 0.5)", "background": "#c6a0f6"})
+        self.assertEqual(list(blocks["@OBSThemeVars"]), [f"--{name}" for name in REQUIRED_VARS])
+        self.assertNotIn("extends", blocks["@OBSThemeMeta"])
+        self.assertEqual((result.extends, result.unresolved, result.rules), (None, (), 2))
+        self.assertEqual(validate_theme_content(result.text).errors, [])
+
+    def test_keep_palette_resolves_to_palette_vars(self):
+        result = self.flattener(**{"base.obt": BASE, "child.ovt": CHILD}).flatten("com.example.child", True)
+        blocks = declarations(result.text)
+        self.assertEqual(blocks["QPushButton:checked"], {"background-color": "var(--mauve)",
+                                                         "border": "var(--border_width) solid var(--mauve)"})
+        self.assertEqual(blocks["@OBSThemeVars"]["--mauve"], "#c6a0f6")
+        self.assertNotIn("--accent", blocks["@OBSThemeVars"])
+
+    def test_missing_parent_keeps_extends_and_reports_references(self):
+        flattener = self.flattener(**{"child.ovt": CHILD})
+        for _ in range(2):
+            result = flattener.flatten("com.example.child")
+            self.assertEqual(result.extends, "com.example.base")
+            self.assertEqual(result.unresolved, ("accent",))
+        self.assertIn("background: var(--accent);", result.text)
+
+    def test_extends_cycle_and_unknown_theme(self):
+        a = CHILD.replace("com.example.base", "com.example.b").replace("com.example.child", "com.example.a")
+        b = CHILD.replace("com.example.base", "com.example.a").replace("com.example.child", "com.example.b")
+        flattener = self.flattener(**{"a.ovt": a, "b.ovt": b, "broken.ovt": "QWidget {{ }}"})
+        self.assertIn(str(self.dir / "broken.ovt"), flattener.errors)
+        with self.assertRaises(FlattenError):
+            flattener.flatten("com.example.a")
+        with self.assertRaises(FlattenError):
+            flattener.flatten("com.example.nope")
+
+    def test_repository_theme(self):
+        flattener = Flattener([ROOT / "catppuccin_enhanced_base.obt"])
+        result = flattener.flatten("com.catppuccin.enhanced.base")
+        self.assertEqual(result.unresolved, ())
+        self.assertNotIn("var(", result.text)
+        self.assertEqual(validate_theme_content(result.text).errors, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
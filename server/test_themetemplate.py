@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from generators import load_script
+from themetemplate import Template, TemplateError, compile_template, load_template
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class TestTemplate(unittest.TestCase):
+
+    def test_renders_like_str_format(self):
+        source = "@OBSThemeVars {{\n    --base: {base};\n    --text: {text};\n    --bg: {base};\n}}\n"
+        values = {"base": "#1e1e2e", "text": "#cdd6f4"}
+        template = Template(source)
+        self.assertEqual(template.render(values), source.format(**values))
+        self.assertEqual(template.slots, ("base", "text"))
+
+    def test_reports_missing_and_unused_slots(self):
+        template = Template("{a} {b}")
+        self.assertEqual(template.check({"a": "1", "c": "3"}), (("b",), ("c",)))
+        with self.assertRaisesRegex(TemplateError, r"\['b'\]"):
+            template.render({"a": "1"})
+        self.assertEqual(template.render({"a": "1", "b": "2", "c": "3"}), "1 2")
+        with self.assertRaisesRegex(TemplateError, "unused"):
+            template.render({"a": "1", "b": "2", "c": "3"}, strict=True)
+
+    def test_rejects_expressions(self):
+        for source in ("{a.b}", "{a[0]}", "{a:>4}", "{a!r}", "{0}", "{a"):
+            with self.assertRaises(TemplateError, msg=source):
+                Template(source)
+
+    def test_identical_sources_share_a_compiled_template(self):
+        self.assertIs(compile_template("x {a}"), compile_template("x {a}"))
+
+    def test_load_template_recompiles_when_the_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "t.template.ovt"
+            path.write_text("{a}")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+            path.write_text("{a}!")
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            self.assertEqual(load_template(path).render({"a": "1"}), "1!")
+
+    def test_repository_templates_match_their_palettes(self):
+        script_1 = load_script(ROOT, "script_1.py")
+        script_4 = load_script(ROOT, "script_4.py")
+        self.assertEqual(set(load_template(script_1.TEMPLATE_FILE).slots),
+                         set(script_1.catppuccin_mocha) | {"name", "theme_id", "dark", "label"})
+        self.assertEqual(set(load_template(script_1.OVERRIDE_TEMPLATE_FILE).slots),
+                         set(script_1.catppuccin_mocha) | {"name", "theme_id", "dark", "label"})
+        self.assertEqual(set(load_template(script_4.TEMPLATE_FILE).slots), set(script_4.dracula_colors))
+
+
+if __name__ == "__main__":
+    unittest.main()
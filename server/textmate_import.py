@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Batch import of VS Code / TextMate color themes.
+
+Sources are theme files, directories (searched recursively) or archives
+(``.zip``/``.vsix``, ``.tar``/``.tar.gz``/``.tgz``).  Every ``.json`` /
+``.jsonc`` inside is parsed as JSONC (comments and trailing commas allowed)
+and, if it has ``colors`` or ``tokenColors``, converted with
+``script_2.render_textmate_theme`` and written to
+``<out-dir>/<name>_theme.ovt`` when its bytes changed.  Files are parsed and
+rendered on a process pool; a file, archive or archive member that fails is
+reported in the summary and never stops the batch.
+
+Run:
+  python server/textmate_import.py themes/ extension.vsix --out-dir . --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import tarfile
+import zipfile
+import zlib
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Iterable, List, Optional, Sequence
+
+from config import ROOT
+from generators import load_script, write_if_changed
+
+WRITTEN = "written"
+UNCHANGED = "unchanged"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+THEME_SUFFIXES = (".json", ".jsonc")
+MAX_FILE_BYTES = 4 * 1024 * 1024
+
+# What a missing, unreadable or corrupt source or archive member raises.
+SOURCE_ERRORS = (OSError, EOFError, zipfile.BadZipFile, tarfile.TarError, zlib.error)
+
+# Splitting on strings and comments leaves code segments that hold neither,
+# so trailing commas can be dropped from them with a plain pattern.
+_JSONC_TOKEN_RE = re.compile(r'("[^"\\]*(?:\\.[^"\\]*)*"|//[^\n]*|/\*.*?\*/)', re.S)
+_TRAILING_COMMA_RE = re.compile(r",(?=\s*[}\]])")
+
+
+def parse_jsonc(text: str):
+    """``json.loads`` that also accepts comments and trailing commas."""
+    text = text.lstrip("\ufeff")
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    parts = _JSONC_TOKEN_RE.split(text)  # code, token, code, token, ..., code
+    out, code = [], parts[0]
+    for i in range(1, len(parts), 2):
+        if parts[i].startswith('"'):
+            out += (_TRAILING_COMMA_RE.sub("", code), parts[i])
+            code = parts[i + 1]
+        else:  # a comment: the code around it is one segment
+            code += " " + parts[i + 1]
+    out.append(_TRAILING_COMMA_RE.sub("", code))
+    return json.loads("".join(out))
+
+
+def output_name(source_name: str) -> str:
+    """``Dracula-Color-Theme.json`` -> ``dracula_theme.ovt``."""
+    stem = re.sub(r"\.jsonc?$", "", source_name.rsplit("/", 1)[-1], flags=re.I).lower()
+    stem = re.sub(r"[-_.]?colou?r[-_.]?theme$|[-_.]theme$", "", stem)
+    return f"{re.sub(r'[^a-z0-9]+', '-', stem).strip('-') or 'theme'}_theme.ovt"
+
+
+@dataclass(frozen=True)
+class ImportItem:
+    source: str                 # file path, or "archive!member"
+    output: Optional[str]       # None if the source couldn't be read
+    path: Optional[str] = None  # read by the worker ...
+    data: Optional[bytes] = None  # ... or already read from an archive
+    error: Optional[str] = None  # why the source or member couldn't be read
+
+
+def _is_theme_name(name: str) -> bool:
+    base = name.rsplit("/", 1)[-1]
+    return base.lower().endswith(THEME_SUFFIXES) and not base.startswith(".") and not base.startswith("package")
+
+
+def _read_member(read) -> tuple:
+    try:
+        return read(), None
+    except SOURCE_ERRORS as e:
+        return None, str(e)[:500] or type(e).__name__
+
+
+def _archive_members(path: Path) -> Iterable[tuple]:
+    """(member name, data, error) of the theme files in an archive.
+
+    ``data`` is None for oversized members and for those that failed to
+    read, which carry the error.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and _is_theme_name(info.filename):
+                    if info.file_size > MAX_FILE_BYTES:
+                        yield info.filename, None, None
+                    else:
+                        yield (info.filename, *_read_member(lambda: zf.read(info)))
+    else:
+        with tarfile.open(path) as tf:
+            for member in tf:
+                if member.isfile() and _is_theme_name(member.name):
+                    if member.size > MAX_FILE_BYTES:
+                        yield member.name, None, None
+                    else:
+                        yield (member.name, *_read_member(lambda: tf.extractfile(member).read()))
+
+
+def collect(sources: Sequence[Path], out_dir: Path) -> List[ImportItem]:
+    """Import items for ``sources``; output names are made unique in order.
+
+    A source that can't be listed or opened becomes a single item carrying
+    the error, after any members already read from it.
+    """
+    found = []
+    for source in map(Path, sources):
+        try:
+            if source.is_dir():
+                for path in sorted(source.rglob("*")):
+                    if path.is_file() and _is_theme_name(path.name) and not any(
+                            part.startswith(".") for part in path.relative_to(source).parts):
+                        found.append((str(path), path.name, str(path), None, None))
+            elif source.suffix.lower() in (".json", ".jsonc"):
+                found.append((str(source), source.name, str(source), None, None))
+            else:
+                for member, data, error in _archive_members(source):
+                    # Oversized members arrive as b"" and fail in the worker.
+                    found.append((f"{source}!{member}", member, None, b"" if data is None else data, error))
+        except SOURCE_ERRORS as e:
+            found.append((str(source), None, None, None, str(e)[:500] or type(e).__name__))
+
+    items, used = [], set()
+    for label, name, path, data, error in found:
+        if error is not None:
+            items.append(ImportItem(label, None, error=error))
+            continue
+        output = output_name(name)
+        n = 2
+        while output in used:
+            output = output_name(name).replace("_theme.ovt", f"-{n}_theme.ovt")
+            n += 1
+        used.add(output)
+        items.append(ImportItem(label, str(Path(out_dir) / output), path, data))
+    return items
+
+
+def import_item(item: ImportItem) -> dict:
+    """Parse, convert and write one theme (runs in pool workers)."""
+    start = perf_counter()
+    result = {"source": item.source, "output": item.output}
+    if item.error is not None:
+        result.update(status=FAILED, error=item.error)
+        return result
+    try:
+        if item.path is not None:
+            if os.path.getsize(item.path) > MAX_FILE_BYTES:
+                raise ValueError("file too large")
+            with open(item.path, "rb") as f:
+                raw = f.read()
+        elif not item.data:
+            raise ValueError("empty or too large")
+        else:
+            raw = item.data
+        theme = parse_jsonc(raw.decode("utf-8-sig"))
+        if not isinstance(theme, dict) or not ("colors" in theme or "tokenColors" in theme):
+            result.update(status=SKIPPED, error="not a color theme")
+            return result
+        name = str(theme.get("name") or Path(item.output).name[:-len("_theme.ovt")])
+        dark = theme.get("type", "dark") not in ("light", "hcLight")
+        script = load_script(ROOT, "script_2.py")
+        data = script.render_textmate_theme(theme, name, dark).encode("utf-8")
+        parsed = perf_counter()
+        os.makedirs(os.path.dirname(item.output) or ".", exist_ok=True)
+        changed = write_if_changed(Path(item.output), data)
+        result.update(
+            status=WRITTEN if changed else UNCHANGED,
+            name=name,
+            sha256=hashlib.sha256(data).hexdigest(),
+            convert_ms=round((parsed - start) * 1000, 3),
+            write_ms=round((perf_counter() - parsed) * 1000, 3),
+        )
+    except Exception as e:
+        result.update(status=FAILED, error=str(e)[:500])
+    return result
+
+
+def import_themes(items: Sequence[ImportItem], pool: Optional[Executor] = None,
+                  chunksize: Optional[int] = None) -> dict:
+    """Import ``items`` (on ``pool`` if given) and summarize the run."""
+    start = perf_counter()
+    if pool is None:
+        results = [import_item(item) for item in items]
+    else:
+        chunksize = chunksize or max(1, math.ceil(len(items) / (4 * (os.cpu_count() or 1))))
+        results = list(pool.map(import_item, items, chunksize=chunksize))
+    counts = {WRITTEN: 0, UNCHANGED: 0, SKIPPED: 0, FAILED: 0}
+    for r in results:
+        counts[r["status"]] += 1
+    return {
+        "total": len(results),
+        **counts,
+        "seconds": round(perf_counter() - start, 4),
+        "items": results,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", type=Path, help="theme files, directories or archives")
+    parser.add_argument("--out-dir", type=Path, default=Path("."))
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="1 converts in this process")
+    args = parser.parse_args()
+
+    items = collect(args.sources, args.out_dir)
+    if args.workers > 1 and len(items) > 1:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(args.workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            summary = import_themes(items, pool)
+    else:
+        summary = import_themes(items)
+    print(json.dumps(summary, indent=2))
+    return 1 if summary[FAILED] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Theme minifier.
+
+``minify`` rewrites a theme without changing what OBS applies:
+
+- comments and insignificant whitespace are dropped (see ``themecss``);
+- a declaration repeated verbatim in one block keeps only its last copy,
+  and a variable declared twice keeps its last value;
+- adjacent rules with the same selector are merged;
+- rules with identical bodies are grouped under one selector list, even far
+  apart, as long as that doesn't reorder the cascade (see
+  ``merge_identical_bodies``);
+- empty rules are dropped;
+- with ``drop_unused_vars``, variables that no rule uses, directly or
+  through other variables, are dropped.  Only safe for themes whose
+  variables nothing else reads, so it is ignored for themes that extend
+  another (their variables feed the parent's rules) and callers leave it
+  off for base ``.obt`` themes (variants may read any of their variables).
+  ``REQUIRED_VARS`` are always kept.
+
+``MinifyCache`` keeps minified results keyed on the file's path, size and
+mtime, like ``archive.DeflateCache``.
+
+Run:
+  python server/themecompact.py catppuccin_enhanced_base.obt -o base.min.obt
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from themecss import VARS, Block, meta_of, parse_blocks, serialize, var_refs
+from validation import REQUIRED_VARS
+
+
+@dataclass(frozen=True)
+class MinifyReport:
+    original_bytes: int
+    minified_bytes: int
+    rules_before: int
+    rules_after: int
+    vars_before: int
+    vars_after: int
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - self.minified_bytes
+
+    @property
+    def saved_ratio(self) -> float:
+        return self.saved_bytes / self.original_bytes if self.original_bytes else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "original_bytes": self.original_bytes,
+            "minified_bytes": self.minified_bytes,
+            "saved_bytes": self.saved_bytes,
+            "saved_ratio": round(self.saved_ratio, 4),
+            "rules_before": self.rules_before,
+            "rules_after": self.rules_after,
+            "vars_before": self.vars_before,
+            "vars_after": self.vars_after,
+        }
+
+
+@dataclass(frozen=True)
+class Minified:
+    text: str
+    report: MinifyReport
+
+
+def _dedupe(block: Block) -> Block:
+    if block.selector == VARS:
+        last = {prop: i for i, (prop, _) in enumerate(block.declarations)}
+    else:
+        last = {decl: i for i, decl in enumerate(block.declarations)}
+    keep = set(last.values())
+    return Block(block.selector, [d for i, d in enumerate(block.declarations) if i in keep])
+
+
+def merge_adjacent(blocks: Iterable[Block]) -> List[Block]:
+    """Merge neighbouring rules that share a selector."""
+    out: List[Block] = []
+    for block in blocks:
+        prev = out[-1] if out else None
+        if (prev is not None and not prev.is_at_rule and not block.is_at_rule
+                and prev.selector == block.selector):
+            out[-1] = _dedupe(Block(prev.selector, prev.declarations + block.declarations))
+            continue
+        out.append(block)
+    return out
+
+
+def _family(prop: str) -> str:
+    # Shorthands and their longhands (border, border-color...) override each other.
+    return prop.split("-", 1)[0].lower()
+
+
+# Qt widget classes and their base classes, so rules for e.g. QListWidget and
+# QFrame are known to reach the same widgets while QMenuBar and QTreeWidget
+# never do.  Any type not listed (OBS's own widgets, say) may match anything.
+QT_CLASS_PARENTS = {
+    "QFrame": "QWidget", "QAbstractScrollArea": "QFrame", "QAbstractItemView": "QAbstractScrollArea",
+    "QListView": "QAbstractItemView", "QListWidget": "QListView", "QTreeView": "QAbstractItemView",
+    "QTreeWidget": "QTreeView", "QTableView": "QAbstractItemView", "QTableWidget": "QTableView",
+    "QHeaderView": "QAbstractItemView", "QColumnView": "QAbstractItemView", "QScrollArea": "QAbstractScrollArea",
+    "QTextEdit": "QAbstractScrollArea", "QTextBrowser": "QTextEdit", "QPlainTextEdit": "QAbstractScrollArea",
+    "QLabel": "QFrame", "QToolBox": "QFrame", "QStackedWidget": "QFrame", "QSplitter": "QFrame",
+    "QLCDNumber": "QFrame", "QAbstractButton": "QWidget", "QPushButton": "QAbstractButton",
+    "QCommandLinkButton": "QPushButton", "QToolButton": "QAbstractButton", "QCheckBox": "QAbstractButton",
+    "QRadioButton": "QAbstractButton", "QAbstractSlider": "QWidget", "QSlider": "QAbstractSlider",
+    "QScrollBar": "QAbstractSlider", "QDial": "QAbstractSlider", "QAbstractSpinBox": "QWidget",
+    "QSpinBox": "QAbstractSpinBox", "QDoubleSpinBox": "QAbstractSpinBox", "QDateTimeEdit": "QAbstractSpinBox",
+    "QDateEdit": "QDateTimeEdit", "QTimeEdit": "QDateTimeEdit", "QComboBox": "QWidget",
+    "QFontComboBox": "QComboBox", "QLineEdit": "QWidget", "QMenu": "QWidget", "QMenuBar": "QWidget",
+    "QTabBar": "QWidget", "QTabWidget": "QWidget", "QDockWidget": "QWidget", "QToolBar": "QWidget",
+    "QStatusBar": "QWidget", "QProgressBar": "QWidget", "QGroupBox": "QWidget", "QDialog": "QWidget",
+    "QMessageBox": "QDialog", "QDialogButtonBox": "QWidget", "QMainWindow": "QWidget", "QSizeGrip": "QWidget",
+    "QSplitterHandle": "QWidget", "QCalendarWidget": "QWidget", "QWidget": None,
+}
+_SELECTOR_SPLIT_RE = re.compile(r"""((?:"[^"]*"|'[^']*'|\[[^\]]*\]|\([^)]*\)|[^,])+)""")
+_BRACKETS_RE = re.compile(r"""\[[^\]]*\]|\([^)]*\)|"[^"]*"|'[^']*'""")
+_COMBINATOR_RE = re.compile(r"\s*[>+~]\s*|\s+")
+_TYPE_RE = re.compile(r"[A-Za-z_][\w]*")
+_SUBCONTROL_RE = re.compile(r"::([\w-]+)")
+
+
+def _subjects(selector: str) -> Set[Tuple[str, str]]:
+    """(widget type or ``*``, sub-control) each selector of a list styles."""
+    subjects = set()
+    for part in _SELECTOR_SPLIT_RE.findall(selector):
+        compound = _COMBINATOR_RE.split(_BRACKETS_RE.sub("", part).strip())[-1]
+        type_match = _TYPE_RE.match(compound)
+        widget = type_match.group(0) if type_match else "*"
+        subcontrol = _SUBCONTROL_RE.search(compound)
+        subjects.add((widget if widget in QT_CLASS_PARENTS else "*", subcontrol.group(1) if subcontrol else ""))
+    return subjects
+
+
+def _related(a: str, b: str) -> bool:
+    """Whether widgets of type ``a`` and ``b`` can be the same widget."""
+    if a == "*" or b == "*":
+        return True
+    for start, other in ((a, b), (b, a)):
+        t = start
+        while t is not None:
+            if t == other:
+                return True
+            t = QT_CLASS_PARENTS[t]
+    return False
+
+
+def merge_identical_bodies(blocks: Iterable[Block]) -> List[Block]:
+    """Group rules with identical declaration bodies under one selector list.
+
+    A rule is folded into the earlier rule with the same body unless a rule
+    in between sets a property of the same family on a widget both could
+    match (same sub-control, related widget types).  Moving its
+    declarations up then can't change which value wins for any widget,
+    whatever the selectors' specificity.  One pass, tracking per property
+    family and sub-control the last rule to touch each widget type, so the
+    cost is linear in the number of declarations.
+    """
+    out: List[Block] = []
+    parts: Dict[int, Dict[str, None]] = {}  # output index -> grouped selectors, in order
+    by_body: Dict[tuple, int] = {}          # body -> output index of its latest group
+    # (family, sub-control) -> {widget type: output index of the last rule setting it}
+    last_set: Dict[Tuple[str, str], Dict[str, int]] = {}
+    for block in blocks:
+        if block.is_at_rule:
+            out.append(block)
+            continue
+        key = block.body_key()
+        families = {_family(prop) for prop, _ in block.declarations}
+        subjects = _subjects(block.selector)
+        group = by_body.get(key)
+        if group is not None and not any(
+                index > group and _related(widget, other)
+                for f in families for widget, sub in subjects
+                for other, index in last_set.get((f, sub), {}).items()):
+            parts[group][block.selector] = None
+            index = group
+        else:
+            index = len(out)
+            out.append(block)
+            parts[index] = {block.selector: None}
+            by_body[key] = index
+        for f in families:
+            for widget, sub in subjects:
+                touched = last_set.setdefault((f, sub), {})
+                touched[widget] = max(touched.get(widget, -1), index)
+    return [Block(",".join(parts[i]), b.declarations) if len(parts.get(i, ())) > 1 else b
+            for i, b in enumerate(out)]
+
+
+def used_vars(blocks: Iterable[Block], keep: Iterable[str] = ()) -> Set[str]:
+    """Variables reachable from rule values, ``keep`` and ``REQUIRED_VARS``."""
+    blocks = list(blocks)
+    graph: Dict[str, Set[str]] = {}
+    roots = set(keep) | set(REQUIRED_VARS)
+    for block in blocks:
+        if block.selector == VARS:
+            for prop, value in block.declarations:
+                graph.setdefault(prop[2:], set()).update(var_refs(value))
+        elif not block.is_at_rule:
+            for _, value in block.declarations:
+                roots |= var_refs(value)
+    seen: Set[str] = set()
+    stack = list(roots)
+    while stack:
+        name = stack.pop()
+        if name not in seen:
+            seen.add(name)
+            stack.extend(graph.get(name, ()))
+    return seen
+
+
+def minify(text: str, drop_unused_vars: bool = False, keep_vars: Iterable[str] = ()) -> Minified:
+    """Compact theme ``text``; raises ``themecss.ThemeSyntaxError`` if it can't be parsed."""
+    blocks = parse_blocks(text)
+    rules_before = sum(not b.is_at_rule for b in blocks)
+    vars_before = sum(len(b.declarations) for b in blocks if b.selector == VARS)
+
+    blocks = [_dedupe(b) for b in blocks]
+    blocks = merge_adjacent(b for b in blocks if b.declarations or b.is_at_rule)
+    blocks = merge_identical_bodies(blocks)
+    if drop_unused_vars and "extends" not in meta_of(blocks):
+        used = used_vars(blocks, keep_vars)
+        blocks = [Block(b.selector, [(p, v) for p, v in b.declarations if p[2:] in used])
+                  if b.selector == VARS else b for b in blocks]
+
+    out = serialize(blocks, compact=True)
+    return Minified(out, MinifyReport(
+        original_bytes=len(text.encode("utf-8")),
+        minified_bytes=len(out.encode("utf-8")),
+        rules_before=rules_before,
+        rules_after=sum(not b.is_at_rule for b in blocks),
+        vars_before=vars_before,
+        vars_after=sum(len(b.declarations) for b in blocks if b.selector == VARS),
+    ))
+
+
+def minify_file(path: Path) -> Minified:
+    """``minify`` of the theme at ``path``, dropping unused variables unless it is a base theme."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    return minify(text, drop_unused_vars=path.suffix.lower() != ".obt")
+
+
+class MinifyCache:
+    """Thread-safe LRU of minified themes bounded by total minified bytes."""
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, Minified]" = OrderedDict()
+        self._total = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path) -> Minified:
+        """The minified theme at ``path``, computed again only when the file changes."""
+        st = os.stat(path)
+        key = (str(path), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached: Optional[Minified] = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        result = minify_file(path)
+        size = result.report.minified_bytes
+        if size > self.max_bytes:
+            return result
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total -= old.report.minified_bytes
+            self._entries[key] = result
+            self._total += size
+            while self._total > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total -= evicted.report.minified_bytes
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("theme", type=Path)
+    parser.add_argument("-o", "--output", type=Path, help="write here instead of stdout")
+    args = parser.parse_args()
+
+    result = minify_file(args.theme)
+    if args.output:
+        args.output.write_text(result.text, encoding="utf-8")
+    else:
+        sys.stdout.write(result.text)
+    r = result.report
+    print(f"{args.theme}: {r.original_bytes} -> {r.minified_bytes} bytes (-{r.saved_ratio:.1%}), "
+          f"rules {r.rules_before} -> {r.rules_after}, vars {r.vars_before} -> {r.vars_after}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Parsing theme files into blocks and writing them back.
+
+A theme is a flat sequence of ``selector { declarations }`` blocks: the
+``@OBSThemeMeta`` and ``@OBSThemeVars`` at-blocks, then Qt stylesheet rules.
+QSS has no nesting, so ``parse_blocks`` is a single regex pass over the text
+with comments removed, and each body is split into ``(property, value)``
+pairs outside quotes and parentheses.  ``serialize`` writes blocks back
+either indented like the generated themes or compact: one rule per line,
+with the at-blocks kept at one declaration per line so ``validation.py``
+still reads them.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set, Tuple
+
+META = "@OBSThemeMeta"
+VARS = "@OBSThemeVars"
+
+_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\')|/\*.*?\*/', re.S)
+_BLOCK_RE = re.compile(r"([^{}]*)\{([^{}]*)\}")
+_DECL_RE = re.compile(r"""(?:"[^"]*"|'[^']*'|\([^)]*\)|[^;"'(])+""")
+_SQUEEZE_RE = re.compile(r"""("[^"]*"|'[^']*')|\s+""")
+_SELECTOR_COMMA_RE = re.compile(r"\s*,\s*")
+VAR_REF_RE = re.compile(r"var\(\s*--([A-Za-z0-9_-]+)")
+
+
+class ThemeSyntaxError(ValueError):
+    pass
+
+
+@dataclass
+class Block:
+    selector: str
+    declarations: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def is_at_rule(self) -> bool:
+        return self.selector.startswith("@")
+
+    def body_key(self) -> Tuple[Tuple[str, str], ...]:
+        return tuple(self.declarations)
+
+
+def squeeze(text: str) -> str:
+    """Collapse whitespace runs to one space, leaving quoted strings alone."""
+    return _SQUEEZE_RE.sub(lambda m: m.group(1) or " ", text).strip()
+
+
+def strip_comments(text: str) -> str:
+    return _COMMENT_RE.sub(lambda m: m.group(1) or "", text)
+
+
+def parse_blocks(text: str) -> List[Block]:
+    """The blocks of theme ``text`` in source order, comments dropped."""
+    text = strip_comments(text)
+    blocks = []
+    pos = 0
+    for m in _BLOCK_RE.finditer(text):
+        stray = text[pos:m.start()].strip()
+        if stray:
+            raise ThemeSyntaxError(f"unexpected {squeeze(stray)[:60]!r} (unbalanced braces?)")
+        pos = m.end()
+        selector = m.group(1)
+        selector = squeeze(selector)
+        if not selector:
+            raise ThemeSyntaxError("block without a selector")
+        if not selector.startswith("@"):
+            selector = _SELECTOR_COMMA_RE.sub(",", selector)
+        declarations = []
+        for decl in _DECL_RE.findall(m.group(2)):
+            decl = decl.strip()
+            if not decl:
+                continue
+            prop, sep, value = decl.partition(":")
+            if not sep or not prop.strip():
+                raise ThemeSyntaxError(f"malformed declaration in {selector!r}: {squeeze(decl)!r}")
+            declarations.append((prop.strip(), squeeze(value)))
+        blocks.append(Block(selector, declarations))
+    if text[pos:].strip():
+        raise ThemeSyntaxError("unbalanced braces or text after the last block")
+    return blocks
+
+
+def serialize(blocks: Iterable[Block], compact: bool = False) -> str:
+    out = []
+    for block in blocks:
+        if compact and not block.is_at_rule:
+            body = ";".join(f"{p}:{v}" for p, v in block.declarations)
+            out.append(f"{block.selector}{{{body}}}\n")
+        elif compact:
+            body = "".join(f"{p}:{v};\n" for p, v in block.declarations)
+            out.append(f"{block.selector}{{\n{body}}}\n")
+        else:
+            selector = block.selector.replace(",", ",\n") if not block.is_at_rule else block.selector
+            body = "".join(f"    {p}: {v};\n" for p, v in block.declarations)
+            out.append(f"{selector} {{\n{body}}}\n\n")
+    return "".join(out).rstrip("\n") + "\n"
+
+
+def meta_of(blocks: Iterable[Block]) -> Dict[str, str]:
+    """The ``@OBSThemeMeta`` fields, unquoted."""
+    for block in blocks:
+        if block.selector == META:
+            return {p: v.strip("'\"") for p, v in block.declarations}
+    return {}
+
+
+def var_refs(value: str) -> Set[str]:
+    return set(VAR_REF_RE.findall(value))
@@ -0,0 +1,263 @@
+"""
+Parsed theme files, a stat-validated parse cache and in-place metadata edits.
+
+A theme is parsed once per (size, mtime) into a ``ParsedTheme`` holding the
+validation report plus the byte offsets of its ``@OBSThemeMeta`` and
+``@OBSThemeVars`` blocks.  Metadata edits use those offsets to splice a new
+meta block between the untouched prefix and suffix of the file, write the
+result through a temporary file and ``os.replace`` it into place, then feed
+the known edit back into the cache instead of re-reading and re-locating the
+blocks.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Tuple
+
+from applog import note_cache
+from metrics import VALIDATION_SECONDS
+from validation import ValidationReport, validate_theme_content
+
+META_BLOCK_RE = re.compile(r"@OBSThemeMeta\s*\{[\s\S]*?\}")
+VARS_BLOCK_RE = re.compile(r"@OBSThemeVars\s*\{[\s\S]*?\}")
+META_KEY_RE = re.compile(r"^[a-zA-Z0-9_-]+$")
+
+Span = Tuple[int, int]
+
+
+@dataclass(frozen=True)
+class ParsedTheme:
+    path: str
+    dev: int
+    ino: int
+    size: int
+    mtime_ns: int
+    meta_span: Optional[Span]
+    vars_span: Optional[Span]
+    report: ValidationReport
+
+
+def _byte_span(text: str, match: Optional[re.Match]) -> Optional[Span]:
+    if match is None:
+        return None
+    start = len(text[:match.start()].encode("utf-8"))
+    return start, start + len(match.group(0).encode("utf-8"))
+
+
+def parse_theme(path: Path) -> ParsedTheme:
+    """Read, validate and locate the top-level blocks of a theme file."""
+    with open(path, "rb") as f:
+        stat_result = os.fstat(f.fileno())
+        text = f.read().decode("utf-8")
+    with VALIDATION_SECONDS.time():
+        report = validate_theme_content(text)
+    return ParsedTheme(
+        path=str(path),
+        dev=stat_result.st_dev,
+        ino=stat_result.st_ino,
+        size=stat_result.st_size,
+        mtime_ns=stat_result.st_mtime_ns,
+        meta_span=_byte_span(text, META_BLOCK_RE.search(text)),
+        vars_span=_byte_span(text, VARS_BLOCK_RE.search(text)),
+        report=report,
+    )
+
+
+class ParseCache:
+    """LRU of ``ParsedTheme`` entries, revalidated against the file's stat.
+
+    Entries are keyed on the file identity (device, inode), so hardlinked
+    duplicates of one body (see ``blobstore``) share a single entry.  With a
+    ``shared`` store (see ``shared_cache``) local misses are looked up there
+    before parsing, and new parses are written through for other workers.
+    """
+
+    def __init__(self, max_entries: int = 4096, shared=None):
+        self.max_entries = max_entries
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, ParsedTheme]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path) -> ParsedTheme:
+        stat_result = os.stat(path)
+        key = (stat_result.st_dev, stat_result.st_ino)
+        with self._lock:
+            parsed = self._entries.get(key)
+            if (parsed is not None and parsed.size == stat_result.st_size
+                    and parsed.mtime_ns == stat_result.st_mtime_ns):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                note_cache("parse", True)
+                return parsed
+            self.misses += 1
+        if self.shared is not None:
+            parsed = self.shared.get_parsed(stat_result)
+            if parsed is not None:
+                self._put_local(parsed)
+                note_cache("parse", True)
+                return parsed
+        note_cache("parse", False)
+        parsed = parse_theme(path)
+        self.put(parsed)
+        return parsed
+
+    def put(self, parsed: ParsedTheme) -> None:
+        self._put_local(parsed)
+        if self.shared is not None:
+            self.shared.put_parsed(parsed)
+
+    def _put_local(self, parsed: ParsedTheme) -> None:
+        key = (parsed.dev, parsed.ino)
+        with self._lock:
+            self._entries[key] = parsed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, stat_result: os.stat_result) -> None:
+        with self._lock:
+            self._entries.pop((stat_result.st_dev, stat_result.st_ino), None)
+
+
+class FileLocks:
+    """Per-path locks, created on demand and dropped once nobody holds them."""
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks: dict = {}
+
+    @contextmanager
+    def hold(self, path: Path) -> Iterator[None]:
+        key = str(path)
+        with self._guard:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+
+def atomic_write(path: Path, write: Callable) -> os.stat_result:
+    """Write ``path`` via a temp file in the same directory and rename it over.
+
+    ``write`` receives the open binary temp file.  The original file mode is
+    kept when replacing an existing file.  Returns the stat of the new file.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            write(tmp)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        try:
+            os.chmod(tmp_name, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+    return os.stat(path)
+
+
+def write_text_atomic(path: Path, text: str) -> os.stat_result:
+    """Replace ``path`` with ``text`` (UTF-8) through ``atomic_write``.
+
+    Theme files may be hardlinks into the blob store (see blobstore.py), so
+    writers must swap in a new file rather than rewrite the existing one in
+    place, which would change every file sharing the blob.
+    """
+    data = text.encode("utf-8")
+    return atomic_write(path, lambda f: f.write(data))
+
+
+def render_meta_block(meta: dict) -> str:
+    """Render an ``@OBSThemeMeta`` block in the style of the generated themes."""
+    lines = ["@OBSThemeMeta {"]
+    for key, value in meta.items():
+        key = str(key)
+        if not META_KEY_RE.match(key):
+            raise ValueError(f"Invalid meta key: {key!r}")
+        if isinstance(value, bool):
+            value = "true" if value else "false"
+        value = str(value)
+        if any(c in value for c in "{}\n\r"):
+            raise ValueError(f"Invalid characters in meta value for {key!r}")
+        lines.append(f"    {key}: {json.dumps(value)};")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _shift(span: Optional[Span], at: int, delta: int) -> Optional[Span]:
+    if span is None or span[0] < at:
+        return span
+    return span[0] + delta, span[1] + delta
+
+
+def write_meta(path: Path, meta: dict, cache: ParseCache, locks: FileLocks) -> Tuple[ParsedTheme, os.stat_result]:
+    """Replace the meta block of ``path`` and return the updated parse + stat.
+
+    Raises ``LookupError`` if the file has no ``@OBSThemeMeta`` block and
+    ``ValueError`` for meta keys/values that cannot be written safely.
+    """
+    block = render_meta_block(meta).encode("utf-8")
+    with locks.hold(path):
+        parsed = cache.get(path)
+        if parsed.meta_span is None:
+            raise LookupError("Could not find @OBSThemeMeta block")
+        start, end = parsed.meta_span
+
+        written = []
+
+        def splice(tmp):
+            with open(path, "rb") as src:
+                prefix = src.read(start)
+                if len(prefix) != start:
+                    raise OSError("Theme file shrank while being rewritten")
+                src.seek(end)
+                suffix = src.read()
+            written.extend((prefix, block, suffix))
+            tmp.writelines(written)
+
+        stat_result = atomic_write(path, splice)
+        with VALIDATION_SECONDS.time():
+            report = validate_theme_content(b"".join(written).decode("utf-8"))
+
+        # The new layout is known from the edit itself: the meta block moved
+        # to (start, start + len(block)) and everything after it shifted.
+        delta = len(block) - (end - start)
+        updated = replace(
+            parsed,
+            path=str(path),
+            dev=stat_result.st_dev,
+            ino=stat_result.st_ino,
+            size=stat_result.st_size,
+            mtime_ns=stat_result.st_mtime_ns,
+            meta_span=(start, start + len(block)),
+            vars_span=_shift(parsed.vars_span, end, delta),
+            report=report,
+        )
+        cache.put(updated)
+    return updated, stat_result
+
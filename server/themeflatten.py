@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Flattening themes to literal values.
+
+OBS resolves every ``var(--name)`` when it loads a theme, following aliases
+(``--bg_button_checked: var(--mauve)`` -> ``--mauve: #c6a0f6``) and the
+variables and rules of the themes it ``extends``.  ``Flattener`` does that
+once, ahead of time: it merges each theme's variables over its parent's,
+appends its rules after the parent's, and writes the theme back with every
+reference replaced by its value, so the result no longer needs its parent.
+
+With ``keep_palette`` the variables that hold literal values (the palette,
+plus sizes and other tokens) are kept and references resolve down to them,
+so ``var(--bg_button_checked)`` becomes ``var(--mauve)`` and the theme can
+still be recolored from its ``@OBSThemeVars``.  Otherwise only
+``REQUIRED_VARS`` are kept, as literals.
+
+Parsed themes, merged variable tables and resolved values are memoized per
+theme, so flattening a whole catalog parses each file once and resolves each
+variable of each theme once.  A parent that isn't among the loaded themes
+(OBS's built-in Yami, say) keeps its ``extends`` line, and references only
+it could resolve are left as they are and listed in ``unresolved``.
+
+Run:
+  python server/themeflatten.py catppuccin_enhanced_mocha.ovt --out-dir flat/
+  python server/themeflatten.py --catalog . --search /usr/share/obs/obs-studio/themes --out-dir flat/
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from themecss import META, VARS, Block, ThemeSyntaxError, meta_of, parse_blocks, serialize
+from validation import REQUIRED_VARS
+
+# var(--name) or var(--name, fallback), the fallback allowing one level of
+# parentheses such as rgba(...).
+_VAR_RE = re.compile(r"var\(\s*--([A-Za-z0-9_-]+)\s*(?:,\s*((?:[^()]|\([^()]*\))*?)\s*)?\)")
+THEME_SUFFIXES = (".ovt", ".obt")
+
+
+class FlattenError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Flattened:
+    theme_id: str
+    text: str
+    extends: Optional[str]          # parent that couldn't be inlined, if any
+    unresolved: Tuple[str, ...]     # variables left as var() references
+    rules: int
+    vars: int
+
+
+@dataclass
+class _Theme:
+    path: Path
+    meta: Dict[str, str]
+    vars: Dict[str, str]
+    rules: List[Block]
+
+
+def _parse(path: Path) -> _Theme:
+    blocks = parse_blocks(Path(path).read_text(encoding="utf-8"))
+    variables: Dict[str, str] = {}
+    for block in blocks:
+        if block.selector == VARS:
+            variables.update((prop[2:], value) for prop, value in block.declarations)
+    return _Theme(Path(path), meta_of(blocks), variables, [b for b in blocks if not b.is_at_rule])
+
+
+class Flattener:
+    def __init__(self, paths: Iterable[Path] = ()):
+        self._themes: Dict[str, _Theme] = {}
+        self._merged: Dict[str, Tuple[Dict[str, str], List[Block], Optional[str]]] = {}
+        self._resolved: Dict[Tuple[str, bool], Tuple[Dict[str, Optional[str]], Set[str]]] = {}
+        self.errors: Dict[str, str] = {}
+        for path in paths:
+            try:
+                self.add(path)
+            except (OSError, ThemeSyntaxError) as e:
+                self.errors[str(path)] = str(e)
+
+    def add(self, path: Path) -> str:
+        """Load the theme at ``path``; returns its id (the file stem if it has none)."""
+        theme = _parse(path)
+        theme_id = theme.meta.get("id") or Path(path).stem
+        self._themes[theme_id] = theme
+        # A new theme can change what earlier ones inherit.
+        self._merged.clear()
+        self._resolved.clear()
+        return theme_id
+
+    def __contains__(self, theme_id: str) -> bool:
+        return theme_id in self._themes
+
+    def __iter__(self):
+        return iter(self._themes)
+
+    def _merge(self, theme_id: str, seen: Tuple[str, ...] = ()) -> Tuple[Dict[str, str], List[Block], Optional[str]]:
+        """(variables, rules, missing parent) of ``theme_id`` with its parents' merged in."""
+        cached = self._merged.get(theme_id)
+        if cached is not None:
+            return cached
+        if theme_id in seen:
+            raise FlattenError(f"extends cycle: {' -> '.join(seen + (theme_id,))}")
+        theme = self._themes[theme_id]
+        parent = theme.meta.get("extends")
+        if parent and parent in self._themes:
+            parent_vars, parent_rules, missing = self._merge(parent, seen + (theme_id,))
+            merged = ({**parent_vars, **theme.vars}, parent_rules + theme.rules, missing)
+        else:
+            merged = (dict(theme.vars), list(theme.rules), parent or None)
+        self._merged[theme_id] = merged
+        return merged
+
+    def _resolver(self, theme_id: str, keep_palette: bool):
+        variables = self._merge(theme_id)[0]
+        # Unresolved names are kept with the memo: a memoized value doesn't
+        # report the references it left behind again.
+        memo, unresolved = self._resolved.setdefault((theme_id, keep_palette), ({}, set()))
+        active: Set[str] = set()
+
+        def palette(name: str) -> bool:
+            return not _VAR_RE.search(variables[name])
+
+        def value_of(name: str) -> Optional[str]:
+            """Resolved value of variable ``name``; None if undefined or cyclic."""
+            if name in memo:
+                return memo[name]
+            if name not in variables or name in active:
+                return None
+            active.add(name)
+            memo[name] = substitute(variables[name])
+            active.discard(name)
+            return memo[name]
+
+        def replace(m: re.Match) -> str:
+            name, fallback = m.group(1), m.group(2)
+            if keep_palette and name in variables and palette(name):
+                return f"var(--{name})"
+            value = value_of(name)
+            if value is None and fallback is not None:
+                value = substitute(fallback)
+            if value is None:
+                unresolved.add(name)
+                return m.group(0)
+            return value
+
+        def substitute(value: str) -> str:
+            return _VAR_RE.sub(replace, value)
+
+        return variables, palette, value_of, substitute, unresolved
+
+    def flatten(self, theme_id: str, keep_palette: bool = False) -> Flattened:
+        if theme_id not in self._themes:
+            raise FlattenError(f"unknown theme {theme_id!r}")
+        variables, rules, missing = self._merge(theme_id)
+        _, palette, value_of, substitute, unresolved = self._resolver(theme_id, keep_palette)
+
+        kept = [name for name in variables
+                if (keep_palette and palette(name)) or name in REQUIRED_VARS]
+        var_block = Block(VARS, [(f"--{name}", value_of(name) or variables[name]) for name in kept])
+        flat_rules = [Block(rule.selector, [(prop, substitute(value)) for prop, value in rule.declarations])
+                      for rule in rules]
+
+        meta = dict(self._themes[theme_id].meta)
+        if missing:
+            meta["extends"] = missing
+        else:
+            meta.pop("extends", None)
+        meta_block = Block(META, [(key, f"'{value}'") for key, value in meta.items()])
+        text = serialize([meta_block, var_block, *flat_rules])
+        return Flattened(theme_id, text, missing, tuple(sorted(unresolved)), len(flat_rules), len(kept))
+
+
+def theme_paths(directory: Path) -> List[Path]:
+    """Theme files directly in ``directory``, without ``.template.`` generator inputs."""
+    return sorted(p for p in Path(directory).iterdir()
+                  if p.suffix.lower() in THEME_SUFFIXES and ".template." not in p.name and p.is_file())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("themes", nargs="*", type=Path, help="themes to flatten")
+    parser.add_argument("--catalog", type=Path, help="also flatten every theme in this directory")
+    parser.add_argument("--search", type=Path, action="append", default=[],
+                        help="directory of parent themes to inline but not write (repeatable)")
+    parser.add_argument("--out-dir", type=Path, required=True)
+    parser.add_argument("--keep-palette", action="store_true")
+    args = parser.parse_args()
+
+    targets = list(args.themes) + (theme_paths(args.catalog) if args.catalog else [])
+    flattener = Flattener([p for d in args.search for p in theme_paths(d)])
+    ids = []
+    for path in targets:
+        try:
+            ids.append((path, flattener.add(path)))
+        except (OSError, ThemeSyntaxError) as e:
+            flattener.errors[str(path)] = str(e)
+
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    summary = {"written": [], "failed": flattener.errors}
+    for path, theme_id in ids:
+        try:
+            result = flattener.flatten(theme_id, keep_palette=args.keep_palette)
+        except FlattenError as e:
+            summary["failed"][str(path)] = str(e)
+            continue
+        (args.out_dir / path.name).write_text(result.text, encoding="utf-8")
+        summary["written"].append({"file": path.name, "extends": result.extends,
+                                   "unresolved": list(result.unresolved)})
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
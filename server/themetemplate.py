@@ -0,0 +1,141 @@
+"""
+Compiled theme templates.
+
+Templates use ``str.format`` syntax: ``{name}`` is a slot and ``{{``/``}}``
+are literal braces, so existing ``.template.ovt`` files work unchanged.  A
+template is compiled once into a list of literal segments with the positions
+of its slots; rendering copies that list, drops each value into its slots and
+joins, with no parsing per render.
+
+``load_template`` keeps compiled templates keyed by the SHA-256 of the file,
+re-hashing only when the file's (mtime, size) changes, so identical files at
+different paths share one compiled template.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import string
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Mapping, NamedTuple, Tuple
+
+_formatter = string.Formatter()
+
+
+class TemplateError(ValueError):
+    """Raised for malformed templates and for renders with missing slots."""
+
+
+class SlotReport(NamedTuple):
+    missing: Tuple[str, ...]   # slots with no value
+    unused: Tuple[str, ...]    # values no slot refers to
+
+
+class Template:
+    def __init__(self, source: str, name: str = "<template>"):
+        self.name = name
+        parts: List[str] = []
+        positions: List[Tuple[int, str]] = []
+        literal = []
+        try:
+            parsed = list(_formatter.parse(source))
+        except ValueError as e:
+            raise TemplateError(f"{name}: {e}") from None
+        for text, field, spec, conversion in parsed:
+            literal.append(text)
+            if field is None:
+                continue
+            if spec or conversion or not field.isidentifier():
+                raise TemplateError(f"{name}: unsupported slot {{{field}}}; only plain names are allowed")
+            # Adjacent literals (split by Formatter at escaped braces) become one segment.
+            parts.append("".join(literal))
+            literal = []
+            positions.append((len(parts), field))
+            parts.append("")
+        parts.append("".join(literal))
+        self._parts = parts
+        self._positions = tuple(positions)
+        self.slots: Tuple[str, ...] = tuple(dict.fromkeys(f for _, f in positions))
+        self._slot_set = frozenset(self.slots)
+
+    def check(self, values: Mapping[str, str]) -> SlotReport:
+        """Slots ``values`` leaves empty and values no slot uses."""
+        return SlotReport(
+            tuple(s for s in self.slots if s not in values),
+            tuple(k for k in values if k not in self._slot_set),
+        )
+
+    def render(self, values: Mapping[str, str], strict: bool = False) -> str:
+        """Fill every slot from ``values`` (strings) and return the text.
+
+        Raises ``TemplateError`` naming all missing slots; with ``strict``
+        unused values are an error too.
+        """
+        if strict:
+            report = self.check(values)
+            if report.missing or report.unused:
+                raise TemplateError(f"{self.name}: missing slots {list(report.missing)}, "
+                                    f"unused values {list(report.unused)}")
+        parts = self._parts.copy()
+        try:
+            for i, slot in self._positions:
+                parts[i] = values[slot]
+            return "".join(parts)
+        except KeyError:
+            raise TemplateError(f"{self.name}: missing slots {list(self.check(values).missing)}") from None
+        except TypeError:
+            raise TemplateError(f"{self.name}: slot values must be strings") from None
+
+
+# Compiled templates by content hash, and path -> (mtime_ns, size, hash).
+MAX_COMPILED = 64
+_lock = threading.Lock()
+_compiled: "OrderedDict[str, Template]" = OrderedDict()
+_stats: Dict[str, Tuple[int, int, str]] = {}
+
+
+def compile_template(source: str, name: str = "<template>") -> Template:
+    """Compiled template for ``source``, shared with any identical source."""
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()
+    return _compiled_for(digest, source, name)
+
+
+def _compiled_for(digest: str, source: str, name: str) -> Template:
+    with _lock:
+        template = _compiled.get(digest)
+        if template is not None:
+            _compiled.move_to_end(digest)
+            return template
+    template = Template(source, name)
+    with _lock:
+        _compiled[digest] = template
+        while len(_compiled) > MAX_COMPILED:
+            _compiled.popitem(last=False)
+    return template
+
+
+def load_template(path: Path) -> Template:
+    """Compiled template of the file at ``path``, recompiled only when it changes."""
+    key = os.fspath(path)
+    st = os.stat(key)
+    with _lock:
+        cached = _stats.get(key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            template = _compiled.get(cached[2])
+            if template is not None:
+                _compiled.move_to_end(cached[2])
+                return template
+    with open(key, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    template = _compiled_for(digest, data.decode("utf-8"), Path(key).name)
+    with _lock:
+        _stats[key] = (st.st_mtime_ns, st.st_size, digest)
+    return template
+
+
+def render_file(path: Path, values: Mapping[str, str], strict: bool = False) -> str:
+    """Render the template at ``path`` with ``values``."""
+    return load_template(path).render(values, strict=strict)
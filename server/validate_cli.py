@@ -3,17 +3,20 @@ import json
 from pathlib import Path
 import sys
 
-# Ensure the project root is on sys.path so `from app.server import ...` works
-# even when this script is executed from another process or a different cwd.
-ROOT = Path(__file__).resolve().parent.parent
-sys.path.insert(0, str(ROOT))
+# Only the catalog scanner, config and validator are needed here; importing
+# them directly (rather than the Flask server) keeps the CLI fast to start.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from app.server import find_theme_files, validate_theme_content
+from catalog import scan_themes
+from config import ROOT, Config
+from validation import validate_theme_content
 
 def main():
+    config = Config()
+    themes_root = (ROOT / config.THEMES_DIR).resolve() if config.THEMES_DIR else ROOT
     reports = []
-    for t in find_theme_files():
-        p = ROOT / t['path']
+    for t in scan_themes(themes_root, max_depth=config.THEMES_MAX_DEPTH):
+        p = themes_root / t['path']
         try:
             text = p.read_text(encoding='utf-8')
         except Exception as e:
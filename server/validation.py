@@ -1,21 +1,29 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict, Optional, Union
 import re
 
-class Meta(BaseModel):
+
+class _Model(BaseModel):
+    # Build validators/serializers on first use instead of at import, so
+    # importing the validator stays cheap for servers and CLIs that may not
+    # validate anything.
+    model_config = ConfigDict(defer_build=True)
+
+
+class Meta(_Model):
     id: str
     name: str
     dark: bool
     extends: Optional[str] = None
 
-class Var(BaseModel):
+class Var(_Model):
     name: str
     value: str
     line: int
     looks_like_color: bool
     color_valid: Optional[bool] = None
 
-class Error(BaseModel):
+class Error(_Model):
     code: str
     message: str
     line: Optional[int] = None
@@ -23,7 +31,7 @@ class Error(BaseModel):
     field: Optional[str] = None
     ref: Optional[str] = None
 
-class Warning(BaseModel):
+class Warning(_Model):
     code: str
     message: str
     line: Optional[int] = None
@@ -32,12 +40,12 @@ class Warning(BaseModel):
     ref: Optional[str] = None
     var: Optional[str] = None
 
-class Summary(BaseModel):
+class Summary(_Model):
     errors: int
     warnings: int
     vars_count: int
 
-class ValidationReport(BaseModel):
+class ValidationReport(_Model):
     meta: Meta
     vars: List[Var]
     errors: List[Error]